@@ -0,0 +1,8 @@
+# Arta calculation engine, shared by the Streamlit pages and the batch scorer.
+# Import-safe: no Streamlit, plotting or PDF dependencies, and nothing runs at import time.
+#   pool              - liquidity pool valuation, IL, break-even, pool Monte Carlo and composite risk score
+#   asset             - crypto asset Monte Carlo paths and the investor-profile risk score
+#   monte_carlo       - seeded RNG streams, manifests and chunked/parallel/adaptive runners
+#   monte_carlo_stats - streaming accumulators, variance-reduction sampling and convergence checks
+#   cache             - canonical input hashing and a bounded, expiring result cache with hit/miss counters
+#   export            - projection, Monte Carlo scenario and risk score export as Parquet/Arrow IPC
@@ -0,0 +1,270 @@
+import numpy as np
+
+from .monte_carlo import (make_rng, monte_carlo_manifest, get_monte_carlo_executor, run_monte_carlo_chunks,
+                          run_adaptive_monte_carlo, MONTE_CARLO_CHUNK_SIZE)
+from .monte_carlo_stats import (RunningMoments, RiskStatistics, TDigest, draw_uniforms, split_replicates, standard_errors, batch_standard_errors,
+                                ADAPTIVE_TOLERANCE, ADAPTIVE_BATCH_SIZE, ADAPTIVE_MAX_SIMULATIONS, ADAPTIVE_MAX_SECONDS)
+
+# Input Parsing
+def parse_market_value(value_str):
+    try:
+        value_str = value_str.replace(",", "").lower()
+        if value_str.endswith("b"):
+            return float(value_str[:-1]) * 1_000_000_000
+        elif value_str.endswith("m"):
+            return float(value_str[:-1]) * 1_000_000
+        elif value_str.endswith("k"):
+            return float(value_str[:-1]) * 1_000
+        else:
+            return float(value_str)
+    except:
+        return 0.0
+
+# Monte Carlo Price Paths (beta-distributed annual return per path, normal monthly noise around it)
+def asset_monte_carlo_params(initial_investment, growth_rate, fear_and_greed, months) -> dict:
+    expected_annual_return = growth_rate / 100
+    if fear_and_greed <= 24:
+        volatility_value = 0.75
+    elif fear_and_greed <= 49:
+        volatility_value = 0.60
+    elif fear_and_greed == 50:
+        volatility_value = 0.40
+    elif fear_and_greed <= 74:
+        volatility_value = 0.50
+    else:
+        volatility_value = 0.70
+    volatility_adjustment = 1.2 if fear_and_greed <= 49 else 1.1 if fear_and_greed > 50 else 1.0
+    adjusted_volatility = volatility_value * volatility_adjustment
+    monthly_volatility = adjusted_volatility / np.sqrt(12) if adjusted_volatility > 0 else 0.1
+    alpha, beta = (2, 5) if fear_and_greed <= 49 else (5, 2) if fear_and_greed > 50 else (2, 2)
+    return dict(initial_investment=initial_investment, lower_bound=expected_annual_return - adjusted_volatility,
+                upper_bound=expected_annual_return + adjusted_volatility, alpha=alpha, beta=beta,
+                monthly_volatility=monthly_volatility, months=months,
+                max_allowed_value=initial_investment * (1 + expected_annual_return + adjusted_volatility))
+
+def simulate_asset_paths(rng: np.random.Generator, n_simulations: int, initial_investment: float, lower_bound: float, upper_bound: float,
+                         alpha: float, beta: float, monthly_volatility: float, months: int, max_allowed_value: float,
+                         sampling: str = "random") -> tuple[np.ndarray, np.ndarray]:
+    if sampling == "random":
+        raw_returns = rng.beta(alpha, beta, n_simulations)
+        normal_draws = None
+    else:
+        # Variance-reduced uniforms mapped through the inverse beta and normal CDFs
+        from scipy.special import betaincinv, ndtri
+        uniforms = draw_uniforms(rng, n_simulations, months + 1, sampling)
+        raw_returns = betaincinv(alpha, beta, uniforms[:, 0])
+        normal_draws = ndtri(uniforms[:, 1:])
+    annual_returns = lower_bound + (upper_bound - lower_bound) * raw_returns
+    monthly_base_returns = (1 + annual_returns) ** (1/12) - 1
+    if normal_draws is None:
+        monthly_returns = rng.normal(monthly_base_returns[:, None], monthly_volatility/2, (n_simulations, months))
+    else:
+        monthly_returns = monthly_base_returns[:, None] + monthly_volatility/2 * normal_draws
+    # Paths are (n_simulations, months + 1) with the starting investment in column 0
+    sim_paths = np.cumprod(np.column_stack([np.full(n_simulations, float(initial_investment)), 1 + monthly_returns]), axis=1)
+    sim_paths[:, -1] = np.minimum(sim_paths[:, -1], max_allowed_value)
+    return sim_paths, monthly_returns
+
+# Path Drawdowns (every path at once, in row blocks so a million paths never need more than a few block-sized temporaries)
+DRAWDOWN_PERCENTILES = (50, 90, 99)
+DRAWDOWN_BLOCK_SIZE = 16_384
+
+def path_drawdowns(sim_paths: np.ndarray, block_size: int = DRAWDOWN_BLOCK_SIZE) -> dict:
+    # Per-path statistics of an (n_paths, months + 1) path matrix, each an n_paths array:
+    #   max_drawdown     - deepest fall below the running peak, in percent
+    #   time_under_water - longest run of months spent below an earlier peak, counting a run still open at the end
+    #   recovery_months  - months from the deepest trough back up to the peak before it, NaN if the path never gets there
+    n_paths, n_months = sim_paths.shape
+    months = np.arange(n_months)
+    max_drawdown = np.empty(n_paths)
+    time_under_water = np.empty(n_paths, dtype=np.int64)
+    recovery_months = np.empty(n_paths)
+    for start in range(0, n_paths, block_size):
+        paths = sim_paths[start:start + block_size]
+        rows = np.arange(len(paths))
+        peak = np.maximum.accumulate(paths, axis=1)
+        drawdown = np.divide(peak - paths, peak, out=np.zeros_like(paths), where=peak > 0)
+        trough = drawdown.argmax(axis=1)
+        at_peak = drawdown <= 0
+        # Month of the latest high up to each month, and the first high from the deepest trough on
+        last_high = np.maximum.accumulate(np.where(at_peak, months, 0), axis=1)
+        recovered = at_peak & (months >= trough[:, None])
+        recovered_at = np.where(recovered.any(axis=1), recovered.argmax(axis=1), n_months)
+        max_drawdown[start:start + len(paths)] = drawdown[rows, trough] * 100
+        time_under_water[start:start + len(paths)] = (months - last_high).max(axis=1)
+        recovery_months[start:start + len(paths)] = np.where(recovered_at < n_months, recovered_at - trough, np.nan)
+    return {"max_drawdown": max_drawdown, "time_under_water": time_under_water, "recovery_months": recovery_months}
+
+def drawdown_percentiles(drawdowns: dict, percentiles=DRAWDOWN_PERCENTILES) -> dict:
+    # Population summary of path_drawdowns(); recovery percentiles cover the paths that recover, None if none do
+    recovered = drawdowns["recovery_months"][~np.isnan(drawdowns["recovery_months"])]
+    return {
+        "max_drawdown": dict(zip(percentiles, np.percentile(drawdowns["max_drawdown"], percentiles).tolist())),
+        "time_under_water": dict(zip(percentiles, np.percentile(drawdowns["time_under_water"], percentiles).tolist())),
+        "recovery_months": dict(zip(percentiles, np.percentile(recovered, percentiles).tolist() if recovered.size else [None] * len(percentiles))),
+        "unrecovered_share": 1 - recovered.size / drawdowns["recovery_months"].size
+    }
+
+# Streaming Monte Carlo (fixed-size blocks folded into mergeable accumulators, memory is O(block))
+def summarize_asset_block(rng: np.random.Generator, n_simulations: int, **path_params) -> dict:
+    sim_paths, monthly_returns = simulate_asset_paths(rng, n_simulations, **path_params)
+    terminal_values = sim_paths[:, -1]
+    drawdowns = path_drawdowns(sim_paths)
+    return {
+        "terminal": RunningMoments().update(terminal_values),
+        "digest": TDigest().update(terminal_values),
+        "returns": RiskStatistics().update(monthly_returns),
+        "drawdown": TDigest().update(drawdowns["max_drawdown"]),
+        "worst_path": sim_paths[np.argmin(terminal_values)].copy()
+    }
+
+def run_monte_carlo_streaming(initial_investment, growth_rate, fear_and_greed, months, n_simulations, percentiles=(10, 90),
+                              seed=None, block_size=MONTE_CARLO_CHUNK_SIZE, parallel=False, sampling="random") -> dict:
+    _, seed_sequence = make_rng(seed)
+    blocks = run_monte_carlo_chunks(summarize_asset_block, seed_sequence, n_simulations, block_size,
+                                    get_monte_carlo_executor() if parallel else None,
+                                    sampling=sampling, **asset_monte_carlo_params(initial_investment, growth_rate, fear_and_greed, months))
+    terminal, digest, returns, drawdown = RunningMoments(), TDigest(), RiskStatistics(), TDigest()
+    worst_path = None
+    for block in blocks:
+        terminal.merge(block["terminal"])
+        digest.merge(block["digest"])
+        returns.merge(block["returns"])
+        drawdown.merge(block["drawdown"])
+        if worst_path is None or block["worst_path"][-1] < worst_path[-1]:
+            worst_path = block["worst_path"]
+    return {
+        "mean": terminal.mean,
+        "std": terminal.std,
+        "percentiles": dict(zip(percentiles, digest.quantile(percentiles).tolist())),
+        "downside_std": returns.downside_std,
+        "returns": returns,
+        "max_drawdown": dict(zip(DRAWDOWN_PERCENTILES, drawdown.quantile(DRAWDOWN_PERCENTILES).tolist())),
+        "worst_path": worst_path,
+        "digest": digest,
+        "n_simulations": n_simulations,
+        "sampling": sampling,
+        "standard_error": standard_errors([block["terminal"].mean for block in blocks],
+                                          [block["digest"].quantile(percentiles) for block in blocks], percentiles),
+        "manifest": monte_carlo_manifest("run_monte_carlo_streaming", seed_sequence, {
+            "initial_investment": initial_investment, "growth_rate": growth_rate, "fear_and_greed": fear_and_greed,
+            "months": months, "n_simulations": n_simulations, "percentiles": list(percentiles), "block_size": block_size,
+            "sampling": sampling
+        })
+    }
+
+# Full-Path Monte Carlo (every path and monthly return kept, as the pages chart and score them)
+def _run_asset_chunks(initial_investment, growth_rate, fear_and_greed, months, n_simulations=200, seed=None, chunk_size=None,
+                      parallel=False, sampling="random", adaptive=False, tolerance=ADAPTIVE_TOLERANCE,
+                      max_simulations=ADAPTIVE_MAX_SIMULATIONS, max_seconds=ADAPTIVE_MAX_SECONDS) -> tuple:
+    # Returns the simulated (paths, monthly_returns) chunks, a single chunk when run serially, with the manifest and report
+    rng, seed_sequence = make_rng(seed)
+    path_params = asset_monte_carlo_params(initial_investment, growth_rate, fear_and_greed, months)
+    path_params["sampling"] = sampling
+    precision = None
+    if adaptive:
+        convergence = dict(tolerance=tolerance, batch_size=chunk_size or ADAPTIVE_BATCH_SIZE,
+                           max_simulations=max_simulations, max_seconds=max_seconds)
+        chunks, precision = run_adaptive_monte_carlo(simulate_asset_paths, seed_sequence, (10, 90), get_monte_carlo_executor() if parallel else None,
+                                                     convergence, batch_values=lambda chunk: chunk[0][:, -1], **path_params)
+        n_simulations = precision["num_simulations"]
+    elif parallel or chunk_size is not None:
+        chunks = run_monte_carlo_chunks(simulate_asset_paths, seed_sequence, n_simulations, chunk_size or MONTE_CARLO_CHUNK_SIZE,
+                                        get_monte_carlo_executor() if parallel else None, **path_params)
+    else:
+        chunks = [simulate_asset_paths(rng, n_simulations, **path_params)]
+    if adaptive or parallel or chunk_size is not None:
+        batches = [chunk_paths[:, -1] for chunk_paths, _ in chunks]
+    else:
+        batches = split_replicates(chunks[0][0][:, -1])
+    report = {"sampling": sampling, "standard_error": batch_standard_errors(batches, (10, 90)), "precision": precision,
+              "num_simulations": n_simulations}
+    manifest = monte_carlo_manifest("run_monte_carlo", seed_sequence, {
+        "initial_investment": initial_investment, "growth_rate": growth_rate, "fear_and_greed": fear_and_greed,
+        "months": months, "n_simulations": n_simulations,
+        "chunk_size": chunk_size or (ADAPTIVE_BATCH_SIZE if adaptive else MONTE_CARLO_CHUNK_SIZE if parallel else None), "sampling": sampling,
+        "adaptive": {"tolerance": tolerance, "max_simulations": max_simulations, "max_seconds": max_seconds} if adaptive else None
+    })
+    return chunks, manifest, report
+
+def run_asset_monte_carlo(initial_investment, growth_rate, fear_and_greed, months, n_simulations=200, seed=None, chunk_size=None, parallel=False,
+                          sampling="random", adaptive=False, tolerance=ADAPTIVE_TOLERANCE, max_simulations=ADAPTIVE_MAX_SIMULATIONS, max_seconds=ADAPTIVE_MAX_SECONDS):
+    # Adaptive mode ignores n_simulations and runs batches of chunk_size paths until the 10th/90th percentiles converge
+    chunks, manifest, report = _run_asset_chunks(initial_investment, growth_rate, fear_and_greed, months, n_simulations, seed, chunk_size,
+                                                 parallel, sampling, adaptive, tolerance, max_simulations, max_seconds)
+    if len(chunks) > 1:
+        sim_paths = np.concatenate([chunk_paths for chunk_paths, _ in chunks])
+        monthly_returns = np.concatenate([chunk_returns for _, chunk_returns in chunks])
+    else:
+        sim_paths, monthly_returns = chunks[0]
+    simulations = sim_paths[:, -1].copy()
+    all_monthly_returns = monthly_returns.ravel()
+    return simulations, sim_paths, all_monthly_returns, manifest, report
+
+def run_asset_monte_carlo_summary(initial_investment, growth_rate, fear_and_greed, months, **options) -> dict:
+    # Compact form of run_asset_monte_carlo for caching: final values and the path statistics the pages use, without
+    # the (n_simulations, months + 1) paths and (n_simulations * months) monthly returns, about 25x the memory. Chunks
+    # are folded one at a time, so the paths and returns are never concatenated either.
+    #   returns          - RiskStatistics of the monthly returns (moments, downside deviation, Sortino)
+    #   terminal_returns - RiskStatistics of each path's return over the whole horizon (Sharpe)
+    chunks, manifest, report = _run_asset_chunks(initial_investment, growth_rate, fear_and_greed, months, **options)
+    returns, terminal_returns = RiskStatistics(), RiskStatistics()
+    drawdowns = []
+    for chunk_paths, chunk_returns in chunks:
+        returns.update(chunk_returns)
+        terminal_returns.update(chunk_paths[:, -1] / initial_investment - 1)
+        drawdowns.append(path_drawdowns(chunk_paths))
+    return {
+        "simulations": np.concatenate([chunk_paths[:, -1] for chunk_paths, _ in chunks]),
+        "drawdown": drawdown_percentiles({name: np.concatenate([block[name] for block in drawdowns]) for name in drawdowns[0]}),
+        "returns": returns,
+        "terminal_returns": terminal_returns,
+        "manifest": manifest,
+        "report": report
+    }
+
+# Investor-Profile Risk Score
+INVESTOR_PROFILE_WEIGHTS = {
+    "Conservative Investor": {
+        "Max Drawdown": 2.0, "Dilution Risk": 1.5, "Supply Concentration": 1.2, "MCap Growth": 0.5,
+        "Sharpe Ratio": 1.0, "Sortino Ratio": 1.0, "CertiK Score": 3.0, "Market Cap": 1.2,
+        "Fear and Greed": 0.8, "Liquidity": 1.5, "Fear and Greed Penalty": 2.5
+    },
+    "Bitcoin Strategist": {
+        "Max Drawdown": 1.0, "Dilution Risk": 1.0, "Supply Concentration": 1.0, "MCap Growth": 2.0,
+        "Sharpe Ratio": 1.0, "Sortino Ratio": 1.0, "CertiK Score": 2.5, "Market Cap": 1.0,
+        "Fear and Greed": 0.5, "Liquidity": 1.0, "Fear and Greed Penalty": 1.5
+    },
+    "Growth Crypto Investor": {
+        "Max Drawdown": 1.0, "Dilution Risk": 1.0, "Supply Concentration": 1.0, "MCap Growth": 1.2,
+        "Sharpe Ratio": 1.5, "Sortino Ratio": 1.5, "CertiK Score": 2.5, "Market Cap": 1.0,
+        "Fear and Greed": 1.0, "Liquidity": 1.0, "Fear and Greed Penalty": 2.0
+    },
+    "Aggressive Crypto Investor": {
+        "Max Drawdown": 0.3, "Dilution Risk": 0.8, "Supply Concentration": 0.8, "MCap Growth": 2.0,
+        "Sharpe Ratio": 1.2, "Sortino Ratio": 1.2, "CertiK Score": 2.5, "Market Cap": 1.0,
+        "Fear and Greed": 1.0, "Liquidity": 0.8, "Fear and Greed Penalty": 1.5
+    }
+}
+
+def calculate_asset_scores(max_drawdown, dilution_ratio, supply_ratio, mcap_vs_btc, sharpe_ratio, sortino_ratio, certik_score,
+                           market_cap, fear_and_greed, vol_mkt_cap) -> dict:
+    certik_score = 50 if certik_score == 0 else certik_score  # No CertiK score counts as neutral
+    return {
+        'Max Drawdown': 100 if max_drawdown < 20 else 50 if max_drawdown < 40 else 0,
+        'Dilution Risk': 100 if dilution_ratio < 20 else 50 if dilution_ratio < 50 else 0,
+        'Supply Concentration': 0 if supply_ratio < 20 else 50 if supply_ratio < 50 else 100,
+        'MCap Growth': 100 if mcap_vs_btc < 1 else 50 if mcap_vs_btc < 5 else 0,
+        'Sharpe Ratio': 100 if sharpe_ratio > 1 else 50 if sharpe_ratio > 0 else 0,
+        'Sortino Ratio': 100 if sortino_ratio > 1 else 50 if sortino_ratio > 0 else 0,
+        'CertiK Score': 100 if certik_score >= 70 else 50 if certik_score >= 40 else 0,
+        'Market Cap': 100 if market_cap >= 1_000_000_000 else 50 if market_cap >= 10_000_000 else 0,
+        'Fear and Greed': 100 if fear_and_greed <= 24 else 75 if fear_and_greed <= 49 else 50 if fear_and_greed == 50 else 25 if fear_and_greed <= 74 else 0,
+        'Liquidity': 0 if vol_mkt_cap < 1 else 50 if vol_mkt_cap <= 5 else 100,
+        'Fear and Greed Penalty': 100 - abs(50 - fear_and_greed) * 2  # Parabolic penalty away from neutral
+    }
+
+def weighted_composite_score(scores: dict, weights: dict) -> float:
+    # Weighted mean of the scores; weights may cover more metrics than scores (all count towards the total)
+    total_weight = sum(weights.values())
+    return sum(scores[metric] * weights[metric] for metric in scores) / total_weight if total_weight > 0 else 0
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# Input-Keyed Result Cache (bounded LRU with a time-to-live and hit/miss counters)
+RESULT_CACHE_MAX_ENTRIES = 128
+RESULT_CACHE_TTL_SECONDS = 3600.0
+
+def _canonical(value):
+    # Equal inputs must serialize identically whatever container or numeric type carried them: tuples become lists,
+    # NumPy scalars become Python numbers, ints that are really floats (1 vs 1.0) compare equal. Arrays are reduced
+    # to a digest of their buffer, so keying on a large grid or simulation costs one pass over its bytes
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value, dtype=float) if value.dtype != bool else np.ascontiguousarray(value)
+        return {"array": list(value.shape), "dtype": value.dtype.str, "sha256": hashlib.sha256(value.data).hexdigest()}
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, int) and abs(value) > 2 ** 53:
+        return str(value)  # Beyond float precision, e.g. 128-bit seed entropy, which must not collide with its neighbours
+    if isinstance(value, (int, float)):
+        return repr(float(value))
+    raise TypeError(f"Cannot build a cache key from {type(value).__name__}")
+
+def canonical_input_hash(inputs: dict) -> str:
+    payload = json.dumps(_canonical(inputs), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def result_nbytes(value) -> int:
+    # Memory held by a cached result: array buffers plus the Python containers and scalars around them. A view is
+    # counted at its own size but keeps its whole base array alive, so cached results should hold copies
+    if isinstance(value, np.ndarray):
+        return value.nbytes + sys.getsizeof(np.empty(0))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(result_nbytes(key) + result_nbytes(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(result_nbytes(item) for item in value)
+    return sys.getsizeof(value)
+
+class ResultCache:
+    # Results are returned by reference, so callers treat them as read-only. Safe to share between the threads of
+    # one Streamlit server; a miss computes outside the lock, so two sessions missing on the same key both compute
+    def __init__(self, max_entries: int = RESULT_CACHE_MAX_ENTRIES, ttl_seconds: float = RESULT_CACHE_TTL_SECONDS,
+                 max_bytes: int = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds  # None keeps entries until they are evicted
+        self.max_bytes = max_bytes  # None bounds the cache by entry count only
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejections = 0  # Results larger than max_bytes on their own, returned but never stored
+        self._entries = OrderedDict()  # key -> (stored_at, nbytes, result)
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        # Returns (found, result); an expired entry is dropped and counts as a miss
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                self._nbytes -= entry[1]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[2]
+
+    def __contains__(self, key: str) -> bool:
+        # A live entry exists for key; unlike get(), this leaves the counters and the LRU order alone
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (self.ttl_seconds is None or time.monotonic() - entry[0] <= self.ttl_seconds)
+
+    def put(self, key: str, result) -> None:
+        nbytes = result_nbytes(result)
+        with self._lock:
+            if self.max_bytes is not None and nbytes > self.max_bytes:
+                self.rejections += 1
+                return
+            if key in self._entries:
+                self._nbytes -= self._entries.pop(key)[1]
+            self._entries[key] = (time.monotonic(), nbytes, result)
+            self._nbytes += nbytes
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and self._nbytes > self.max_bytes):
+                self._nbytes -= self._entries.popitem(last=False)[1][1]
+                self.evictions += 1
+
+    def get_or_compute(self, inputs: dict, compute) -> tuple:
+        # compute(**inputs) runs only on a miss; returns (result, was_hit)
+        key = canonical_input_hash(inputs)
+        found, result = self.get(key)
+        if not found:
+            result = compute(**inputs)
+            self.put(key, result)
+        return result, found
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def entry_sizes(self) -> list:
+        # (key, bytes, age in seconds) per entry, least recently used first
+        now = time.monotonic()
+        with self._lock:
+            return [(key, nbytes, now - stored_at) for key, (stored_at, nbytes, _) in self._entries.items()]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "rejections": self.rejections,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "bytes": self._nbytes,
+                "bytes_per_entry": self._nbytes / len(self._entries) if self._entries else 0.0,
+                "largest_entry_bytes": max((nbytes for _, nbytes, _ in self._entries.values()), default=0),
+                "max_bytes": self.max_bytes
+            }
@@ -0,0 +1,59 @@
+import json
+import zipfile
+from io import BytesIO
+
+import numpy as np
+
+from .pool import pool_monte_carlo_scenarios
+
+# Columnar Result Export (projection path, every Monte Carlo scenario and the risk scores as Parquet or Arrow IPC)
+# pyarrow is only imported when an export is written, so importing the engine stays light
+EXPORT_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+def projection_columns(projection: dict) -> dict:
+    # One column per field; the weighted path's (months x assets) price array becomes one column per asset
+    columns = {}
+    for name, values in projection.items():
+        values = np.asarray(values)
+        if values.ndim == 2:
+            columns.update({f"price_asset{asset + 1}": values[:, asset] for asset in range(values.shape[1])})
+        else:
+            columns[name] = values
+    return columns
+
+def score_columns(scores: dict, composite_score: float) -> dict:
+    return {"metric": np.array([*scores, "Composite"]),
+            "score": np.array([*scores.values(), composite_score], dtype=float)}
+
+def write_columnar_archive(tables: dict, export_format: str = "parquet", manifest: dict = None) -> bytes:
+    # tables maps a file name to a dict of equal-length 1-D columns. Contiguous numeric arrays are handed to Arrow as
+    # they are (pa.array wraps the NumPy buffer, no copy), and each file is streamed straight into an uncompressed zip
+    # entry, Parquet doing its own compression, so the archive is the only full copy of the data
+    import pyarrow as pa
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"export_format must be one of {', '.join(EXPORT_FORMATS)}")
+    metadata = {"arta_manifest": json.dumps(manifest, default=str)} if manifest is not None else None
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        for name, columns in tables.items():
+            table = pa.table({column: pa.array(values) for column, values in columns.items()}, metadata=metadata)
+            with archive.open(name + EXPORT_FORMATS[export_format], "w", force_zip64=True) as handle:
+                if export_format == "parquet":
+                    import pyarrow.parquet as pq
+                    pq.write_table(table, handle, compression="zstd")
+                else:
+                    with pa.ipc.new_file(handle, table.schema) as writer:
+                        writer.write_table(table)
+        if manifest is not None:
+            archive.writestr("manifest.json", json.dumps(manifest, indent=2, default=str))
+    return buffer.getvalue()
+
+def pool_results_archive(projection: dict, manifest: dict, scores: dict, composite_score: float,
+                         export_format: str = "parquet") -> bytes:
+    # The scenarios are regenerated from the Monte Carlo manifest rather than kept with the results
+    tables = {
+        "projection": projection_columns(projection),
+        "scenarios": pool_monte_carlo_scenarios(manifest),
+        "risk_scores": score_columns(scores, composite_score)
+    }
+    return write_columnar_archive(tables, export_format, manifest)
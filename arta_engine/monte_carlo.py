@@ -0,0 +1,68 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+
+import numpy as np
+
+from .monte_carlo_stats import run_until_converged
+
+# Monte Carlo RNG Streams (seeded, spawnable and recorded in a manifest on every result)
+MONTE_CARLO_ENGINE_VERSION = "2.0"
+
+def resolve_seed_sequence(seed=None) -> np.random.SeedSequence:
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    if isinstance(seed, np.random.Generator):
+        return seed.bit_generator.seed_seq
+    return np.random.SeedSequence(seed)
+
+def make_rng(seed=None) -> tuple[np.random.Generator, np.random.SeedSequence]:
+    # Returns the stream and the SeedSequence that reproduces it; a Generator passed in is used as-is
+    if isinstance(seed, np.random.Generator):
+        return seed, seed.bit_generator.seed_seq
+    seed_sequence = resolve_seed_sequence(seed)
+    return np.random.default_rng(seed_sequence), seed_sequence
+
+def spawn_rngs(seed, n_streams: int, start: int = 0) -> list[np.random.Generator]:
+    # Independent child streams for chunked or parallel runs of one simulation. Children are derived from the
+    # spawn key directly (as a first SeedSequence.spawn would), so repeated calls regenerate the same streams
+    seed_sequence = resolve_seed_sequence(seed)
+    return [np.random.default_rng(np.random.SeedSequence(seed_sequence.entropy, spawn_key=seed_sequence.spawn_key + (index,),
+                                                         pool_size=seed_sequence.pool_size))
+            for index in range(start, start + n_streams)]
+
+def monte_carlo_manifest(engine: str, seed, inputs: dict) -> dict:
+    seed_sequence = resolve_seed_sequence(seed)
+    return {
+        "engine": engine,
+        "engine_version": MONTE_CARLO_ENGINE_VERSION,
+        "seed": {"entropy": seed_sequence.entropy, "spawn_key": seed_sequence.spawn_key},
+        "inputs": inputs
+    }
+
+# Parallel Monte Carlo Execution (chunks on independent child streams, merged exactly)
+MONTE_CARLO_CHUNK_SIZE = 50_000
+
+@lru_cache(maxsize=None)
+def get_monte_carlo_executor(max_workers: int | None = None) -> ProcessPoolExecutor:
+    # One pool per process. Callers include the multithreaded Streamlit server, and a forked child can inherit a lock
+    # another thread was holding, so workers start from a clean forkserver (spawn where there is none). They only
+    # import this import-safe package, never a Streamlit page
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(start_method))
+
+def run_monte_carlo_chunks(simulate_chunk, seed_sequence: np.random.SeedSequence, num_simulations: int, chunk_size: int,
+                           executor: ProcessPoolExecutor | None = None, **params) -> list:
+    # Chunk k always draws from child stream k, so a parallel run matches a serial run with the same chunk_size bit for bit
+    chunk_sizes = [min(chunk_size, num_simulations - start) for start in range(0, num_simulations, chunk_size)]
+    rngs = spawn_rngs(seed_sequence, len(chunk_sizes))
+    mapper = executor.map if executor is not None else map
+    return list(mapper(partial(simulate_chunk, **params), rngs, chunk_sizes))
+
+def run_adaptive_monte_carlo(simulate_chunk, seed_sequence: np.random.SeedSequence, percentiles, executor: ProcessPoolExecutor | None = None,
+                             convergence: dict | None = None, batch_values=lambda chunk: chunk[0], **params) -> tuple[list, dict]:
+    # Rounds of fixed-size chunks on consecutive child streams until the percentiles converge (see run_until_converged)
+    mapper = executor.map if executor is not None else map
+    def simulate_batches(first_batch: int, n_batches: int, batch_size: int) -> list:
+        return list(mapper(partial(simulate_chunk, **params), spawn_rngs(seed_sequence, n_batches, first_batch), [batch_size] * n_batches))
+    return run_until_converged(simulate_batches, percentiles, batch_values=batch_values, **(convergence or {}))
@@ -0,0 +1,295 @@
+import time
+import warnings
+from statistics import NormalDist
+
+import numpy as np
+
+# Streaming Accumulators for Monte Carlo Results
+# Each accumulator folds in one block of samples at a time and can be merged with another
+# accumulator, so memory stays O(block) regardless of how many paths are simulated.
+
+class RunningMoments:
+    # Welford/Chan running mean and variance (population variance, matching np.std's default ddof=0)
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values) -> "RunningMoments":
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return self
+        block = RunningMoments()
+        block.count = values.size
+        block.mean = float(values.mean())
+        block.m2 = float(((values - block.mean) ** 2).sum())
+        return self.merge(block)
+
+    def merge(self, other: "RunningMoments") -> "RunningMoments":
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+        return self
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count > 0 else 0.0
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+class RiskStatistics:
+    # Risk statistics of a stream of returns in one pass: mean, standard deviation, skewness and excess kurtosis
+    # (Pebay's pairwise update of the third and fourth central moments) plus the standard deviation of the losing
+    # returns, the downside deviation the Sortino ratio is taken over. Blocks and workers merge like RunningMoments
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.downside = RunningMoments()
+
+    def update(self, returns) -> "RiskStatistics":
+        returns = np.asarray(returns, dtype=float).ravel()
+        if returns.size == 0:
+            return self
+        block = RiskStatistics()
+        block.count = returns.size
+        block.mean = float(returns.mean())
+        deviations = returns - block.mean
+        squared = deviations * deviations
+        block.m2 = float(squared.sum())
+        block.m3 = float((squared * deviations).sum())
+        block.m4 = float((squared * squared).sum())
+        block.downside.update(returns[returns < 0])
+        return self.merge(block)
+
+    def merge(self, other: "RiskStatistics") -> "RiskStatistics":
+        if other.count == 0:
+            return self
+        n_a, n_b = self.count, other.count
+        total = n_a + n_b
+        delta = other.mean - self.mean
+        self.m4 += (other.m4 + delta ** 4 * n_a * n_b * (n_a ** 2 - n_a * n_b + n_b ** 2) / total ** 3
+                    + 6 * delta ** 2 * (n_a ** 2 * other.m2 + n_b ** 2 * self.m2) / total ** 2
+                    + 4 * delta * (n_a * other.m3 - n_b * self.m3) / total)
+        self.m3 += (other.m3 + delta ** 3 * n_a * n_b * (n_a - n_b) / total ** 2
+                    + 3 * delta * (n_a * other.m2 - n_b * self.m2) / total)
+        self.m2 += other.m2 + delta ** 2 * n_a * n_b / total
+        self.mean += delta * n_b / total
+        self.count = total
+        self.downside.merge(other.downside)
+        return self
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count > 0 else 0.0
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+    @property
+    def _has_spread(self) -> bool:
+        # Merging blocks of identical returns can leave m2 at rounding noise of the mean, which the standardized
+        # moments would blow up into arbitrary values
+        return self.m2 > self.count * (16 * np.finfo(float).eps * self.mean) ** 2
+
+    @property
+    def skewness(self) -> float:
+        return float(np.sqrt(self.count) * self.m3 / self.m2 ** 1.5) if self._has_spread else 0.0
+
+    @property
+    def kurtosis(self) -> float:
+        # Excess kurtosis, 0 for a normal distribution
+        return self.count * self.m4 / self.m2 ** 2 - 3 if self._has_spread else 0.0
+
+    @property
+    def downside_std(self) -> float:
+        return self.downside.std
+
+    def sharpe_ratio(self, excess_return: float) -> float:
+        return excess_return / self.std if self.std > 0 else 0.0
+
+    def sortino_ratio(self, excess_return: float) -> float:
+        return excess_return / self.downside_std if self.downside_std > 0 else 0.0
+
+class TDigest:
+    # Merging t-digest quantile sketch; centroids are bucketed on the arcsine scale function so the
+    # tails keep near-singleton resolution while the body is compressed to ~compression centroids
+    def __init__(self, compression: float = 500):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def update(self, values) -> "TDigest":
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._compress(np.concatenate([self.means, values]), np.concatenate([self.weights, np.ones(values.size)]))
+        return self
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        if other.weights.size == 0:
+            return self
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+        return self
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> None:
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        q_mid = (cumulative - weights / 2) / cumulative[-1]
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q_mid - 1)
+        starts = np.flatnonzero(np.diff(np.floor(k), prepend=-np.inf))
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, percentile):
+        # Percentiles on the 0-100 scale, like np.percentile
+        if self.weights.size == 0:
+            return np.full(np.shape(percentile), np.nan) if np.ndim(percentile) else np.nan
+        total = self.weights.sum()
+        centers = np.concatenate([[0.0], np.cumsum(self.weights) - self.weights / 2, [total]])
+        means = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(np.asarray(percentile, dtype=float) / 100 * total, centers, means)
+
+# Variance-Reduction Sampling
+# Every mode is drawn as n_replicates independent replicate batches laid out contiguously, so the spread of
+# the batch estimates gives a valid standard error for any mode (including the non-iid QMC and stratified ones)
+SAMPLING_MODES = ("random", "antithetic", "stratified", "sobol")
+SAMPLING_REPLICATES = 10
+
+def _replicate_sizes(n: int, n_replicates: int) -> list[int]:
+    return [len(batch) for batch in np.array_split(np.arange(n), min(n_replicates, max(n, 1)))]
+
+def draw_uniforms(rng: np.random.Generator, n: int, dims: int, sampling: str = "random",
+                  n_replicates: int = SAMPLING_REPLICATES) -> np.ndarray:
+    # Returns an (n, dims) array of U(0, 1) draws; "random" matches dims successive rng.random(n) calls
+    if sampling not in SAMPLING_MODES:
+        raise ValueError(f"Unknown sampling mode '{sampling}', expected one of {', '.join(SAMPLING_MODES)}")
+    if sampling == "random":
+        return np.column_stack([rng.random(n) for _ in range(dims)]) if n > 0 else np.empty((0, dims))
+    batches = []
+    for size in _replicate_sizes(n, n_replicates):
+        if sampling == "antithetic":
+            half = rng.random(((size + 1) // 2, dims))
+            # Interleave (u, 1 - u) pairs so any contiguous even-sized batch keeps its pairs together
+            batches.append(np.stack([half, 1 - half], axis=1).reshape(-1, dims)[:size])
+        elif sampling == "stratified":
+            # Latin hypercube: one draw per equal-probability stratum in every dimension
+            strata = np.argsort(rng.random((dims, size)), axis=1).T
+            batches.append((strata + rng.random((size, dims))) / size)
+        else:
+            from scipy.stats import qmc  # Optional dependency, only needed for Sobol' sampling
+            with warnings.catch_warnings():
+                # Scrambled Sobol' points stay unbiased when n is not a power of 2, only the balance is weaker
+                warnings.simplefilter("ignore", UserWarning)
+                batches.append(qmc.Sobol(d=dims, scramble=True, rng=rng).random(size))
+    return np.concatenate(batches) if batches else np.empty((0, dims))
+
+def split_replicates(values, n_replicates: int = SAMPLING_REPLICATES) -> list[np.ndarray]:
+    # Splits a sample drawn by draw_uniforms back into its replicate batches
+    values = np.asarray(values)
+    return np.split(values, np.cumsum(_replicate_sizes(len(values), n_replicates))[:-1])
+
+def standard_errors(batch_means, batch_quantiles, percentiles=()) -> dict:
+    # Standard error of the mean and of each percentile from the spread of independent batch estimates
+    batch_means = np.asarray(batch_means, dtype=float)
+    batch_quantiles = np.asarray(batch_quantiles, dtype=float).reshape(len(batch_means), len(percentiles))
+    if len(batch_means) < 2:
+        return {"mean": np.nan, "percentiles": {q: np.nan for q in percentiles}, "n_batches": len(batch_means)}
+    scale = np.sqrt(len(batch_means))
+    return {
+        "mean": float(batch_means.std(ddof=1) / scale),
+        "percentiles": {q: float(se) for q, se in zip(percentiles, batch_quantiles.std(axis=0, ddof=1) / scale)},
+        "n_batches": len(batch_means)
+    }
+
+def batch_standard_errors(batches, percentiles=()) -> dict:
+    batches = [np.asarray(batch, dtype=float) for batch in batches if len(batch) > 0]
+    return standard_errors([batch.mean() for batch in batches],
+                           [np.percentile(batch, percentiles) if len(percentiles) else [] for batch in batches], percentiles)
+
+# Adaptive Simulation Count
+# Batches are simulated in rounds until the confidence interval of every requested percentile is within a relative
+# tolerance of its estimate, or the path or time budget runs out. Batch k always draws from child stream k, so a run
+# that stops at N paths matches a fixed-size chunked run of N paths with the same seed and batch size
+ADAPTIVE_TOLERANCE = 0.01
+ADAPTIVE_CONFIDENCE = 0.95
+ADAPTIVE_BATCH_SIZE = 1_000
+ADAPTIVE_MIN_BATCHES = 8
+ADAPTIVE_MAX_SIMULATIONS = 200_000
+ADAPTIVE_MAX_SECONDS = 2.0
+
+def _batch_values(batch):
+    return batch[0]
+
+def run_until_converged(simulate_batches, percentiles, tolerance: float = ADAPTIVE_TOLERANCE,
+                        confidence: float = ADAPTIVE_CONFIDENCE, batch_size: int = ADAPTIVE_BATCH_SIZE,
+                        min_batches: int = ADAPTIVE_MIN_BATCHES, max_simulations: int = ADAPTIVE_MAX_SIMULATIONS,
+                        max_seconds: float = ADAPTIVE_MAX_SECONDS, batch_values=_batch_values) -> tuple[list, dict]:
+    # simulate_batches(first_batch, n_batches, batch_size) returns the results of batches first_batch .. first_batch + n_batches - 1;
+    # batch_values picks the simulated values out of one batch result
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    max_batches = max(2, max_simulations // batch_size)
+    started = time.perf_counter()
+    batches, batch_means, batch_quantiles = [], [], []
+    n_next = min(max(min_batches, 2), max_batches)
+    stop_reason = None
+    while stop_reason is None:
+        for batch in simulate_batches(len(batches), n_next, batch_size):
+            values = np.asarray(batch_values(batch), dtype=float)
+            batches.append(batch)
+            batch_means.append(values.mean())
+            batch_quantiles.append(np.percentile(values, percentiles))
+        standard_error = standard_errors(batch_means, batch_quantiles, percentiles)
+        estimates = np.mean(batch_quantiles, axis=0)
+        half_widths = z * np.array([standard_error["percentiles"][q] for q in percentiles])
+        allowed = tolerance * np.abs(estimates)
+        elapsed = time.perf_counter() - started
+        if np.all(half_widths <= allowed):
+            stop_reason = "tolerance"
+        elif len(batches) >= max_batches:
+            stop_reason = "max_simulations"
+        elif elapsed >= max_seconds:
+            stop_reason = "time_budget"
+        else:
+            # Half-widths shrink with 1 / sqrt(paths); grow by at most a doubling per round so the time budget is checked often
+            with np.errstate(divide="ignore", invalid="ignore"):
+                growth = np.max(np.where(allowed > 0, (half_widths / allowed) ** 2, np.inf))
+            needed = int(np.ceil(len(batches) * min(growth, 2.0))) - len(batches)
+            n_next = int(np.clip(needed, 1, max_batches - len(batches)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative_half_widths = np.where(half_widths == 0, 0.0, half_widths / np.abs(estimates))
+    return batches, {
+        "converged": stop_reason == "tolerance",
+        "stop_reason": stop_reason,
+        "num_simulations": len(batches) * batch_size,
+        "n_batches": len(batches),
+        "batch_size": batch_size,
+        "tolerance": tolerance,
+        "confidence": confidence,
+        "elapsed_seconds": elapsed,
+        "estimates": {q: float(estimate) for q, estimate in zip(percentiles, estimates)},
+        "half_widths": {q: float(half_width) for q, half_width in zip(percentiles, half_widths)},
+        "relative_half_widths": {q: float(relative) for q, relative in zip(percentiles, relative_half_widths)},
+        "standard_error": standard_error
+    }
@@ -0,0 +1,828 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .monte_carlo import (make_rng, monte_carlo_manifest, get_monte_carlo_executor, run_monte_carlo_chunks,
+                          run_adaptive_monte_carlo, MONTE_CARLO_CHUNK_SIZE)
+from .monte_carlo_stats import (RunningMoments, TDigest, draw_uniforms, standard_errors, split_replicates, batch_standard_errors,
+                                ADAPTIVE_TOLERANCE, ADAPTIVE_BATCH_SIZE, ADAPTIVE_MAX_SIMULATIONS, ADAPTIVE_MAX_SECONDS)
+
+# Core Calculation Functions
+def calculate_il(initial_price_asset1: float, initial_price_asset2: float, current_price_asset1: float, current_price_asset2: float, initial_investment: float,
+                 amplification: float | None = None) -> float:
+    if amplification is not None:
+        return _position_il_batch(initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2,
+                                  initial_investment, amplification=amplification).item()
+    if initial_price_asset2 == 0 or current_price_asset2 == 0 or initial_investment <= 0:
+        return 0
+    initial_amount_asset1 = initial_investment / 2 / initial_price_asset1
+    initial_amount_asset2 = initial_investment / 2 / initial_price_asset2
+    value_if_held = (initial_amount_asset1 * current_price_asset1) + (initial_amount_asset2 * current_price_asset2)
+    pool_value = initial_investment * np.sqrt(current_price_asset1 * current_price_asset2) / np.sqrt(initial_price_asset1 * initial_price_asset2)
+    il = (value_if_held - pool_value) / value_if_held if value_if_held > 0 else 0
+    il_percentage = abs(il) * 100
+    return round(il_percentage, 2) if il_percentage > 0.01 else il_percentage
+
+def calculate_pool_value(initial_investment: float, initial_price_asset1: float, initial_price_asset2: float,
+                        current_price_asset1: float, current_price_asset2: float, amplification: float | None = None) -> tuple[float, float]:
+    if amplification is not None:
+        pool_value, il_impact = _position_value_batch(initial_investment, initial_price_asset1, initial_price_asset2,
+                                                      current_price_asset1, current_price_asset2, amplification=amplification)
+        return pool_value.item(), il_impact.item()
+    initial_amount_asset1 = initial_investment / 2 / initial_price_asset1
+    initial_amount_asset2 = initial_investment / 2 / initial_price_asset2
+    value_if_held = (initial_amount_asset1 * current_price_asset1) + (initial_amount_asset2 * current_price_asset2)
+    pool_value = initial_investment * np.sqrt(current_price_asset1 * current_price_asset2) / np.sqrt(initial_price_asset1 * initial_price_asset2)
+    il_impact = (value_if_held - pool_value) / value_if_held * 100 if value_if_held > 0 else 0
+    return pool_value, il_impact
+
+# Vectorized Calculation Functions (array-in/array-out versions of calculate_il and calculate_pool_value)
+def _broadcast_pool_inputs(*args) -> list[np.ndarray]:
+    return np.broadcast_arrays(*(np.asarray(arg, dtype=float) for arg in args))
+
+def _pool_and_held_values(initial_investment: np.ndarray, initial_price_asset1: np.ndarray, initial_price_asset2: np.ndarray,
+                          current_price_asset1: np.ndarray, current_price_asset2: np.ndarray, valid: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Invalid entries are divided by a placeholder price of 1 and masked out by the caller
+    safe_initial_price_asset1 = np.where(valid, initial_price_asset1, 1.0)
+    safe_initial_price_asset2 = np.where(valid, initial_price_asset2, 1.0)
+    value_if_held = (initial_investment / 2 / safe_initial_price_asset1 * current_price_asset1) + (initial_investment / 2 / safe_initial_price_asset2 * current_price_asset2)
+    pool_value = initial_investment * np.sqrt(current_price_asset1 * current_price_asset2) / np.sqrt(safe_initial_price_asset1 * safe_initial_price_asset2)
+    return pool_value, value_if_held
+
+def calculate_il_batch(initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2, initial_investment) -> np.ndarray:
+    initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2, initial_investment = _broadcast_pool_inputs(
+        initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2, initial_investment)
+    valid = (initial_price_asset1 != 0) & (initial_price_asset2 != 0) & (current_price_asset2 != 0) & (initial_investment > 0)
+    pool_value, value_if_held = _pool_and_held_values(initial_investment, initial_price_asset1, initial_price_asset2,
+                                                      current_price_asset1, current_price_asset2, valid)
+    valid &= value_if_held > 0
+    il = np.divide(value_if_held - pool_value, value_if_held, out=np.zeros_like(value_if_held), where=valid)
+    il_percentage = np.abs(il) * 100
+    return np.where(il_percentage > 0.01, np.round(il_percentage, 2), il_percentage)
+
+def calculate_pool_value_batch(initial_investment, initial_price_asset1, initial_price_asset2,
+                               current_price_asset1, current_price_asset2) -> tuple[np.ndarray, np.ndarray]:
+    initial_investment, initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2 = _broadcast_pool_inputs(
+        initial_investment, initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2)
+    valid = (initial_price_asset1 != 0) & (initial_price_asset2 != 0)
+    pool_value, value_if_held = _pool_and_held_values(initial_investment, initial_price_asset1, initial_price_asset2,
+                                                      current_price_asset1, current_price_asset2, valid)
+    pool_value = np.where(valid, pool_value, 0.0)
+    il_impact = np.divide(value_if_held - pool_value, value_if_held, out=np.zeros_like(value_if_held), where=valid & (value_if_held > 0)) * 100
+    return pool_value, il_impact
+
+# Concentrated Liquidity (range positions, bounds are asset 1 prices quoted in asset 2)
+def _range_amounts(sqrt_price: np.ndarray, sqrt_lower: np.ndarray, sqrt_upper: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Token amounts per unit of liquidity; outside the range the position is held entirely in one asset
+    sqrt_clipped = np.clip(sqrt_price, sqrt_lower, sqrt_upper)
+    return 1 / sqrt_clipped - 1 / sqrt_upper, sqrt_clipped - sqrt_lower
+
+def _in_range(price_asset1: np.ndarray, price_asset2: np.ndarray, range_lower, range_upper) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        price_ratio = np.where(price_asset2 > 0, price_asset1 / np.where(price_asset2 > 0, price_asset2, 1.0), np.inf)
+    return (price_ratio >= range_lower) & (price_ratio <= range_upper)
+
+def calculate_range_position_batch(initial_investment, initial_price_asset1, initial_price_asset2, current_price_asset1,
+                                   current_price_asset2, range_lower, range_upper) -> dict:
+    # Value of a position opened at the initial prices with liquidity between range_lower and range_upper
+    # (0 and np.inf give a full-range position, matching calculate_pool_value_batch)
+    (initial_investment, initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2,
+     range_lower, range_upper) = _broadcast_pool_inputs(initial_investment, initial_price_asset1, initial_price_asset2,
+                                                        current_price_asset1, current_price_asset2, range_lower, range_upper)
+    valid = (initial_price_asset1 > 0) & (initial_price_asset2 > 0) & (current_price_asset2 > 0) & (range_lower >= 0) & (range_upper > range_lower)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sqrt_lower, sqrt_upper = np.sqrt(range_lower), np.sqrt(range_upper)
+        entry_amount_asset1, entry_amount_asset2 = _range_amounts(np.sqrt(initial_price_asset1 / initial_price_asset2), sqrt_lower, sqrt_upper)
+        liquidity = initial_investment / (entry_amount_asset1 * initial_price_asset1 + entry_amount_asset2 * initial_price_asset2)
+        amount_asset1, amount_asset2 = _range_amounts(np.sqrt(current_price_asset1 / current_price_asset2), sqrt_lower, sqrt_upper)
+        pool_value = liquidity * (amount_asset1 * current_price_asset1 + amount_asset2 * current_price_asset2)
+        value_if_held = liquidity * (entry_amount_asset1 * current_price_asset1 + entry_amount_asset2 * current_price_asset2)
+    # A zero price with a zero lower bound leaves 0 * inf terms that are worth nothing
+    pool_value = np.where(valid & np.isfinite(pool_value), pool_value, 0.0)
+    value_if_held = np.where(valid & np.isfinite(value_if_held), value_if_held, 0.0)
+    il_impact = np.divide(value_if_held - pool_value, value_if_held, out=np.zeros_like(value_if_held), where=valid & (value_if_held > 0)) * 100
+    return {
+        "pool_value": pool_value,
+        "value_if_held": value_if_held,
+        "il_impact": il_impact,
+        "in_range": valid & _in_range(current_price_asset1, current_price_asset2, range_lower, range_upper)
+    }
+
+def calculate_range_position(initial_investment: float, initial_price_asset1: float, initial_price_asset2: float,
+                             current_price_asset1: float, current_price_asset2: float, range_lower: float, range_upper: float) -> dict:
+    position = calculate_range_position_batch(initial_investment, initial_price_asset1, initial_price_asset2,
+                                              current_price_asset1, current_price_asset2, range_lower, range_upper)
+    return {key: value.item() for key, value in position.items()}
+
+def calculate_in_range_fraction(price_asset1, price_asset2, range_lower, range_upper, axis: int = -1) -> np.ndarray:
+    # Share of the steps of each price path (along axis) that sit inside the range
+    price_asset1, price_asset2, range_lower, range_upper = _broadcast_pool_inputs(price_asset1, price_asset2, range_lower, range_upper)
+    return _in_range(price_asset1, price_asset2, range_lower, range_upper).mean(axis=axis)
+
+# StableSwap Pools (two-asset Curve invariant on D = 1; amplification 0 is the constant-product pool)
+STABLESWAP_MAX_ITERATIONS = 100
+STABLESWAP_TOLERANCE = 1e-12  # On the log of the pool price
+_STABLESWAP_GUESS_GRID = np.linspace(-40, 40, 4097)  # log reserve of asset 1, tabulated for the Newton starting points
+
+def _stableswap_reserve_asset2(reserve_asset1: np.ndarray, a: np.ndarray) -> np.ndarray:
+    # Root of a * y^2 + b * y - 1 / (4x) = 0 (Curve's get_y with a = 4A), in the form that avoids cancellation for either sign of b
+    b = a * reserve_asset1 + 1 - a
+    root = np.sqrt(b ** 2 + a / reserve_asset1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(b >= 0, 1 / (2 * reserve_asset1) / (b + root), (root - b) / (2 * a))
+
+def _stableswap_log_price(log_reserve_asset1: np.ndarray, a: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Log pool price of asset 1 in asset 2 (the ratio of the invariant's partial derivatives) and its slope in log_reserve_asset1
+    x = np.exp(log_reserve_asset1)
+    y = _stableswap_reserve_asset2(x, a)
+    d_x = a + 1 / (4 * x ** 2 * y)
+    d_y = a + 1 / (4 * x * y ** 2)
+    price = d_x / d_y
+    # Derivatives along the curve, where dy/dx = -price
+    d_xx, d_xy, d_yy = -1 / (2 * x ** 3 * y), -1 / (4 * x ** 2 * y ** 2), -1 / (2 * x * y ** 3)
+    slope = x * ((d_xx - price * d_xy) / d_x - (d_xy - price * d_yy) / d_y)
+    return np.log(price), slope
+
+def stableswap_reserves(price_ratio, amplification) -> tuple[np.ndarray, np.ndarray]:
+    # Reserves (per unit of D) at which the pool price of asset 1 in asset 2 equals price_ratio, found by a safeguarded
+    # Newton iteration on the log reserve run on all scenarios at once; converged scenarios drop out of the active set
+    price_ratio, amplification = np.broadcast_arrays(np.asarray(price_ratio, dtype=float), np.asarray(amplification, dtype=float))
+    shape = price_ratio.shape
+    target, a = np.log(price_ratio).ravel(), 4 * amplification.ravel()
+    if target.size > 1 and np.all(target == target[0]) and np.all(a == a[0]):
+        # Broadcast scalar inputs (e.g. the entry prices of a Monte Carlo run) are solved once
+        reserve_asset1, reserve_asset2 = stableswap_reserves(price_ratio.flat[0], amplification.flat[0])
+        return np.full(shape, reserve_asset1.item()), np.full(shape, reserve_asset2.item())
+    if a.size and np.all(a == a[0]):
+        # One pool: start every scenario from the tabulated curve, a few Newton steps then polish it
+        grid_log_price, _ = _stableswap_log_price(_STABLESWAP_GUESS_GRID, a[0])
+        log_reserve = np.interp(-target, -grid_log_price, _STABLESWAP_GUESS_GRID)
+    else:
+        log_reserve = -np.log(2) - target / 2  # Constant-product reserves
+    lower, upper = np.full(target.shape, -np.inf), np.full(target.shape, np.inf)
+    active = np.arange(target.size)
+    for _ in range(STABLESWAP_MAX_ITERATIONS):
+        if len(active) == 0:
+            break
+        current = log_reserve[active]
+        log_price, slope = _stableswap_log_price(current, a[active])
+        error = log_price - target[active]
+        # The pool price falls as the reserve of asset 1 grows, so the sign of the error brackets the root
+        lower[active] = np.where(error > 0, current, lower[active])
+        upper[active] = np.where(error > 0, upper[active], current)
+        candidate = current - np.clip(error / slope, -8, 8)
+        bracketed = np.isfinite(lower[active]) & np.isfinite(upper[active])
+        inside = (candidate > lower[active]) & (candidate < upper[active])
+        converged = np.abs(error) <= STABLESWAP_TOLERANCE
+        log_reserve[active] = np.where(converged, current, np.where(inside | ~bracketed, candidate,
+                                                                    (lower[active] + upper[active]) / 2))
+        active = active[~converged]
+    reserve_asset1 = np.exp(log_reserve)
+    return reserve_asset1.reshape(shape), _stableswap_reserve_asset2(reserve_asset1, a).reshape(shape)
+
+def calculate_stableswap_position_batch(initial_investment, initial_price_asset1, initial_price_asset2, current_price_asset1,
+                                        current_price_asset2, amplification) -> dict:
+    # Value of a StableSwap LP share bought at the initial prices, with arbitrage holding the pool price at the market price
+    (initial_investment, initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2,
+     amplification) = _broadcast_pool_inputs(initial_investment, initial_price_asset1, initial_price_asset2,
+                                             current_price_asset1, current_price_asset2, amplification)
+    valid = (initial_price_asset1 > 0) & (initial_price_asset2 > 0) & (amplification >= 0)
+    priced = valid & (current_price_asset1 > 0) & (current_price_asset2 > 0)
+    entry_reserve_asset1, entry_reserve_asset2 = stableswap_reserves(
+        np.where(valid, initial_price_asset1, 1.0) / np.where(valid, initial_price_asset2, 1.0), np.where(valid, amplification, 0.0))
+    reserve_asset1, reserve_asset2 = stableswap_reserves(
+        np.where(priced, current_price_asset1, 1.0) / np.where(priced, current_price_asset2, 1.0), np.where(priced, amplification, 0.0))
+    shares = np.where(valid, initial_investment, 0.0) / (entry_reserve_asset1 * np.where(valid, initial_price_asset1, 1.0) +
+                                                          entry_reserve_asset2 * np.where(valid, initial_price_asset2, 1.0))
+    # A worthless asset is all the pool holds once arbitrage has drained the other one
+    pool_value = np.where(priced, shares * (reserve_asset1 * current_price_asset1 + reserve_asset2 * current_price_asset2), 0.0)
+    value_if_held = shares * (entry_reserve_asset1 * current_price_asset1 + entry_reserve_asset2 * current_price_asset2)
+    il_impact = np.divide(value_if_held - pool_value, value_if_held, out=np.zeros_like(value_if_held), where=valid & (value_if_held > 0)) * 100
+    return {"pool_value": pool_value, "value_if_held": value_if_held, "il_impact": il_impact}
+
+def _position_value_batch(initial_investment, initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2,
+                          price_range=None, amplification=None) -> tuple[np.ndarray, np.ndarray]:
+    # Full-range constant-product pool by default, a concentrated position between price_range = (lower, upper),
+    # or a StableSwap pool with the given amplification coefficient
+    if price_range is not None and amplification is not None:
+        raise ValueError("A position is either a concentrated range or a StableSwap pool, not both")
+    if price_range is not None:
+        position = calculate_range_position_batch(initial_investment, initial_price_asset1, initial_price_asset2,
+                                                  current_price_asset1, current_price_asset2, *price_range)
+    elif amplification is not None:
+        position = calculate_stableswap_position_batch(initial_investment, initial_price_asset1, initial_price_asset2,
+                                                       current_price_asset1, current_price_asset2, amplification)
+    else:
+        return calculate_pool_value_batch(initial_investment, initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2)
+    return position["pool_value"], position["il_impact"]
+
+def _position_il_batch(initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2, initial_investment,
+                       price_range=None, amplification=None) -> np.ndarray:
+    if price_range is None and amplification is None:
+        return calculate_il_batch(initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2, initial_investment)
+    _, il_impact = _position_value_batch(initial_investment, initial_price_asset1, initial_price_asset2,
+                                         current_price_asset1, current_price_asset2, price_range, amplification)
+    return il_percentage(il_impact)
+
+def il_percentage(il_impact: np.ndarray) -> np.ndarray:
+    # Same reporting as calculate_il: magnitude in percent, rounded to 2 decimals above 0.01%
+    il_percentage = np.abs(il_impact)
+    return np.where(il_percentage > 0.01, np.round(il_percentage, 2), il_percentage)
+
+def calculate_future_value(initial_investment: float, apy: float, months: int, initial_price_asset1: float, initial_price_asset2: float,
+                          current_price_asset1: float, current_price_asset2: float, expected_price_change_asset1: float,
+                          expected_price_change_asset2: float, is_new_pool: bool = False, price_range=None,
+                          amplification=None) -> tuple[float, float]:
+    if price_range is not None or amplification is not None:
+        value, future_il = calculate_future_value_batch(initial_investment, apy, months, initial_price_asset1, initial_price_asset2,
+                                                        current_price_asset1, current_price_asset2, expected_price_change_asset1,
+                                                        expected_price_change_asset2, is_new_pool, price_range, amplification)
+        return value.item(), future_il.item()
+    if months < 0:
+        return initial_investment, 0.0
+    monthly_price_change_asset1 = (expected_price_change_asset1 / 100) / 12
+    monthly_price_change_asset2 = (expected_price_change_asset2 / 100) / 12
+    if is_new_pool:
+        starting_price_asset1 = current_price_asset1
+        starting_price_asset2 = current_price_asset2
+        initial_adjusted_price_asset1 = current_price_asset1
+        initial_adjusted_price_asset2 = current_price_asset2
+        initial_pool_value, _ = calculate_pool_value(initial_investment, starting_price_asset1, starting_price_asset2,
+                                                    initial_adjusted_price_asset1, initial_adjusted_price_asset2)
+        pool_value = initial_pool_value
+    else:
+        pool_value, _ = calculate_pool_value(initial_investment, initial_price_asset1, initial_price_asset2,
+                                            current_price_asset1, current_price_asset2)
+        starting_price_asset1 = initial_price_asset1
+        starting_price_asset2 = initial_price_asset2
+    if months == 0:
+        return round(pool_value, 2), calculate_il(initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2, initial_investment)
+    current_value = pool_value
+    for month in range(1, months + 1):
+        monthly_apy = (apy / 100) / 12 * (0.95 ** (month - 1))  # 5% monthly decay
+        current_value *= (1 + monthly_apy)
+    final_price_asset1 = current_price_asset1 * (1 + monthly_price_change_asset1 * months)
+    final_price_asset2 = current_price_asset2 * (1 + monthly_price_change_asset2 * months)
+    new_pool_value, _ = calculate_pool_value(initial_investment, initial_price_asset1, initial_price_asset2,
+                                           final_price_asset1, final_price_asset2)
+    future_il = calculate_il(initial_price_asset1, initial_price_asset2, final_price_asset1, final_price_asset2, initial_investment)
+    current_value += (new_pool_value - pool_value)
+    return round(current_value, 2), future_il
+
+def calculate_projection_path(initial_investment: float, apy: float, months: int, initial_price_asset1: float, initial_price_asset2: float,
+                              current_price_asset1: float, current_price_asset2: float, expected_price_change_asset1: float,
+                              expected_price_change_asset2: float, is_new_pool: bool = False, price_range=None,
+                              amplification=None) -> dict:
+    # Month-by-month path for months 0..N in one pass; entry m matches calculate_future_value(..., m, ...)
+    elapsed = np.arange(max(months, 0) + 1)
+    if price_range is not None or amplification is not None:
+        entry_price_asset1, entry_price_asset2 = ((current_price_asset1, current_price_asset2) if is_new_pool else
+                                                  (initial_price_asset1, initial_price_asset2))
+        pool_value, _ = _position_value_batch(initial_investment, entry_price_asset1, entry_price_asset2,
+                                              current_price_asset1, current_price_asset2, price_range, amplification)
+        pool_value = pool_value.item()
+    elif is_new_pool:
+        pool_value, _ = calculate_pool_value(initial_investment, current_price_asset1, current_price_asset2,
+                                             current_price_asset1, current_price_asset2)
+    else:
+        pool_value, _ = calculate_pool_value(initial_investment, initial_price_asset1, initial_price_asset2,
+                                             current_price_asset1, current_price_asset2)
+    price_asset1 = current_price_asset1 * (1 + (expected_price_change_asset1 / 100) / 12 * elapsed)
+    price_asset2 = current_price_asset2 * (1 + (expected_price_change_asset2 / 100) / 12 * elapsed)
+    in_range = np.ones(elapsed.shape, dtype=bool) if price_range is None else _in_range(price_asset1, price_asset2, *price_range)
+    fee_rates = (apy / 100) / 12 * (0.95 ** elapsed[:-1])  # 5% monthly decay
+    if price_range is not None:
+        fee_rates = fee_rates * in_range[1:]  # Range positions only earn fees in months that end in range
+    compounded = np.cumprod(np.concatenate([[pool_value], 1 + fee_rates]))
+    new_pool_value, _ = _position_value_batch(initial_investment, initial_price_asset1, initial_price_asset2,
+                                              price_asset1, price_asset2, price_range, amplification)
+    value = compounded + (new_pool_value - pool_value)
+    value[0] = pool_value
+    return {
+        "month": elapsed,
+        "value": np.round(value, 2),
+        "il": _position_il_batch(initial_price_asset1, initial_price_asset2, price_asset1, price_asset2, initial_investment,
+                                 price_range, amplification),
+        "price_asset1": price_asset1,
+        "price_asset2": price_asset2,
+        "in_range": in_range
+    }
+
+def calculate_future_value_batch(initial_investment, apy, months: int, initial_price_asset1, initial_price_asset2,
+                                 current_price_asset1, current_price_asset2, expected_price_change_asset1,
+                                 expected_price_change_asset2, is_new_pool: bool = False, price_range=None,
+                                 amplification=None) -> tuple[np.ndarray, np.ndarray]:
+    (initial_investment, apy, initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2,
+     expected_price_change_asset1, expected_price_change_asset2) = _broadcast_pool_inputs(
+        initial_investment, apy, initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2,
+        expected_price_change_asset1, expected_price_change_asset2)
+    if months < 0:
+        return initial_investment.copy(), np.zeros(initial_investment.shape)
+    if is_new_pool:
+        pool_value, _ = _position_value_batch(initial_investment, current_price_asset1, current_price_asset2,
+                                              current_price_asset1, current_price_asset2, price_range, amplification)
+    else:
+        pool_value, _ = _position_value_batch(initial_investment, initial_price_asset1, initial_price_asset2,
+                                              current_price_asset1, current_price_asset2, price_range, amplification)
+    if months == 0:
+        return np.round(pool_value, 2), _position_il_batch(initial_price_asset1, initial_price_asset2, current_price_asset1,
+                                                           current_price_asset2, initial_investment, price_range, amplification)
+    current_value = pool_value.copy()
+    for month in range(1, months + 1):
+        if price_range is None:
+            current_value *= 1 + (apy / 100) / 12 * (0.95 ** (month - 1))  # 5% monthly decay
+        else:
+            # Range positions only earn fees in months that end in range
+            month_in_range = _in_range(current_price_asset1 * (1 + (expected_price_change_asset1 / 100) / 12 * month),
+                                       current_price_asset2 * (1 + (expected_price_change_asset2 / 100) / 12 * month), *price_range)
+            current_value *= 1 + (apy / 100) / 12 * (0.95 ** (month - 1)) * month_in_range
+    final_price_asset1 = current_price_asset1 * (1 + (expected_price_change_asset1 / 100) / 12 * months)
+    final_price_asset2 = current_price_asset2 * (1 + (expected_price_change_asset2 / 100) / 12 * months)
+    new_pool_value, _ = _position_value_batch(initial_investment, initial_price_asset1, initial_price_asset2,
+                                              final_price_asset1, final_price_asset2, price_range, amplification)
+    future_il = _position_il_batch(initial_price_asset1, initial_price_asset2, final_price_asset1, final_price_asset2,
+                                   initial_investment, price_range, amplification)
+    current_value += new_pool_value - pool_value
+    return np.round(current_value, 2), future_il
+
+def percentile_indices(values: np.ndarray, percentiles) -> np.ndarray:
+    # Inverted-CDF order statistics (rank ceil(q * n) - 1) found by partial selection instead of a full sort;
+    # 2D values are ranked row by row along the last axis
+    n = values.shape[-1]
+    ranks = np.clip(np.ceil(np.asarray(percentiles, dtype=float) / 100 * n).astype(int) - 1, 0, n - 1)
+    partitioned = np.argpartition(values, ranks, axis=-1)
+    return partitioned[..., ranks]
+
+# Price-Change Sensitivity Grid (12-month value and IL over every pair of expected price changes in one call)
+SENSITIVITY_GRID_SIZE = 500
+SENSITIVITY_PRICE_CHANGE_RANGE = (-90.0, 200.0)  # Expected price change (%) covered on each axis
+
+def calculate_sensitivity_grid(initial_investment: float, apy: float, initial_price_asset1: float, initial_price_asset2: float,
+                               current_price_asset1: float, current_price_asset2: float, is_new_pool: bool = False,
+                               price_change_asset1_values=None, price_change_asset2_values=None, months: int = 12,
+                               price_range=None, amplification=None) -> dict:
+    # Rows follow asset 2's price change and columns asset 1's, so value[i, j] is calculate_future_value at
+    # (price_change_asset1_values[j], price_change_asset2_values[i])
+    default_axis = np.linspace(*SENSITIVITY_PRICE_CHANGE_RANGE, SENSITIVITY_GRID_SIZE)
+    price_change_asset1_values = default_axis if price_change_asset1_values is None else np.asarray(price_change_asset1_values, dtype=float)
+    price_change_asset2_values = default_axis if price_change_asset2_values is None else np.asarray(price_change_asset2_values, dtype=float)
+    value, il = calculate_future_value_batch(initial_investment, apy, months, initial_price_asset1, initial_price_asset2,
+                                             current_price_asset1, current_price_asset2, price_change_asset1_values[None, :],
+                                             price_change_asset2_values[:, None], is_new_pool, price_range, amplification)
+    return {
+        "price_change_asset1": price_change_asset1_values,
+        "price_change_asset2": price_change_asset2_values,
+        "value": value,
+        "il": il,
+        "break_even_share": float((value >= initial_investment).mean())
+    }
+
+# Break-even Solver (cumulative product of the decaying APY schedule, searched per pool)
+MAX_BREAK_EVEN_MONTHS = 1000
+BREAK_EVEN_CHUNK_SIZE = 4096  # Pools per block, bounds the (pools x months) curve to a few MB
+_BREAK_EVEN_WINDOWS = (0, 12, 48, 192, MAX_BREAK_EVEN_MONTHS)  # Widening month windows, so early break-evens never build the long tail
+_APY_DECAY_SCHEDULE = 0.95 ** np.arange(MAX_BREAK_EVEN_MONTHS)  # 5% monthly decay
+
+def _first_month_reached(values: np.ndarray, target: np.ndarray) -> np.ndarray:
+    reached = values >= target[:, None]
+    return np.where(reached.any(axis=1), reached.argmax(axis=1), np.inf)
+
+def _solve_break_even(apy: np.ndarray, pool_value: np.ndarray, value_if_held: np.ndarray, pool_value_change=None,
+                      fee_weight=None) -> np.ndarray:
+    # pool_value_change(rows, elapsed) returns the price-driven change in pool value after `elapsed` months;
+    # fee_weight(rows, elapsed) scales the fees earned in the month ending at `elapsed`
+    months = np.full(apy.shape, np.inf)
+    compounded = pool_value.copy()
+    unresolved = np.arange(len(apy))
+    for window_start, window_end in zip(_BREAK_EVEN_WINDOWS[:-1], _BREAK_EVEN_WINDOWS[1:]):
+        fee_rates = (apy[unresolved, None] / 100) / 12 * _APY_DECAY_SCHEDULE[window_start:window_end]
+        if fee_weight is not None:
+            fee_rates = fee_rates * fee_weight(unresolved, np.arange(window_start, window_end) + 1)
+        growth_factors = 1 + fee_rates
+        curve = np.cumprod(np.column_stack([compounded[unresolved], growth_factors]), axis=1)
+        values = curve[:, :-1]
+        if pool_value_change is not None:
+            values = values + pool_value_change(unresolved, np.arange(window_start, window_end))
+        found = _first_month_reached(values, value_if_held[unresolved])
+        months[unresolved] = found + window_start
+        compounded[unresolved] = curve[:, -1]
+        unresolved = unresolved[np.isinf(found)]
+        if len(unresolved) == 0:
+            break
+    return months
+
+def calculate_break_even_months_batch(apy, initial_pool_value, value_if_held) -> np.ndarray:
+    apy, initial_pool_value, value_if_held = _broadcast_pool_inputs(apy, initial_pool_value, value_if_held)
+    shape = apy.shape
+    apy, initial_pool_value, value_if_held = apy.ravel(), initial_pool_value.ravel(), value_if_held.ravel()
+    months = np.zeros(apy.shape)
+    active = np.flatnonzero((apy > 0) & (initial_pool_value > 0) & (value_if_held > initial_pool_value))
+    for start in range(0, len(active), BREAK_EVEN_CHUNK_SIZE):
+        chunk = active[start:start + BREAK_EVEN_CHUNK_SIZE]
+        months[chunk] = _solve_break_even(apy[chunk], initial_pool_value[chunk], value_if_held[chunk])
+    return months.reshape(shape)
+
+def calculate_break_even_months_with_price_changes_batch(initial_investment, apy, pool_value,
+                                                        initial_price_asset1, initial_price_asset2,
+                                                        current_price_asset1, current_price_asset2,
+                                                        expected_price_change_asset1, expected_price_change_asset2,
+                                                        value_if_held, price_range=None, amplification=None) -> np.ndarray:
+    inputs = _broadcast_pool_inputs(initial_investment, apy, pool_value, initial_price_asset1, initial_price_asset2,
+                                    current_price_asset1, current_price_asset2, expected_price_change_asset1,
+                                    expected_price_change_asset2, value_if_held)
+    shape = inputs[0].shape
+    (initial_investment, apy, pool_value, initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2,
+     expected_price_change_asset1, expected_price_change_asset2, value_if_held) = (arg.ravel() for arg in inputs)
+    monthly_price_change_asset1 = (expected_price_change_asset1 / 100) / 12
+    monthly_price_change_asset2 = (expected_price_change_asset2 / 100) / 12
+    months = np.full(apy.shape, np.inf)
+    active = np.flatnonzero(apy > 0)
+    for start in range(0, len(active), BREAK_EVEN_CHUNK_SIZE):
+        chunk = active[start:start + BREAK_EVEN_CHUNK_SIZE]
+
+        def drifted_prices(rows, elapsed):
+            # Linear price drift, floored at zero so a collapsing asset cannot produce a negative price
+            return (np.maximum(current_price_asset1[rows] * (1 + monthly_price_change_asset1[rows] * elapsed), 0),
+                    np.maximum(current_price_asset2[rows] * (1 + monthly_price_change_asset2[rows] * elapsed), 0))
+
+        def pool_value_change(rows, elapsed):
+            rows = chunk[rows, None]
+            new_pool_value, _ = _position_value_batch(initial_investment[rows], initial_price_asset1[rows], initial_price_asset2[rows],
+                                                      *drifted_prices(rows, elapsed), price_range, amplification)
+            return np.where(elapsed > 0, new_pool_value - pool_value[rows], 0.0)
+
+        def fee_weight(rows, elapsed):
+            return _in_range(*drifted_prices(chunk[rows, None], elapsed), *price_range)
+
+        months[chunk] = _solve_break_even(apy[chunk], pool_value[chunk], value_if_held[chunk], pool_value_change,
+                                          fee_weight if price_range is not None else None)
+    return months.reshape(shape)
+
+def calculate_break_even_months(apy: float, il: float, initial_pool_value: float, value_if_held: float) -> float:
+    months = calculate_break_even_months_batch(apy, initial_pool_value, value_if_held).item()
+    return int(months) if np.isfinite(months) else float('inf')
+
+def calculate_break_even_months_with_price_changes(initial_investment: float, apy: float, pool_value: float,
+                                                  initial_price_asset1: float, initial_price_asset2: float,
+                                                  current_price_asset1: float, current_price_asset2: float,
+                                                  expected_price_change_asset1: float, expected_price_change_asset2: float,
+                                                  value_if_held: float, is_new_pool: bool = False, price_range=None,
+                                                  amplification=None) -> float:
+    months = calculate_break_even_months_with_price_changes_batch(
+        initial_investment, apy, pool_value, initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2,
+        expected_price_change_asset1, expected_price_change_asset2, value_if_held, price_range, amplification
+    ).item()
+    return int(months) if np.isfinite(months) else float('inf')
+
+# Weighted Multi-Asset Pools (Balancer-style; price arrays carry the assets in their last axis)
+def normalize_pool_weights(weights) -> np.ndarray:
+    weights = np.asarray(weights, dtype=float)
+    if weights.ndim != 1 or len(weights) < 2 or np.any(weights <= 0):
+        raise ValueError("A weighted pool needs at least two assets, each with a positive weight")
+    return weights / weights.sum()
+
+def calculate_weighted_pool_batch(initial_investment, price_ratios, weights) -> tuple[np.ndarray, np.ndarray]:
+    # price_ratios is a (scenarios x assets) matrix of current / initial prices. The pool value scales with the weighted
+    # geometric mean of the ratios (a log-sum), the held basket with their weighted arithmetic mean
+    weights = normalize_pool_weights(weights)
+    price_ratios = np.maximum(np.asarray(price_ratios, dtype=float), 0)  # A price cannot fall below zero
+    if price_ratios.shape[-1] != len(weights):
+        raise ValueError(f"Expected {len(weights)} assets in the last axis of price_ratios, got {price_ratios.shape[-1]}")
+    with np.errstate(divide="ignore"):
+        pool_value = initial_investment * np.exp(np.log(price_ratios) @ weights)
+    value_if_held = initial_investment * (price_ratios @ weights)
+    pool_value, value_if_held = np.broadcast_arrays(pool_value, value_if_held)
+    il_impact = np.divide(value_if_held - pool_value, value_if_held, out=np.zeros(value_if_held.shape), where=value_if_held > 0) * 100
+    return pool_value, il_impact
+
+def _weighted_entry_ratios(initial_prices: np.ndarray, current_prices: np.ndarray, is_new_pool: bool) -> np.ndarray:
+    return np.ones(current_prices.shape) if is_new_pool else current_prices / initial_prices
+
+def calculate_weighted_future_value_batch(initial_investment, apy, months: int, initial_prices, current_prices,
+                                          expected_price_changes, weights, is_new_pool: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    # Weighted-pool counterpart of calculate_future_value_batch; apy broadcasts against the leading axes of the price arrays
+    initial_prices, current_prices, expected_price_changes = (np.asarray(prices, dtype=float) for prices in
+                                                              (initial_prices, current_prices, expected_price_changes))
+    apy = np.asarray(apy, dtype=float)
+    pool_value, _ = calculate_weighted_pool_batch(initial_investment, _weighted_entry_ratios(initial_prices, current_prices, is_new_pool), weights)
+    if months < 0:
+        return np.full(np.broadcast_shapes(pool_value.shape, apy.shape), float(initial_investment)), np.zeros(np.broadcast_shapes(pool_value.shape, apy.shape))
+    if months == 0:
+        _, il_impact = calculate_weighted_pool_batch(initial_investment, current_prices / initial_prices, weights)
+        return np.round(pool_value, 2), il_percentage(il_impact)
+    current_value = pool_value
+    for month in range(1, months + 1):
+        current_value = current_value * (1 + (apy / 100) / 12 * (0.95 ** (month - 1)))  # 5% monthly decay
+    final_prices = current_prices * (1 + (expected_price_changes / 100) / 12 * months)
+    new_pool_value, il_impact = calculate_weighted_pool_batch(initial_investment, final_prices / initial_prices, weights)
+    current_value = current_value + (new_pool_value - pool_value)
+    return np.round(current_value, 2), il_percentage(il_impact)
+
+def calculate_weighted_projection_path(initial_investment: float, apy: float, months: int, initial_prices, current_prices,
+                                       expected_price_changes, weights, is_new_pool: bool = False) -> dict:
+    # Month-by-month path for months 0..N; entry m matches calculate_weighted_future_value_batch(..., m, ...)
+    initial_prices, current_prices, expected_price_changes = (np.asarray(prices, dtype=float) for prices in
+                                                              (initial_prices, current_prices, expected_price_changes))
+    elapsed = np.arange(max(months, 0) + 1)
+    pool_value, _ = calculate_weighted_pool_batch(initial_investment, _weighted_entry_ratios(initial_prices, current_prices, is_new_pool), weights)
+    growth_factors = 1 + (apy / 100) / 12 * (0.95 ** elapsed[:-1])  # 5% monthly decay
+    compounded = np.cumprod(np.concatenate([[pool_value.item()], growth_factors]))
+    prices = current_prices * (1 + (expected_price_changes / 100) / 12 * elapsed[:, None])
+    new_pool_value, il_impact = calculate_weighted_pool_batch(initial_investment, prices / initial_prices, weights)
+    value = compounded + (new_pool_value - pool_value)
+    value[0] = pool_value
+    return {
+        "month": elapsed,
+        "value": np.round(value, 2),
+        "il": il_percentage(il_impact),
+        "prices": prices
+    }
+
+def calculate_weighted_break_even_months_with_price_changes(initial_investment: float, apy: float, pool_value: float, initial_prices,
+                                                            current_prices, expected_price_changes, weights, value_if_held: float) -> float:
+    if apy <= 0:
+        return float('inf')
+    initial_prices, current_prices = np.asarray(initial_prices, dtype=float), np.asarray(current_prices, dtype=float)
+    monthly_price_changes = (np.asarray(expected_price_changes, dtype=float) / 100) / 12
+
+    def pool_value_change(rows, elapsed):
+        prices = current_prices * (1 + monthly_price_changes * elapsed[:, None])
+        new_pool_value, _ = calculate_weighted_pool_batch(initial_investment, prices / initial_prices, weights)
+        return np.where(elapsed > 0, new_pool_value - pool_value, 0.0)[None, :]
+
+    months = _solve_break_even(np.array([apy], dtype=float), np.array([pool_value], dtype=float),
+                               np.array([value_if_held], dtype=float), pool_value_change)[0]
+    return int(months) if np.isfinite(months) else float('inf')
+
+def _simulate_pool_chunk(rng: np.random.Generator, num_simulations: int, apy_range, price_change_asset1_range, price_change_asset2_range,
+                         initial_investment: float, initial_price_asset1: float, initial_price_asset2: float,
+                         current_price_asset1: float, current_price_asset2: float, is_new_pool: bool,
+                         sampling: str = "random", price_range=None, amplification=None, return_draws: bool = False) -> tuple:
+    # "random" sampling reproduces three successive rng.uniform calls draw for draw. Returns (values, ils), plus a dict
+    # of the APY and price-change draws behind each scenario when return_draws is set
+    uniforms = draw_uniforms(rng, num_simulations, 3, sampling)
+    apy_samples = apy_range[0] + (apy_range[1] - apy_range[0]) * uniforms[:, 0]
+    price_change_asset1_samples = price_change_asset1_range[0] + (price_change_asset1_range[1] - price_change_asset1_range[0]) * uniforms[:, 1]
+    price_change_asset2_samples = price_change_asset2_range[0] + (price_change_asset2_range[1] - price_change_asset2_range[0]) * uniforms[:, 2]
+    values, ils = calculate_future_value_batch(initial_investment, apy_samples, 12, initial_price_asset1, initial_price_asset2,
+                                               current_price_asset1, current_price_asset2, price_change_asset1_samples,
+                                               price_change_asset2_samples, is_new_pool, price_range, amplification)
+    if not return_draws:
+        return values, ils
+    return values, ils, {"apy": apy_samples, "price_change_asset1": price_change_asset1_samples,
+                         "price_change_asset2": price_change_asset2_samples}
+
+def _simulate_weighted_pool_chunk(rng: np.random.Generator, num_simulations: int, apy_range, price_change_ranges,
+                                  initial_investment: float, initial_prices, current_prices, weights, is_new_pool: bool,
+                                  sampling: str = "random", return_draws: bool = False) -> tuple:
+    # price_change_ranges is an (assets x 2) array of low/high expected price changes
+    price_change_ranges = np.asarray(price_change_ranges, dtype=float)
+    uniforms = draw_uniforms(rng, num_simulations, 1 + len(price_change_ranges), sampling)
+    apy_samples = apy_range[0] + (apy_range[1] - apy_range[0]) * uniforms[:, 0]
+    price_change_samples = price_change_ranges[:, 0] + (price_change_ranges[:, 1] - price_change_ranges[:, 0]) * uniforms[:, 1:]
+    values, ils = calculate_weighted_future_value_batch(initial_investment, apy_samples, 12, initial_prices, current_prices,
+                                                        price_change_samples, weights, is_new_pool)
+    if not return_draws:
+        return values, ils
+    return values, ils, {"apy": apy_samples, **{f"price_change_asset{asset + 1}": price_change_samples[:, asset]
+                                               for asset in range(price_change_samples.shape[1])}}
+
+def _price_change_range(expected_price_change: float) -> list[float]:
+    return [expected_price_change * 0.5, expected_price_change * 1.5] if expected_price_change >= 0 else [expected_price_change * 1.5, expected_price_change * 0.5]
+
+# Streaming Monte Carlo (fixed-size blocks folded into mergeable accumulators, memory is O(block))
+def _summarize_pool_chunk(rng: np.random.Generator, num_simulations: int, simulate=_simulate_pool_chunk,
+                          **chunk_params) -> tuple[RunningMoments, TDigest]:
+    values, _ = simulate(rng, num_simulations, **chunk_params)
+    return RunningMoments().update(values), TDigest().update(values)
+
+def _nearest_pool_scenarios(rng: np.random.Generator, num_simulations: int, targets: np.ndarray, simulate=_simulate_pool_chunk,
+                            **chunk_params) -> np.ndarray:
+    # Rows of (distance, value, il) for the scenario in this block closest to each target value
+    values, ils = simulate(rng, num_simulations, **chunk_params)
+    nearest = np.abs(values[None, :] - targets[:, None]).argmin(axis=1)
+    return np.column_stack([np.abs(values[nearest] - targets), values[nearest], ils[nearest]])
+
+def _streaming_pool_scenarios(seed_sequence: np.random.SeedSequence, num_simulations: int, percentiles, block_size: int,
+                              executor: ProcessPoolExecutor | None, chunk_params: dict,
+                              simulate=_simulate_pool_chunk) -> tuple[list[dict], RunningMoments, dict]:
+    # First pass sketches the value distribution; the second regenerates the same blocks from their child streams
+    # to recover the actual scenario (value and IL) nearest each sketched percentile
+    summaries = run_monte_carlo_chunks(_summarize_pool_chunk, seed_sequence, num_simulations, block_size, executor,
+                                       simulate=simulate, **chunk_params)
+    moments, digest = RunningMoments(), TDigest()
+    for block_moments, block_digest in summaries:
+        moments.merge(block_moments)
+        digest.merge(block_digest)
+    targets = np.atleast_1d(digest.quantile(percentiles))
+    candidates = np.stack(run_monte_carlo_chunks(_nearest_pool_scenarios, seed_sequence, num_simulations, block_size, executor,
+                                                 targets=targets, simulate=simulate, **chunk_params))
+    best_block = candidates[:, :, 0].argmin(axis=0)
+    scenarios = [{"value": float(candidates[block, target, 1]), "il": float(candidates[block, target, 2])}
+                 for target, block in enumerate(best_block)]
+    standard_error = standard_errors([block_moments.mean for block_moments, _ in summaries],
+                                     [block_digest.quantile(percentiles) for _, block_digest in summaries], percentiles)
+    return scenarios, moments, standard_error
+
+def _run_pool_monte_carlo(simulate_chunk, chunk_params: dict, seed, num_simulations: int, percentiles, chunk_size: int | None,
+                          parallel: bool, streaming: bool, adaptive: bool, tolerance: float, max_simulations: int,
+                          max_seconds: float) -> dict:
+    # Shared driver for the pool analyses; simulate_chunk(rng, num_simulations, **chunk_params) returns (values, ils).
+    # Adaptive mode ignores num_simulations and runs batches of chunk_size paths until the percentiles converge
+    if adaptive and streaming:
+        raise ValueError("Adaptive and streaming Monte Carlo modes cannot be combined")
+    rng, seed_sequence = make_rng(seed)
+    executor = get_monte_carlo_executor() if parallel else None
+    precision = None
+    if streaming:
+        (worst, best), moments, standard_error = _streaming_pool_scenarios(seed_sequence, num_simulations, percentiles, chunk_size or MONTE_CARLO_CHUNK_SIZE,
+                                                                           executor, chunk_params, simulate_chunk)
+        value_mean, value_std = moments.mean, moments.std
+    else:
+        if adaptive:
+            convergence = dict(tolerance=tolerance, batch_size=chunk_size or ADAPTIVE_BATCH_SIZE,
+                               max_simulations=max_simulations, max_seconds=max_seconds)
+            chunks, precision = run_adaptive_monte_carlo(simulate_chunk, seed_sequence, percentiles, executor, convergence, **chunk_params)
+            num_simulations = precision["num_simulations"]
+        elif parallel or chunk_size is not None:
+            chunks = run_monte_carlo_chunks(simulate_chunk, seed_sequence, num_simulations, chunk_size or MONTE_CARLO_CHUNK_SIZE,
+                                            executor, **chunk_params)
+        if adaptive or parallel or chunk_size is not None:
+            values = np.concatenate([chunk_values for chunk_values, _ in chunks])
+            ils = np.concatenate([chunk_ils for _, chunk_ils in chunks])
+            standard_error = batch_standard_errors([chunk_values for chunk_values, _ in chunks], percentiles)
+        else:
+            values, ils = simulate_chunk(rng, num_simulations, **chunk_params)
+            standard_error = batch_standard_errors(split_replicates(values), percentiles)
+        worst_index, best_index = percentile_indices(values, percentiles)
+        worst = {"value": float(values[worst_index]), "il": float(ils[worst_index])}
+        best = {"value": float(values[best_index]), "il": float(ils[best_index])}
+        value_mean, value_std = float(values.mean()), float(values.std())
+    return {
+        "worst": worst,
+        "best": best,
+        "value_stats": {"mean": value_mean, "std": value_std},
+        "standard_error": standard_error,
+        "precision": precision,
+        "num_simulations": num_simulations,
+        "seed_sequence": seed_sequence,
+        "manifest_inputs": {
+            "num_simulations": num_simulations, "percentiles": list(percentiles),
+            "chunk_size": chunk_size or (ADAPTIVE_BATCH_SIZE if adaptive else MONTE_CARLO_CHUNK_SIZE if parallel or streaming else None),
+            "streaming": streaming,
+            "sampling": chunk_params["sampling"],
+            "adaptive": {"tolerance": tolerance, "max_simulations": max_simulations, "max_seconds": max_seconds} if adaptive else None
+        }
+    }
+
+def simplified_monte_carlo_analysis(initial_investment: float, apy: float, initial_price_asset1: float, initial_price_asset2: float,
+                                   current_price_asset1: float, current_price_asset2: float, expected_price_change_asset1: float,
+                                   expected_price_change_asset2: float, is_new_pool: bool, num_simulations: int = 200,
+                                   percentiles: tuple[float, float] = (10, 90), seed=None, chunk_size: int | None = None,
+                                   parallel: bool = False, streaming: bool = False, sampling: str = "random", adaptive: bool = False,
+                                   tolerance: float = ADAPTIVE_TOLERANCE, max_simulations: int = ADAPTIVE_MAX_SIMULATIONS,
+                                   max_seconds: float = ADAPTIVE_MAX_SECONDS, price_range=None, amplification=None) -> dict:
+    apy_range = [max(apy * 0.5, 0), apy * 1.5]
+    chunk_params = dict(apy_range=apy_range, price_change_asset1_range=_price_change_range(expected_price_change_asset1),
+                        price_change_asset2_range=_price_change_range(expected_price_change_asset2), initial_investment=initial_investment,
+                        initial_price_asset1=initial_price_asset1, initial_price_asset2=initial_price_asset2,
+                        current_price_asset1=current_price_asset1, current_price_asset2=current_price_asset2, is_new_pool=is_new_pool,
+                        sampling=sampling, price_range=price_range, amplification=amplification)
+    run = _run_pool_monte_carlo(_simulate_pool_chunk, chunk_params, seed, num_simulations, percentiles, chunk_size, parallel,
+                                streaming, adaptive, tolerance, max_simulations, max_seconds)
+    expected_value, expected_il = calculate_future_value(initial_investment, apy, 12, initial_price_asset1, initial_price_asset2,
+                                                        current_price_asset1, current_price_asset2, expected_price_change_asset1,
+                                                        expected_price_change_asset2, is_new_pool, price_range, amplification)
+    return {
+        "worst": run["worst"],
+        "expected": {"value": expected_value, "il": expected_il},
+        "best": run["best"],
+        "value_stats": run["value_stats"],
+        "sampling": sampling,
+        "standard_error": run["standard_error"],
+        "precision": run["precision"],
+        "percentiles": percentiles,
+        "num_simulations": run["num_simulations"],
+        "manifest": monte_carlo_manifest("simplified_monte_carlo_analysis", run["seed_sequence"], {
+            "initial_investment": initial_investment, "apy": apy,
+            "initial_price_asset1": initial_price_asset1, "initial_price_asset2": initial_price_asset2,
+            "current_price_asset1": current_price_asset1, "current_price_asset2": current_price_asset2,
+            "expected_price_change_asset1": expected_price_change_asset1, "expected_price_change_asset2": expected_price_change_asset2,
+            "is_new_pool": is_new_pool, "price_range": list(price_range) if price_range is not None else None,
+            "amplification": amplification,
+            **run["manifest_inputs"]
+        })
+    }
+
+def weighted_monte_carlo_analysis(initial_investment: float, apy: float, initial_prices, current_prices, expected_price_changes,
+                                  weights, is_new_pool: bool, num_simulations: int = 200, percentiles: tuple[float, float] = (10, 90),
+                                  seed=None, chunk_size: int | None = None, parallel: bool = False, streaming: bool = False,
+                                  sampling: str = "random", adaptive: bool = False, tolerance: float = ADAPTIVE_TOLERANCE,
+                                  max_simulations: int = ADAPTIVE_MAX_SIMULATIONS, max_seconds: float = ADAPTIVE_MAX_SECONDS) -> dict:
+    # simplified_monte_carlo_analysis for a weighted pool, with one price-change draw per asset
+    weights = normalize_pool_weights(weights).tolist()
+    apy_range = [max(apy * 0.5, 0), apy * 1.5]
+    chunk_params = dict(apy_range=apy_range, price_change_ranges=[_price_change_range(change) for change in expected_price_changes],
+                        initial_investment=initial_investment, initial_prices=list(initial_prices), current_prices=list(current_prices),
+                        weights=weights, is_new_pool=is_new_pool, sampling=sampling)
+    run = _run_pool_monte_carlo(_simulate_weighted_pool_chunk, chunk_params, seed, num_simulations, percentiles, chunk_size, parallel,
+                                streaming, adaptive, tolerance, max_simulations, max_seconds)
+    expected_value, expected_il = calculate_weighted_future_value_batch(initial_investment, apy, 12, initial_prices, current_prices,
+                                                                        expected_price_changes, weights, is_new_pool)
+    return {
+        "worst": run["worst"],
+        "expected": {"value": expected_value.item(), "il": expected_il.item()},
+        "best": run["best"],
+        "value_stats": run["value_stats"],
+        "sampling": sampling,
+        "standard_error": run["standard_error"],
+        "precision": run["precision"],
+        "percentiles": percentiles,
+        "num_simulations": run["num_simulations"],
+        "manifest": monte_carlo_manifest("weighted_monte_carlo_analysis", run["seed_sequence"], {
+            "initial_investment": initial_investment, "apy": apy, "initial_prices": list(initial_prices),
+            "current_prices": list(current_prices), "expected_price_changes": list(expected_price_changes), "weights": weights,
+            "is_new_pool": is_new_pool, **run["manifest_inputs"]
+        })
+    }
+
+# Scenario Export (every scenario of a recorded pool Monte Carlo run, regenerated from its manifest)
+def pool_monte_carlo_scenarios(manifest: dict) -> dict:
+    # Every mode except the single-chunk serial run draws chunk k from child stream k, so replaying the recorded chunk
+    # layout reproduces the run scenario for scenario, draws included, without the analysis having kept any arrays.
+    # Returns one contiguous column per field: scenario, apy, price_change_asset1.., value, il
+    inputs = manifest["inputs"]
+    seed_sequence = np.random.SeedSequence(manifest["seed"]["entropy"], spawn_key=tuple(manifest["seed"]["spawn_key"]))
+    apy_range = [max(inputs["apy"] * 0.5, 0), inputs["apy"] * 1.5]
+    if manifest["engine"] == "weighted_monte_carlo_analysis":
+        simulate = _simulate_weighted_pool_chunk
+        chunk_params = dict(apy_range=apy_range, price_change_ranges=[_price_change_range(change) for change in inputs["expected_price_changes"]],
+                            initial_investment=inputs["initial_investment"], initial_prices=inputs["initial_prices"],
+                            current_prices=inputs["current_prices"], weights=inputs["weights"], is_new_pool=inputs["is_new_pool"],
+                            sampling=inputs["sampling"])
+    elif manifest["engine"] == "simplified_monte_carlo_analysis":
+        simulate = _simulate_pool_chunk
+        chunk_params = dict(apy_range=apy_range, price_change_asset1_range=_price_change_range(inputs["expected_price_change_asset1"]),
+                            price_change_asset2_range=_price_change_range(inputs["expected_price_change_asset2"]),
+                            initial_investment=inputs["initial_investment"], initial_price_asset1=inputs["initial_price_asset1"],
+                            initial_price_asset2=inputs["initial_price_asset2"], current_price_asset1=inputs["current_price_asset1"],
+                            current_price_asset2=inputs["current_price_asset2"], is_new_pool=inputs["is_new_pool"],
+                            sampling=inputs["sampling"], amplification=inputs["amplification"],
+                            price_range=tuple(inputs["price_range"]) if inputs["price_range"] is not None else None)
+    else:
+        raise ValueError(f"No pool scenarios to regenerate for a {manifest['engine']} manifest")
+    if inputs["chunk_size"] is None:
+        chunks = [simulate(np.random.default_rng(seed_sequence), inputs["num_simulations"], return_draws=True, **chunk_params)]
+    else:
+        chunks = run_monte_carlo_chunks(simulate, seed_sequence, inputs["num_simulations"], inputs["chunk_size"],
+                                        return_draws=True, **chunk_params)
+    columns = {"scenario": np.arange(inputs["num_simulations"])}
+    columns.update({name: np.concatenate([draws[name] for _, _, draws in chunks]) for name in chunks[0][2]})
+    columns["value"] = np.concatenate([values for values, _, _ in chunks])
+    columns["il"] = np.concatenate([ils for _, ils, _ in chunks])
+    return columns
+
+# Composite Risk Score (shared by the page and the batch scorer; every input may be an array of pools)
+HURDLE_RATE_PREMIUM = 6.0  # Inflation added to the risk-free rate
+RISK_SCORE_WEIGHTS = {
+    'IL': 1.5,
+    'Net Return': 1.2,
+    'TVL': 1.0,
+    'APY vs Hurdle': 1.0,
+    'Platform Trust': 2.5,
+    'Fear and Greed': 2.0
+}
+
+def _tiered_score(value, high_threshold, low_threshold, inclusive: bool = True) -> np.ndarray:
+    # 100 at or above the high threshold, 50 at or above the low one, 0 below (strictly above when not inclusive)
+    above = np.greater_equal if inclusive else np.greater
+    return np.where(above(value, high_threshold), 100.0, np.where(above(value, low_threshold), 50.0, 0.0))
+
+def calculate_risk_scores_batch(il, net_return, current_tvl, apy, hurdle_rate, platform_trust_score,
+                                fear_and_greed_score) -> tuple[dict, np.ndarray]:
+    il, net_return, current_tvl, apy, hurdle_rate, platform_trust_score, fear_and_greed_score = _broadcast_pool_inputs(
+        il, net_return, current_tvl, apy, hurdle_rate, platform_trust_score, fear_and_greed_score)
+    scores = {
+        'IL': np.where(il < 2, 100.0, np.where(il < 5, 50.0, 0.0)),
+        'Net Return': _tiered_score(net_return, 1.5, 1, inclusive=False),
+        'TVL': _tiered_score(current_tvl, 1_000_000, 250_000),
+        'APY vs Hurdle': _tiered_score(apy, hurdle_rate + 10, hurdle_rate),
+        'Platform Trust': _tiered_score(platform_trust_score, 4, 3),
+        'Fear and Greed': 100 - np.abs(50 - fear_and_greed_score) * 2
+    }
+    total_weight = sum(RISK_SCORE_WEIGHTS.values())
+    composite_score = sum(scores[metric] * RISK_SCORE_WEIGHTS[metric] for metric in scores) / total_weight
+    return scores, composite_score
+
+# Parse TVL Input Function
+def parse_tvl_input(tvl_str: str) -> float:
+    try:
+        tvl_str = tvl_str.strip().lower()
+        if tvl_str.endswith('m'):
+            return float(tvl_str[:-1]) * 1_000_000
+        elif tvl_str.endswith('k'):
+            return float(tvl_str[:-1]) * 1_000
+        else:
+            return float(tvl_str)
+    except ValueError:
+        return 1.00  # Default on invalid input
@@ -0,0 +1,201 @@
+from io import BytesIO
+
+import numpy as np
+import streamlit as st
+
+from arta_engine.cache import ResultCache
+
+# Charts for the Streamlit Pages
+# Each chart is drawn on its own matplotlib Figure (no pyplot global state, so concurrent sessions cannot draw onto
+# each other's axes) and kept as PNG bytes in a process-wide cache keyed by a hash of everything it plots. Identical
+# charts, such as the defaults every new visitor sees, are rendered once per server. With native=True the data goes
+# to the browser as a Vega-Lite spec instead and nothing is rendered on the server.
+# matplotlib and seaborn are imported on the first rendered chart rather than at page load, so a session that never
+# draws a chart (or only draws native ones) skips their import cost at cold start.
+CHART_CACHE_MAX_ENTRIES = 256
+CHART_CACHE_MAX_BYTES = 64 * 1024 ** 2
+CHART_CACHE_TTL_SECONDS = None  # A chart depends only on its key, so entries never go stale
+CHART_DPI = 160  # Keeps a 10-inch chart under the 1460 px Streamlit re-encodes, so cached bytes go out as-is
+NATIVE_HEATMAP_CELLS = 100  # Per axis; the browser draws one mark per cell, so larger grids are strided down
+
+chart_cache = ResultCache(max_entries=CHART_CACHE_MAX_ENTRIES, ttl_seconds=CHART_CACHE_TTL_SECONDS, max_bytes=CHART_CACHE_MAX_BYTES)
+
+def _load_plotting():
+    from matplotlib.figure import Figure
+    import seaborn as sns
+    return Figure, sns
+
+def _money(value: float) -> str:
+    return f"${value:,.2f}"
+
+# Projected Value Lines (series are plotted in order; the first one is shaded where it falls below the investment)
+def _draw_projection(ax, sns, months, series, colors, initial_investment, title):
+    for (label, values), color in zip(series.items(), colors):
+        sns.lineplot(x=months, y=values, label=label, color=color, linewidth=2.5, marker='o', ax=ax)
+    ax.axhline(y=initial_investment, color='#FF4D4D', linestyle='--', label=f'Initial Investment ({_money(initial_investment)})')
+    first = np.asarray(next(iter(series.values())), dtype=float)
+    ax.fill_between(months, initial_investment, first, where=(first < initial_investment), color='#FF4D4D', alpha=0.1, label='Loss Zone')
+    ax.set_title(title)
+    ax.set_xlabel('Months')
+    ax.set_ylabel('Value ($)')
+    ax.legend()
+
+def _projection_spec(months, series, colors, initial_investment, title):
+    rows = [{"Month": month, "Series": label, "Value": float(value)}
+            for label, values in series.items() for month, value in zip(months, values)]
+    first_label = next(iter(series))
+    return {
+        "title": title,
+        "data": {"values": rows},
+        "layer": [
+            {"transform": [{"filter": {"field": "Series", "equal": first_label}},
+                           {"filter": f"datum.Value < {initial_investment}"}, {"calculate": str(initial_investment), "as": "Investment"}],
+             "mark": {"type": "area", "color": "#FF4D4D", "opacity": 0.1},
+             "encoding": {"x": {"field": "Month", "type": "quantitative"}, "y": {"field": "Value", "type": "quantitative"},
+                          "y2": {"field": "Investment"}}},
+            {"mark": {"type": "line", "point": True, "strokeWidth": 2.5},
+             "encoding": {"x": {"field": "Month", "type": "quantitative", "title": "Months"},
+                          "y": {"field": "Value", "type": "quantitative", "title": "Value ($)"},
+                          "color": {"field": "Series", "type": "nominal", "sort": list(series),
+                                    "scale": {"domain": list(series), "range": list(colors)}},
+                          "tooltip": [{"field": "Series"}, {"field": "Month"}, {"field": "Value", "format": "$,.2f"}]}},
+            {"mark": {"type": "rule", "color": "#FF4D4D", "strokeDash": [6, 4]},
+             "encoding": {"y": {"datum": initial_investment}}}
+        ]
+    }
+
+# Outcome Distribution (histogram with vertical markers, e.g. worst/expected/best case)
+def _draw_distribution(ax, sns, values, markers, bins, title):
+    sns.histplot(values, bins=bins, color='#A9A9A9', ax=ax)
+    for label, x, color, dashed in markers:
+        ax.axvline(x, color=color, label=label, linewidth=1.5 if dashed else 2, linestyle='--' if dashed else '-')
+    ax.set_title(title)
+    ax.set_xlabel("Value ($)")
+    ax.set_ylabel("Frequency")
+    ax.legend()
+
+def _distribution_spec(values, markers, bins, title):
+    # Binned on the server: the browser receives one row per bin, not one per simulated outcome
+    counts, edges = np.histogram(values, bins=bins)
+    rows = [{"start": float(start), "end": float(end), "count": int(count)} for start, end, count in zip(edges[:-1], edges[1:], counts)]
+    return {
+        "title": title,
+        "layer": [
+            {"data": {"values": rows}, "mark": {"type": "bar", "color": "#A9A9A9"},
+             "encoding": {"x": {"field": "start", "type": "quantitative", "title": "Value ($)"}, "x2": {"field": "end"},
+                          "y": {"field": "count", "type": "quantitative", "title": "Frequency"}}},
+            {"data": {"values": [{"label": label, "x": float(x)} for label, x, _, _ in markers]}, "mark": {"type": "rule", "strokeWidth": 2},
+             "encoding": {"x": {"field": "x", "type": "quantitative"},
+                          "color": {"field": "label", "type": "nominal", "title": None,
+                                    "scale": {"domain": [label for label, _, _, _ in markers], "range": [color for _, _, color, _ in markers]}},
+                          "tooltip": [{"field": "label"}, {"field": "x", "format": "$,.2f"}]}}
+        ]
+    }
+
+# Scenario Bars (one bar per scenario with a dashed reference line)
+def _draw_scenarios(ax, sns, scenarios, values, colors, reference_label, reference, title):
+    ax.bar(scenarios, values, color=colors)
+    ax.axhline(y=reference, color='#1E2A44', linestyle='--', label=reference_label)
+    ax.set_title(title)
+    ax.set_ylabel("Value ($)")
+    ax.legend()
+
+def _scenarios_spec(scenarios, values, colors, reference_label, reference, title):
+    return {
+        "title": title,
+        "layer": [
+            {"data": {"values": [{"Scenario": scenario, "Value": float(value)} for scenario, value in zip(scenarios, values)]},
+             "mark": "bar",
+             "encoding": {"x": {"field": "Scenario", "type": "nominal", "sort": list(scenarios), "title": None},
+                          "y": {"field": "Value", "type": "quantitative", "title": "Value ($)"},
+                          "color": {"field": "Scenario", "type": "nominal", "legend": None,
+                                    "scale": {"domain": list(scenarios), "range": list(colors)}},
+                          "tooltip": [{"field": "Scenario"}, {"field": "Value", "format": "$,.2f"}]}},
+            {"mark": {"type": "rule", "color": "#1E2A44", "strokeDash": [6, 4]}, "encoding": {"y": {"datum": reference}}}
+        ]
+    }
+
+# Sensitivity Map (value or IL over a grid of two price changes, with a break-even contour and a marked point)
+def _draw_heatmap(ax, sns, x, y, z, contour, contour_level, point, cmap, label, title, xlabel, ylabel):
+    mesh = ax.pcolormesh(x, y, z, shading="auto", cmap=cmap)
+    ax.figure.colorbar(mesh, ax=ax, label=label)
+    break_even = ax.contour(x, y, contour, levels=[contour_level], colors='#1E2A44', linestyles='--', linewidths=2)
+    ax.clabel(break_even, fmt={contour_level: "Break-even"}, fontsize=9)
+    ax.scatter([point[0]], [point[1]], marker='*', s=250, color='#FFC107', edgecolors='#1E2A44', label='Your Expectation', zorder=3)
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.legend(loc='upper right')
+
+def _heatmap_spec(x, y, z, contour, contour_level, point, cmap, label, title, xlabel, ylabel):
+    # Strided to NATIVE_HEATMAP_CELLS per axis. Vega-Lite has no contour mark, so cells below the break-even level
+    # are faded instead of drawing the break-even line
+    x_step, y_step = max(1, len(x) // NATIVE_HEATMAP_CELLS), max(1, len(y) // NATIVE_HEATMAP_CELLS)
+    xs, ys = np.asarray(x)[::x_step], np.asarray(y)[::y_step]
+    zs, above = np.asarray(z)[::y_step, ::x_step], np.asarray(contour)[::y_step, ::x_step] >= contour_level
+    x_half = float(xs[1] - xs[0]) / 2 if len(xs) > 1 else 0.5
+    y_half = float(ys[1] - ys[0]) / 2 if len(ys) > 1 else 0.5
+    # Cell edges are derived in the browser, so each row carries only its centre, value and break-even flag
+    rows = [{"x": round(float(xv), 3), "y": round(float(yv), 3), "z": round(float(zs[row, column]), 4), "b": bool(above[row, column])}
+            for row, yv in enumerate(ys) for column, xv in enumerate(xs)]
+    scheme = {"RdYlGn": "redyellowgreen", "Reds": "reds"}.get(cmap, "viridis")
+    return {
+        "title": title,
+        "layer": [
+            {"data": {"values": rows}, "mark": {"type": "rect"},
+             "transform": [{"calculate": f"datum.x - {x_half}", "as": "x1"}, {"calculate": f"datum.x + {x_half}", "as": "x2"},
+                           {"calculate": f"datum.y - {y_half}", "as": "y1"}, {"calculate": f"datum.y + {y_half}", "as": "y2"}],
+             "encoding": {"x": {"field": "x1", "type": "quantitative", "title": xlabel}, "x2": {"field": "x2"},
+                          "y": {"field": "y1", "type": "quantitative", "title": ylabel}, "y2": {"field": "y2"},
+                          "color": {"field": "z", "type": "quantitative", "title": label, "scale": {"scheme": scheme}},
+                          "opacity": {"condition": {"test": "datum.b", "value": 1.0}, "value": 0.55},
+                          "tooltip": [{"field": "z", "title": label, "format": ",.2f"}]}},
+            {"data": {"values": [{"x": float(point[0]), "y": float(point[1])}]},
+             "mark": {"type": "point", "shape": "diamond", "size": 250, "filled": True, "color": "#FFC107", "stroke": "#1E2A44"},
+             "encoding": {"x": {"field": "x", "type": "quantitative"}, "y": {"field": "y", "type": "quantitative"}}}
+        ]
+    }
+
+# Allocation Pie
+def _draw_allocation(ax, sns, labels, sizes, colors, explode, title):
+    ax.pie(sizes, explode=explode, labels=labels, colors=colors, autopct='%1.1f%%', shadow=True, startangle=140)
+    ax.set_title(title)
+
+def _allocation_spec(labels, sizes, colors, explode, title):
+    rows = [{"Class": label, "Share": float(size)} for label, size in zip(labels, sizes)]
+    return {
+        "title": title,
+        "data": {"values": rows},
+        "encoding": {"theta": {"field": "Share", "type": "quantitative", "stack": True},
+                     "color": {"field": "Class", "type": "nominal", "title": None, "scale": {"domain": list(labels), "range": list(colors)}},
+                     "tooltip": [{"field": "Class"}, {"field": "Share", "format": ".1f"}]},
+        "layer": [{"mark": {"type": "arc", "outerRadius": 140}},
+                  {"mark": {"type": "text", "radius": 165}, "encoding": {"text": {"field": "Share", "format": ".1f"}}}]
+    }
+
+CHARTS = {  # name -> (matplotlib drawer, Vega-Lite spec builder, figure size in inches)
+    "projection": (_draw_projection, _projection_spec, (10, 6)),
+    "distribution": (_draw_distribution, _distribution_spec, (10, 6)),
+    "scenarios": (_draw_scenarios, _scenarios_spec, (10, 6)),
+    "heatmap": (_draw_heatmap, _heatmap_spec, (10, 8)),
+    "allocation": (_draw_allocation, _allocation_spec, (8, 8))
+}
+
+def render_chart(chart: str, **data) -> bytes:
+    # PNG bytes for one chart; rendered only when no chart with the same name and data is cached
+    def render(chart, **data):
+        Figure, sns = _load_plotting()
+        draw, _, figsize = CHARTS[chart]
+        with sns.axes_style("whitegrid"):
+            figure = Figure(figsize=figsize)
+            draw(figure.subplots(), sns, **data)
+        buffer = BytesIO()
+        figure.savefig(buffer, format="png", dpi=CHART_DPI, bbox_inches="tight")
+        return buffer.getvalue()
+    return chart_cache.get_or_compute(dict(chart=chart, **data), render)[0]
+
+def show_chart(chart: str, native: bool = False, **data) -> None:
+    if native:
+        st.vega_lite_chart(CHARTS[chart][1](**data), use_container_width=True)
+    else:
+        st.image(render_chart(chart, **data), use_container_width=True)
@@ -1,8 +1,27 @@
 import streamlit as st
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from arta_engine.asset import (parse_market_value, run_asset_monte_carlo_summary, INVESTOR_PROFILE_WEIGHTS, calculate_asset_scores,
+                               weighted_composite_score)
+from arta_engine.monte_carlo_stats import ADAPTIVE_TOLERANCE
+from arta_engine.cache import ResultCache
+from charts import show_chart
+from tables import show_projection_table
+
+# Monte Carlo Cache (one per server process, so it survives reruns and is shared by sessions; bounded by entries, bytes and age)
+MONTE_CARLO_CACHE_MAX_ENTRIES = 64
+MONTE_CARLO_CACHE_MAX_BYTES = 128 * 1024 ** 2
+MONTE_CARLO_CACHE_TTL_SECONDS = 3600.0
+
+@st.cache_resource
+def monte_carlo_cache() -> ResultCache:
+    return ResultCache(max_entries=MONTE_CARLO_CACHE_MAX_ENTRIES, ttl_seconds=MONTE_CARLO_CACHE_TTL_SECONDS,
+                       max_bytes=MONTE_CARLO_CACHE_MAX_BYTES)
+
+def run_monte_carlo(initial_investment, growth_rate, fear_and_greed, months, **options) -> dict:
+    # Caches the compact summary (final values, drawdown percentiles, return statistics), never the simulated paths
+    inputs = dict(initial_investment=initial_investment, growth_rate=growth_rate, fear_and_greed=fear_and_greed, months=months, **options)
+    return monte_carlo_cache().get_or_compute(inputs, run_asset_monte_carlo_summary)[0]
 
 # Custom CSS
 st.markdown("""
@@ -214,20 +233,6 @@ investor_profile = st.sidebar.selectbox(
 )
 st.sidebar.markdown("**Note**: Your investor profile adjusts the composite score based on your risk tolerance.")
 
-def parse_market_value(value_str):
-    try:
-        value_str = value_str.replace(",", "").lower()
-        if value_str.endswith("b"):
-            return float(value_str[:-1]) * 1_000_000_000
-        elif value_str.endswith("m"):
-            return float(value_str[:-1]) * 1_000_000
-        elif value_str.endswith("k"):
-            return float(value_str[:-1]) * 1_000
-        else:
-            return float(value_str)
-    except:
-        return 0.0
-
 asset_price = st.sidebar.number_input("Current Asset Price ($)", min_value=0.0, value=0.0, step=0.0001, format="%.4f")
 certik_score = st.sidebar.number_input("CertiK Score (0–100)", min_value=0.0, max_value=100.0, value=0.0)
 st.sidebar.markdown("**Note**: Enter 0 if no CertiK score is available; this will default to a neutral score of 50.")
@@ -256,6 +261,8 @@ quantity_purchased = st.sidebar.number_input("Quantity Purchased", min_value=0.0
 alt_asset_name = st.sidebar.text_input("Alternative Asset Name", value="", placeholder="e.g., ETH")
 alt_growth_rate = st.sidebar.number_input("Expected Growth Rate of Alternative Asset % (Annual)", min_value=0.0, value=0.0, step=0.1, help="Enter 0 to skip this comparison.")
 
+native_charts = st.sidebar.checkbox("Interactive Charts", value=False,
+                                    help="Draw charts in your browser, with zoom and hover values, instead of as images")
 calculate = st.sidebar.button("Calculate")
 
 # Initialize variables with default values to avoid NameError
@@ -270,10 +277,12 @@ swap_analysis = None
 asset_values = [0] * 13  # Default for 12 months + initial
 initial_investment = initial_investment if initial_investment > 0 else 1  # Avoid division by zero
 simulations = [0]  # Default for Monte Carlo
+mc_report = None
 worst_case = 0
 expected_case = 0
 best_case = 0
 max_drawdown = 0
+drawdown_desc = "Worst-case loss scenario."
 dilution_ratio = 0
 supply_ratio = 0
 mcap_vs_btc = 0
@@ -310,51 +319,16 @@ if calculate:
         
         asset_values = [initial_investment * p / asset_price for p in asset_projections]
         
-        @st.cache_data
-        def run_monte_carlo(initial_investment, growth_rate, fear_and_greed, months, n_simulations=200):
-            expected_annual_return = growth_rate / 100
-            if fear_and_greed <= 24:
-                volatility_value = 0.75
-            elif fear_and_greed <= 49:
-                volatility_value = 0.60
-            elif fear_and_greed == 50:
-                volatility_value = 0.40
-            elif fear_and_greed <= 74:
-                volatility_value = 0.50
-            else:
-                volatility_value = 0.70
-            volatility_adjustment = 1.2 if fear_and_greed <= 49 else 1.1 if fear_and_greed > 50 else 1.0
-            adjusted_volatility = volatility_value * volatility_adjustment
-            monthly_volatility = adjusted_volatility / np.sqrt(12) if adjusted_volatility > 0 else 0.1
-            lower_bound = expected_annual_return - adjusted_volatility
-            upper_bound = expected_annual_return + adjusted_volatility
-            monthly_expected_return = (1 + expected_annual_return) ** (1/12) - 1
-            simulations, sim_paths, all_monthly_returns = [], [], []
-            for _ in range(n_simulations):
-                alpha, beta = (2, 5) if fear_and_greed <= 49 else (5, 2) if fear_and_greed > 50 else (2, 2)
-                raw_return = np.random.beta(alpha, beta)
-                annual_return = lower_bound + (upper_bound - lower_bound) * raw_return
-                monthly_base_return = (1 + annual_return) ** (1/12) - 1
-                monthly_returns = np.random.normal(monthly_base_return, monthly_volatility/2, months)
-                sim_prices = [initial_investment]
-                for i in range(months):
-                    sim_prices.append(sim_prices[-1] * (1 + monthly_returns[i]))
-                max_allowed_value = initial_investment * (1 + expected_annual_return + adjusted_volatility)
-                sim_prices[-1] = min(sim_prices[-1], max_allowed_value)
-                simulations.append(sim_prices[-1])
-                sim_paths.append(sim_prices)
-                all_monthly_returns.extend(monthly_returns)
-            return simulations, sim_paths, all_monthly_returns
-
         # Run Monte Carlo for the primary asset (for general projections)
-        simulations, sim_paths, all_monthly_returns = run_monte_carlo(initial_investment, growth_rate, fear_and_greed, months)
+        mc_summary = run_monte_carlo(initial_investment, growth_rate, fear_and_greed, months, adaptive=True)
+        simulations, mc_manifest, mc_report = mc_summary["simulations"], mc_summary["manifest"], mc_summary["report"]
         worst_case = np.percentile(simulations, 10)
         expected_case = np.mean(simulations)
         best_case = np.percentile(simulations, 90)
-        worst_path = sim_paths[np.argmin([p[-1] for p in sim_paths])]
-        peak = np.maximum.accumulate(worst_path)
-        drawdowns = (peak - worst_path) / peak
-        max_drawdown = max(drawdowns) * 100
+        drawdown = mc_summary["drawdown"]
+        max_drawdown = drawdown["max_drawdown"][90]  # Scored at the 90th percentile of every path's drawdown
+        drawdown_desc = (f"Median {drawdown['max_drawdown'][50]:.0f}%, 1 in 100 {drawdown['max_drawdown'][99]:.0f}%. "
+                         f"Typically {drawdown['time_under_water'][50]:.0f} months under water.")
         break_even_percentage = (max_drawdown / (100 - max_drawdown)) * 100
 
         if total_supply > 0 and market_cap > 0 and asset_price > 0:
@@ -400,63 +374,22 @@ if calculate:
 
         annual_return = (asset_values[-1] / initial_investment - 1)
         rf_annual = risk_free_rate / 100
-        std_dev = np.std(simulations) / initial_investment
-        sharpe_ratio = (annual_return - rf_annual) / std_dev if std_dev > 0 else 0
-        negative_returns = [r for r in all_monthly_returns if r < 0]
-        downside_std = np.std(negative_returns) if negative_returns else 0
-        sortino_ratio = (annual_return - rf_annual) / downside_std if downside_std > 0 else 0
+        sharpe_ratio = mc_summary["terminal_returns"].sharpe_ratio(annual_return - rf_annual)
+        sortino_ratio = mc_summary["returns"].sortino_ratio(annual_return - rf_annual)
 
         hurdle_rate = (risk_free_rate + 6) * 2
         asset_vs_hurdle = growth_rate - hurdle_rate
 
         # Define individual scores
-        scores = {
-            'Max Drawdown': 100 if max_drawdown < 20 else 50 if max_drawdown < 40 else 0,
-            'Dilution Risk': 100 if dilution_ratio < 20 else 50 if dilution_ratio < 50 else 0,
-            'Supply Concentration': 0 if supply_ratio < 20 else 50 if supply_ratio < 50 else 100,
-            'MCap Growth': 100 if mcap_vs_btc < 1 else 50 if mcap_vs_btc < 5 else 0,
-            'Sharpe Ratio': 100 if sharpe_ratio > 1 else 50 if sharpe_ratio > 0 else 0,
-            'Sortino Ratio': 100 if sortino_ratio > 1 else 50 if sortino_ratio > 0 else 0,
-            'CertiK Score': 100 if (50 if certik_score == 0 else certik_score) >= 70 else 50 if (50 if certik_score == 0 else certik_score) >= 40 else 0,
-            'Market Cap': 100 if market_cap >= 1_000_000_000 else 50 if market_cap >= 10_000_000 else 0,
-            'Fear and Greed': 100 if fear_and_greed <= 24 else 75 if fear_and_greed <= 49 else 50 if fear_and_greed == 50 else 25 if fear_and_greed <= 74 else 0,
-            'Liquidity': 0 if vol_mkt_cap < 1 else 50 if vol_mkt_cap <= 5 else 100,
-            'Fear and Greed Penalty': 100 - abs(50 - fear_and_greed) * 2
-        }
-
-        # Define weights based on investor profile
-        weights = {
-            "Conservative Investor": {
-                "Max Drawdown": 2.0, "Dilution Risk": 1.5, "Supply Concentration": 1.2, "MCap Growth": 0.5,
-                "Sharpe Ratio": 1.0, "Sortino Ratio": 1.0, "CertiK Score": 3.0, "Market Cap": 1.2,
-                "Fear and Greed": 0.8, "Liquidity": 1.5, "Fear and Greed Penalty": 2.5
-            },
-            "Bitcoin Strategist": {
-                "Max Drawdown": 1.0, "Dilution Risk": 1.0, "Supply Concentration": 1.0, "MCap Growth": 2.0,
-                "Sharpe Ratio": 1.0, "Sortino Ratio": 1.0, "CertiK Score": 2.5, "Market Cap": 1.0,
-                "Fear and Greed": 0.5, "Liquidity": 1.0, "Fear and Greed Penalty": 1.5
-            },
-            "Growth Crypto Investor": {
-                "Max Drawdown": 1.0, "Dilution Risk": 1.0, "Supply Concentration": 1.0, "MCap Growth": 1.2,
-                "Sharpe Ratio": 1.5, "Sortino Ratio": 1.5, "CertiK Score": 2.5, "Market Cap": 1.0,
-                "Fear and Greed": 1.0, "Liquidity": 1.0, "Fear and Greed Penalty": 2.0
-            },
-            "Aggressive Crypto Investor": {
-                "Max Drawdown": 0.3, "Dilution Risk": 0.8, "Supply Concentration": 0.8, "MCap Growth": 2.0,
-                "Sharpe Ratio": 1.2, "Sortino Ratio": 1.2, "CertiK Score": 2.5, "Market Cap": 1.0,
-                "Fear and Greed": 1.0, "Liquidity": 0.8, "Fear and Greed Penalty": 1.5
-            }
-        }
+        scores = calculate_asset_scores(max_drawdown, dilution_ratio, supply_ratio, mcap_vs_btc, sharpe_ratio, sortino_ratio,
+                                        certik_score, market_cap, fear_and_greed, vol_mkt_cap)
+        weights = INVESTOR_PROFILE_WEIGHTS
 
         # Calculate weighted composite score for the primary asset
-        weighted_sum = sum(scores[metric] * weights[investor_profile][metric] for metric in scores)
-        total_weight = sum(weights[investor_profile].values())
-        composite_score = weighted_sum / total_weight if total_weight > 0 else 0
+        composite_score = weighted_composite_score(scores, weights[investor_profile])
 
         # Calculate Baseline Score (Using Growth Investor Weights for Comparison)
-        baseline_weighted_sum = sum(scores[metric] * weights["Growth Crypto Investor"][metric] for metric in scores)
-        baseline_total_weight = sum(weights["Growth Crypto Investor"].values())
-        baseline_score = baseline_weighted_sum / baseline_total_weight if baseline_total_weight > 0 else 0
+        baseline_score = weighted_composite_score(scores, weights["Growth Crypto Investor"])
         profile_adjustment = composite_score - baseline_score
         profile_adjustment_text = f"Profile Adjustment: {'+' if profile_adjustment >= 0 else ''}{profile_adjustment:.1f} points"
 
@@ -478,9 +411,7 @@ if calculate:
                 "Fear and Greed": weights[investor_profile]["Fear and Greed"],
                 "Fear and Greed Penalty": weights[investor_profile]["Fear and Greed Penalty"]
             }
-            alt_weighted_sum = sum(alt_scores[metric] * alt_weights[metric] for metric in alt_scores)
-            alt_total_weight = sum(alt_weights.values())
-            alt_composite_score = alt_weighted_sum / alt_total_weight if alt_total_weight > 0 else 0
+            alt_composite_score = weighted_composite_score(alt_scores, alt_weights)
 
         fear_greed_classification = "Extreme Fear" if fear_and_greed <= 24 else "Fear" if fear_and_greed <= 49 else "Neutral" if fear_and_greed == 50 else "Greed" if fear_and_greed <= 74 else "Extreme Greed"
         bg_class = "risk-green" if composite_score >= 70 else "risk-yellow" if composite_score >= 40 else "risk-red"
@@ -576,9 +507,7 @@ if entry_price > 0 and quantity_purchased > 0 and alt_growth_rate > 0:
         "Fear and Greed": weights[investor_profile]["Fear and Greed"],
         "Fear and Greed Penalty": weights[investor_profile]["Fear and Greed Penalty"]
     }
-    alt_weighted_sum = sum(alt_scores[metric] * alt_weights[metric] for metric in alt_scores)
-    alt_total_weight = sum(alt_weights.values())
-    alt_composite_score = alt_weighted_sum / alt_total_weight if alt_total_weight > 0 else 0
+    alt_composite_score = weighted_composite_score(alt_scores, alt_weights)
     alt_risk_score = alt_composite_score
 
     # Calculate base risk-adjusted scores based on investor profile
@@ -707,9 +636,9 @@ with st.expander("Key Metrics", expanded=False):
     st.markdown("### Risk Metrics")
     st.markdown(f"""
         <div class="metric-tile">
-            <div class="metric-title">📉 Max DD<span class="tooltip" title="Biggest possible loss after 12 months in a worst case. What to do: Below 20%, stay in. Above 20%, set a stop-loss—or hold if you trust the asset’s future value.">?</span></div>
+            <div class="metric-title">📉 Max DD<span class="tooltip" title="Biggest drop from a peak that 9 in 10 simulated paths stay within. What to do: Below 20%, stay in. Above 20%, set a stop-loss—or hold if you trust the asset’s future value.">?</span></div>
             <div class="metric-value {'yellow-text' if max_drawdown > 20 else 'green-text'}">{max_drawdown:.2f}%</div>
-            <div class="metric-desc">Worst-case loss scenario.</div>
+            <div class="metric-desc">{drawdown_desc}</div>
         </div>
     """, unsafe_allow_html=True)
 
@@ -927,57 +856,26 @@ with st.expander("Key Metrics", expanded=False):
 # Projected Investment Value Over Time (Unchanged)
 with st.expander("Projected Investment Value Over Time", expanded=False):
     st.markdown("**Note**: Projected values reflect growth of your initial investment. S&P 500 projection assumes a 7.5% inflation-adjusted CAGR, based on long-term historical averages. Short-term performance may vary (e.g., SPY returned 3.57% from April 2024 to April 2025).")
-    proj_data = {
-        "Metric": ["Asset Value ($)", "Asset ROI (%)", "BTC Value ($)", "BTC ROI (%)", "Stablecoin Value ($)", "Stablecoin ROI (%)", "S&P 500 Value ($)", "S&P 500 ROI (%)"],
-        "Month 0": [asset_values[0], ((asset_values[0] / initial_investment) - 1) * 100, btc_values[0], ((btc_values[0] / initial_investment) - 1) * 100, rf_projections[0], ((rf_projections[0] / initial_investment) - 1) * 100, sp500_values[0], ((sp500_values[0] / initial_investment) - 1) * 100],
-        "Month 3": [asset_values[3], ((asset_values[3] / initial_investment) - 1) * 100, btc_values[3], ((btc_values[3] / initial_investment) - 1) * 100, rf_projections[3], ((rf_projections[3] / initial_investment) - 1) * 100, sp500_values[3], ((sp500_values[3] / initial_investment) - 1) * 100],
-        "Month 6": [asset_values[6], ((asset_values[6] / initial_investment) - 1) * 100, btc_values[6], ((btc_values[6] / initial_investment) - 1) * 100, rf_projections[6], ((rf_projections[6] / initial_investment) - 1) * 100, sp500_values[6], ((sp500_values[6] / initial_investment) - 1) * 100],
-        "Month 12": [asset_values[12], ((asset_values[12] / initial_investment) - 1) * 100, btc_values[12], ((btc_values[12] / initial_investment) - 1) * 100, rf_projections[12], ((rf_projections[12] / initial_investment) - 1) * 100, sp500_values[12], ((sp500_values[12] / initial_investment) - 1) * 100]
-    }
-    proj_df = pd.DataFrame(proj_data)
-
-    def color_roi(val, row_idx):
-        if "ROI" in proj_df.iloc[row_idx]["Metric"]:
-            return 'color: #32CD32' if val > 0 else 'color: #FF4D4D' if val < 0 else 'color: #A9A9A9'
-        return ''
-
-    styled_proj_df = proj_df.style.set_table_attributes('class="proj-table"').format({
-        "Month 0": lambda x: "${:,.2f}".format(x) if "Value" in proj_df.iloc[proj_df.index[proj_df['Month 0'] == x].tolist()[0]]["Metric"] else "{:.2f}%".format(x),
-        "Month 3": lambda x: "${:,.2f}".format(x) if "Value" in proj_df.iloc[proj_df.index[proj_df['Month 3'] == x].tolist()[0]]["Metric"] else "{:.2f}%".format(x),
-        "Month 6": lambda x: "${:,.2f}".format(x) if "Value" in proj_df.iloc[proj_df.index[proj_df['Month 6'] == x].tolist()[0]]["Metric"] else "{:.2f}%".format(x),
-        "Month 12": lambda x: "${:,.2f}".format(x) if "Value" in proj_df.iloc[proj_df.index[proj_df['Month 12'] == x].tolist()[0]]["Metric"] else "{:.2f}%".format(x)
-    }).apply(lambda row: [color_roi(row["Month 0"], row.name), color_roi(row["Month 3"], row.name), color_roi(row["Month 6"], row.name), color_roi(row["Month 12"], row.name), ''], axis=1)
-    
-    st.markdown('<div class="proj-table-container">', unsafe_allow_html=True)
-    st.table(styled_proj_df)
-    st.markdown('</div>', unsafe_allow_html=True)
+    show_projection_table({"Asset": asset_values, "BTC": btc_values, "Stablecoin": rf_projections, "S&P 500": sp500_values},
+                          [0, 3, 6, 12], initial_investment)
 
     with st.spinner("Generating chart..."):
-        df_proj = pd.DataFrame({
-            'Month': range(months + 1),
-            'Asset Value': asset_values,
-            'Bitcoin Value': btc_values,
-            'Stablecoin Value': rf_projections,
-            'S&P 500 Value': sp500_values
-        })
-        plt.figure(figsize=(10, 6))
-        sns.set_style("whitegrid")
-        sns.lineplot(data=df_proj, x='Month', y='Asset Value', label='Asset', color='#4B5EAA', linewidth=2.5, marker='o')  # Blue
-        sns.lineplot(data=df_proj, x='Month', y='Bitcoin Value', label='Bitcoin', color='#FFC107', linewidth=2.5, marker='o')  # Yellow
-        sns.lineplot(data=df_proj, x='Month', y='Stablecoin Value', label='Stablecoin', color='#A9A9A9', linewidth=2.5, marker='o')  # Gray
-        sns.lineplot(data=df_proj, x='Month', y='S&P 500 Value', label='S&P 500', color='#32CD32', linewidth=2.5, marker='o')  # Green
-        plt.axhline(y=initial_investment, color='#FF4D4D', linestyle='--', label=f'Initial Investment (${initial_investment:,.2f})')
-        plt.fill_between(df_proj['Month'], initial_investment, df_proj['Asset Value'], where=(df_proj['Asset Value'] < initial_investment), color='#FF4D4D', alpha=0.1, label='Loss Zone')
-        plt.title('Projected Investment Value Over 12 Months')
-        plt.xlabel('Months')
-        plt.ylabel('Value ($)')
-        plt.legend()
-        st.pyplot(plt)
-        plt.clf()
+        show_chart("projection", native_charts, months=list(range(months + 1)),
+                   series={"Asset": asset_values, "Bitcoin": btc_values, "Stablecoin": rf_projections, "S&P 500": sp500_values},
+                   colors=['#4B5EAA', '#FFC107', '#A9A9A9', '#32CD32'],  # Blue, yellow, gray, green
+                   initial_investment=initial_investment, title='Projected Investment Value Over 12 Months')
 
 # Simplified Monte Carlo Analysis (Unchanged)
 with st.expander("Simplified Monte Carlo Analysis", expanded=False):
-    st.markdown("Tests 200 possible outcomes over 12 months based on market mood.")
+    mc_precision = mc_report["precision"] if mc_report else None
+    if mc_precision:
+        precision_status = ("converged" if mc_precision["converged"] else "stopped at the outcome budget before converging"
+                            if mc_precision["stop_reason"] == "max_simulations" else "stopped at the time budget before converging")
+        precision_note = f" This run {precision_status} after {mc_precision['num_simulations']:,} outcomes."
+    else:
+        precision_note = ""
+    st.markdown(f"Tests possible outcomes over 12 months based on market mood, adding batches until the worst and best cases are within "
+                f"±{ADAPTIVE_TOLERANCE:.0%} (95% confidence).{precision_note}")
     st.markdown("- **Expected**: Average | **Best**: One of the highest outcomes | **Worst**: One of the lowest outcomes")
     mc_data = {
         "Scenario": ["Worst Case", "Expected Case", "Best Case"],
@@ -989,20 +887,22 @@ with st.expander("Simplified Monte Carlo Analysis", expanded=False):
         return ['background: #D32F2F'] * len(row) if row['Scenario'] == 'Worst Case' else ['background: #FFB300'] * len(row) if row['Scenario'] == 'Expected Case' else ['background: #388E3C'] * len(row)
     styled_mc_df = mc_df.style.apply(highlight_rows, axis=1).set_table_attributes('class="monte-carlo-table"')
     st.table(styled_mc_df)
+    if mc_precision:
+        st.markdown(f"**Achieved Precision**: {mc_precision['num_simulations']:,} outcomes | "
+                    f"Worst Case ±${mc_precision['half_widths'][10]:,.2f} ({mc_precision['relative_half_widths'][10]:.2%}) | "
+                    f"Best Case ±${mc_precision['half_widths'][90]:,.2f} ({mc_precision['relative_half_widths'][90]:.2%}) at 95% confidence")
+        cache_stats = monte_carlo_cache().stats()
+        st.caption(f"Monte Carlo cache: {cache_stats['entries']}/{cache_stats['max_entries']} results, "
+                   f"{cache_stats['bytes'] / 1024 ** 2:,.1f} MB of {cache_stats['max_bytes'] / 1024 ** 2:,.0f} MB "
+                   f"({cache_stats['bytes_per_entry'] / 1024:,.0f} KB per result) | "
+                   f"{cache_stats['hits']:,} hits, {cache_stats['misses']:,} misses, {cache_stats['evictions']:,} evictions")
 
     with st.spinner("Generating chart..."):
-        plt.figure(figsize=(10, 6))
-        sns.histplot(simulations, bins=50, color='#A9A9A9')
-        plt.axvline(worst_case, color='#D32F2F', label='Worst Case', linewidth=2)
-        plt.axvline(expected_case, color='#FFB300', label='Expected Case', linewidth=2)
-        plt.axvline(best_case, color='#388E3C', label='Best Case', linewidth=2)
-        plt.axvline(initial_investment, color='#1E2A44', linestyle='--', label=f'Initial Investment (${initial_investment:,.2f})')
-        plt.title("Simplified Monte Carlo Analysis - 12 Month Investment Value")
-        plt.xlabel("Value ($)")
-        plt.ylabel("Frequency")
-        plt.legend()
-        st.pyplot(plt)
-        plt.clf()
+        show_chart("distribution", native_charts, values=np.asarray(simulations, dtype=float), bins=50,
+                   markers=[("Worst Case", worst_case, '#D32F2F', False), ("Expected Case", expected_case, '#FFB300', False),
+                            ("Best Case", best_case, '#388E3C', False),
+                            (f"Initial Investment (${initial_investment:,.2f})", initial_investment, '#1E2A44', True)],
+                   title="Simplified Monte Carlo Analysis - 12 Month Investment Value")
 
 # Suggested Portfolio Structure (Unchanged)
 with st.expander("Suggested Portfolio Structure", expanded=False):
@@ -1017,11 +917,8 @@ with st.expander("Suggested Portfolio Structure", expanded=False):
     sizes = list(portfolios[investor_profile].values())
     colors = ['#4B5EAA', '#FFC107', '#32CD32', '#FF4D4D']
     explode = (0.05, 0, 0, 0)
-    plt.figure(figsize=(8, 8))
-    plt.pie(sizes, explode=explode, labels=labels, colors=colors, autopct='%1.1f%%', shadow=True, startangle=140)
-    plt.title(f"Portfolio Allocation for {investor_profile}")
-    st.pyplot(plt)
-    plt.clf()
+    show_chart("allocation", native_charts, labels=labels, sizes=sizes, colors=colors, explode=explode,
+               title=f"Portfolio Allocation for {investor_profile}")
 
     st.markdown("""
     ### Understanding the Asset Classes
@@ -0,0 +1,80 @@
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Cold-Start Import Benchmark
+# Runs the top-of-file imports of each entry point in a fresh interpreter and fails when the median import time is
+# over its budget, or when a module that should only load on first use (charts, PDF export, QMC sampling) is
+# already imported at start.
+# Usage: python import_benchmark.py [--repeat 5] [--budget-scale 1.5]
+REPO_ROOT = Path(__file__).resolve().parent
+IMPORT_BUDGETS = {  # Seconds of import time, interpreter start-up excluded
+    "arta_engine.pool": 0.5,
+    "arta_engine.asset": 0.5,
+    "pool_batch.py": 1.5,
+    "pool_analyzer.py": 2.0,
+    "price_analyzer.py": 2.0,
+    "doghouse.py": 2.0
+}
+LAZY_MODULES = ("matplotlib", "seaborn", "reportlab", "scipy")
+
+_MEASURE = """
+import sys, time
+started = time.perf_counter()
+exec(compile({imports!r}, "<imports>", "exec"))
+elapsed = time.perf_counter() - started
+print(elapsed)
+print(",".join(sorted({{name.split(".")[0] for name in sys.modules}} & set({lazy!r}))))
+"""
+
+def entry_point_imports(target: str) -> str:
+    # Modules are imported as-is; scripts contribute the import block at the top of the file, which is everything a
+    # Streamlit session pays for before the first widget renders
+    if not target.endswith(".py"):
+        return f"import {target}"
+    lines = []
+    for line in (REPO_ROOT / target).read_text(encoding="utf-8").splitlines():
+        stripped = line.strip()
+        continuation = line[:1].isspace() or stripped.startswith(")")
+        if stripped and not stripped.startswith("#") and not line.startswith(("import ", "from ")) and not continuation:
+            break
+        lines.append(line)
+    return "\n".join(lines)
+
+def measure_import(target: str, repeat: int) -> dict:
+    code = _MEASURE.format(imports=entry_point_imports(target), lazy=LAZY_MODULES)
+    timings, eager = [], set()
+    for _ in range(repeat):
+        run = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True)
+        if run.returncode != 0:
+            return {"error": run.stderr.strip().splitlines()[-1] if run.stderr.strip() else f"exit code {run.returncode}"}
+        elapsed, loaded = run.stdout.splitlines()[-2:]
+        timings.append(float(elapsed))
+        eager |= set(filter(None, loaded.split(",")))
+    return {"seconds": statistics.median(timings), "eager": sorted(eager)}
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Fail when the cold-start import time of an entry point exceeds its budget.")
+    parser.add_argument("targets", nargs="*", default=list(IMPORT_BUDGETS), help="Entry points to check (default: all)")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per entry point; the median is compared")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="Multiplier on every budget, e.g. for slower CI machines")
+    args = parser.parse_args(argv)
+    failures = 0
+    for target in args.targets:
+        budget = IMPORT_BUDGETS.get(target, max(IMPORT_BUDGETS.values())) * args.budget_scale
+        result = measure_import(target, args.repeat)
+        if "error" in result:
+            status, detail = "FAIL", result["error"]
+        elif result["eager"]:
+            status, detail = "FAIL", f"{result['seconds']:.3f}s, imports {', '.join(result['eager'])} at start"
+        else:
+            status = "ok" if result["seconds"] <= budget else "FAIL"
+            detail = f"{result['seconds']:.3f}s"
+        failures += status == "FAIL"
+        print(f"{status:4}  {target:20} {detail} (budget {budget:.2f}s)")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,135 +1,154 @@
 import streamlit as st
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from io import StringIO, BytesIO
 import csv
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-
-# Core Calculation Functions
-def calculate_il(initial_price_asset1: float, initial_price_asset2: float, current_price_asset1: float, current_price_asset2: float, initial_investment: float) -> float:
-    if initial_price_asset2 == 0 or current_price_asset2 == 0 or initial_investment <= 0:
-        return 0
-    initial_amount_asset1 = initial_investment / 2 / initial_price_asset1
-    initial_amount_asset2 = initial_investment / 2 / initial_price_asset2
-    value_if_held = (initial_amount_asset1 * current_price_asset1) + (initial_amount_asset2 * current_price_asset2)
-    pool_value = initial_investment * np.sqrt(current_price_asset1 * current_price_asset2) / np.sqrt(initial_price_asset1 * initial_price_asset2)
-    il = (value_if_held - pool_value) / value_if_held if value_if_held > 0 else 0
-    il_percentage = abs(il) * 100
-    return round(il_percentage, 2) if il_percentage > 0.01 else il_percentage
-
-def calculate_pool_value(initial_investment: float, initial_price_asset1: float, initial_price_asset2: float,
-                        current_price_asset1: float, current_price_asset2: float) -> tuple[float, float]:
-    initial_amount_asset1 = initial_investment / 2 / initial_price_asset1
-    initial_amount_asset2 = initial_investment / 2 / initial_price_asset2
-    value_if_held = (initial_amount_asset1 * current_price_asset1) + (initial_amount_asset2 * current_price_asset2)
-    pool_value = initial_investment * np.sqrt(current_price_asset1 * current_price_asset2) / np.sqrt(initial_price_asset1 * initial_price_asset2)
-    il_impact = (value_if_held - pool_value) / value_if_held * 100 if value_if_held > 0 else 0
-    return pool_value, il_impact
-
-def calculate_future_value(initial_investment: float, apy: float, months: int, initial_price_asset1: float, initial_price_asset2: float,
-                          current_price_asset1: float, current_price_asset2: float, expected_price_change_asset1: float,
-                          expected_price_change_asset2: float, is_new_pool: bool = False) -> tuple[float, float]:
-    if months < 0:
-        return initial_investment, 0.0
-    monthly_price_change_asset1 = (expected_price_change_asset1 / 100) / 12
-    monthly_price_change_asset2 = (expected_price_change_asset2 / 100) / 12
-    if is_new_pool:
-        starting_price_asset1 = current_price_asset1
-        starting_price_asset2 = current_price_asset2
-        initial_adjusted_price_asset1 = current_price_asset1
-        initial_adjusted_price_asset2 = current_price_asset2
-        initial_pool_value, _ = calculate_pool_value(initial_investment, starting_price_asset1, starting_price_asset2,
-                                                    initial_adjusted_price_asset1, initial_adjusted_price_asset2)
-        pool_value = initial_pool_value
+from arta_engine.pool import (calculate_il, calculate_pool_value, calculate_range_position, calculate_stableswap_position_batch,
+                              calculate_projection_path, calculate_sensitivity_grid, calculate_break_even_months,
+                              calculate_break_even_months_with_price_changes, normalize_pool_weights, calculate_weighted_pool_batch,
+                              calculate_weighted_projection_path, calculate_weighted_break_even_months_with_price_changes,
+                              simplified_monte_carlo_analysis, weighted_monte_carlo_analysis, calculate_risk_scores_batch,
+                              parse_tvl_input, il_percentage, SENSITIVITY_GRID_SIZE, SENSITIVITY_PRICE_CHANGE_RANGE,
+                              HURDLE_RATE_PREMIUM)
+from arta_engine.monte_carlo_stats import ADAPTIVE_TOLERANCE
+from arta_engine.cache import ResultCache, canonical_input_hash
+from arta_engine.export import pool_results_archive
+from charts import show_chart
+
+# Price-Change Sensitivity Grid (cached per session inputs; the grid itself lives in arta_engine.pool)
+@st.cache_data(max_entries=16)
+def cached_sensitivity_grid(initial_investment: float, apy: float, initial_price_asset1: float, initial_price_asset2: float,
+                            current_price_asset1: float, current_price_asset2: float, is_new_pool: bool, price_range=None,
+                            amplification=None, grid_size: int = SENSITIVITY_GRID_SIZE) -> dict:
+    # The grid depends only on the inputs other than the expected price changes, so moving those never recomputes it
+    axis = np.linspace(*SENSITIVITY_PRICE_CHANGE_RANGE, grid_size)
+    return calculate_sensitivity_grid(initial_investment, apy, initial_price_asset1, initial_price_asset2, current_price_asset1,
+                                      current_price_asset2, is_new_pool, axis, axis, price_range=price_range, amplification=amplification)
+
+# Pool Pipeline (everything Calculate shows except the charts and exports, cached per distinct set of sidebar inputs)
+POOL_RESULT_CACHE_MAX_ENTRIES = 128
+POOL_RESULT_CACHE_TTL_SECONDS = 3600.0  # Monte Carlo scenarios are redrawn at most hourly for a repeated configuration
+
+@st.cache_resource
+def pool_result_cache() -> ResultCache:
+    # One cache per server process, shared by every session, so the default pools are computed once for all users
+    return ResultCache(max_entries=POOL_RESULT_CACHE_MAX_ENTRIES, ttl_seconds=POOL_RESULT_CACHE_TTL_SECONDS)
+
+def run_pool_pipeline(investment_amount: float, apy: float, is_new_pool: bool, initial_prices: list, current_prices: list,
+                      expected_price_changes: list, pool_weights, price_range, amplification, current_tvl: float,
+                      platform_trust_score: int, fear_and_greed_score: int, risk_free_rate: float) -> dict:
+    if pool_weights is None:
+        initial_price_asset1, initial_price_asset2 = initial_prices
+        current_price_asset1, current_price_asset2 = current_prices
+        expected_price_change_asset1, expected_price_change_asset2 = expected_price_changes
+    # Compute Risk Metrics
+    if pool_weights is not None:
+        price_ratios = np.divide(current_prices, initial_prices)
+        weighted_pool_value, il_impact = calculate_weighted_pool_batch(investment_amount, price_ratios, pool_weights)
+        il = il_percentage(il_impact).item()
+        pool_value = weighted_pool_value.item() if not is_new_pool else investment_amount
+        value_if_held = investment_amount * float(price_ratios @ normalize_pool_weights(pool_weights))
+    elif amplification is not None:
+        stableswap_position = calculate_stableswap_position_batch(investment_amount, initial_price_asset1, initial_price_asset2,
+                                                                  current_price_asset1, current_price_asset2, amplification)
+        il = il_percentage(stableswap_position["il_impact"]).item()
+        pool_value = stableswap_position["pool_value"].item() if not is_new_pool else investment_amount
+        value_if_held = stableswap_position["value_if_held"].item()
+    elif price_range is None:
+        il = calculate_il(initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2, investment_amount)
+        pool_value, _ = calculate_pool_value(investment_amount, initial_price_asset1, initial_price_asset2,
+                                            current_price_asset1, current_price_asset2) if not is_new_pool else (investment_amount, 0.0)
+        value_if_held = (investment_amount / 2 / initial_price_asset1 * current_price_asset1) + (investment_amount / 2 / initial_price_asset2 * current_price_asset2)
+    else:
+        range_position = calculate_range_position(investment_amount, initial_price_asset1, initial_price_asset2,
+                                                  current_price_asset1, current_price_asset2, *price_range)
+        il = round(abs(range_position["il_impact"]), 2)
+        pool_value = range_position["pool_value"] if not is_new_pool else investment_amount
+        value_if_held = range_position["value_if_held"]
+    if pool_weights is not None:
+        projection = calculate_weighted_projection_path(investment_amount, apy, 12, initial_prices, current_prices,
+                                                        expected_price_changes, pool_weights, is_new_pool)
+    else:
+        projection = calculate_projection_path(investment_amount, apy, 12, initial_price_asset1, initial_price_asset2,
+                                               current_price_asset1, current_price_asset2, expected_price_change_asset1,
+                                               expected_price_change_asset2, is_new_pool, price_range, amplification)
+    future_value = float(projection["value"][12])
+    net_return = future_value / investment_amount if investment_amount > 0 else 0
+    break_even_months = calculate_break_even_months(apy, il, pool_value, value_if_held)
+    if pool_weights is not None:
+        break_even_months_with_price = calculate_weighted_break_even_months_with_price_changes(
+            investment_amount, apy, pool_value, initial_prices, current_prices, expected_price_changes, pool_weights, value_if_held
+        )
+    else:
+        break_even_months_with_price = calculate_break_even_months_with_price_changes(
+            investment_amount, apy, pool_value, initial_price_asset1, initial_price_asset2,
+            current_price_asset1, current_price_asset2, expected_price_change_asset1, expected_price_change_asset2, value_if_held, is_new_pool,
+            price_range, amplification
+        )
+    drawdown_initial = investment_amount * 0.1
+    drawdown_12_months = future_value * 0.1
+    hurdle_rate = risk_free_rate + HURDLE_RATE_PREMIUM
+    hurdle_value_12_months = investment_amount * (1 + hurdle_rate / 100)
+
+    # Risk Assessment
+    risk_messages = []
+    if net_return < 1.0:
+        risk_messages.append("Loss projected")
+    if il > 5.0:
+        risk_messages.append("High IL")
+    if current_tvl < 250000:
+        risk_messages.append("TVL too low: Pool may be at risk of low liquidity or manipulation")
+    if apy < hurdle_rate:
+        risk_messages.append(f"APY ({apy:.1f}%) below hurdle rate ({hurdle_rate:.1f}%)")
+    if platform_trust_score <= 2:
+        risk_messages.append("Low Platform Trust Score: Protocol may be risky")
+
+    # Compute Composite Risk Score
+    scores, composite_score = calculate_risk_scores_batch(il, net_return, current_tvl, apy, hurdle_rate,
+                                                          platform_trust_score, fear_and_greed_score)
+    scores = {metric: score.item() for metric, score in scores.items()}
+    composite_score = composite_score.item()
+
+    # Monte Carlo Scenarios
+    if pool_weights is not None:
+        mc_results = weighted_monte_carlo_analysis(
+            investment_amount, apy, initial_prices, current_prices, expected_price_changes, pool_weights,
+            is_new_pool, adaptive=True
+        )
     else:
-        pool_value, _ = calculate_pool_value(initial_investment, initial_price_asset1, initial_price_asset2,
-                                            current_price_asset1, current_price_asset2)
-        starting_price_asset1 = initial_price_asset1
-        starting_price_asset2 = initial_price_asset2
-    if months == 0:
-        return round(pool_value, 2), calculate_il(initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2, initial_investment)
-    current_value = pool_value
-    for month in range(1, months + 1):
-        monthly_apy = (apy / 100) / 12 * (0.95 ** (month - 1))  # 5% monthly decay
-        current_value *= (1 + monthly_apy)
-    final_price_asset1 = current_price_asset1 * (1 + monthly_price_change_asset1 * months)
-    final_price_asset2 = current_price_asset2 * (1 + monthly_price_change_asset2 * months)
-    new_pool_value, _ = calculate_pool_value(initial_investment, initial_price_asset1, initial_price_asset2,
-                                           final_price_asset1, final_price_asset2)
-    future_il = calculate_il(initial_price_asset1, initial_price_asset2, final_price_asset1, final_price_asset2, initial_investment)
-    current_value += (new_pool_value - pool_value)
-    return round(current_value, 2), future_il
-
-def calculate_break_even_months(apy: float, il: float, initial_pool_value: float, value_if_held: float) -> float:
-    if apy <= 0 or initial_pool_value <= 0 or value_if_held <= initial_pool_value:
-        return 0
-    current_value = initial_pool_value
-    months = 0
-    while current_value < value_if_held and months < 1000:
-        monthly_apy = (apy / 100) / 12 * (0.95 ** months)  # 5% monthly decay
-        current_value *= (1 + monthly_apy)
-        months += 1
-    return round(months, 2) if months < 1000 else float('inf')
-
-def calculate_break_even_months_with_price_changes(initial_investment: float, apy: float, pool_value: float,
-                                                  initial_price_asset1: float, initial_price_asset2: float,
-                                                  current_price_asset1: float, current_price_asset2: float,
-                                                  expected_price_change_asset1: float, expected_price_change_asset2: float,
-                                                  value_if_held: float, is_new_pool: bool = False) -> float:
-    if apy <= 0:
-        return float('inf')
-    monthly_price_change_asset1 = (expected_price_change_asset1 / 100) / 12
-    monthly_price_change_asset2 = (expected_price_change_asset2 / 100) / 12
-    months = 0
-    current_value = pool_value
-    while current_value < value_if_held and months < 1000:
-        months += 1
-        monthly_apy = (apy / 100) / 12 * (0.95 ** (months - 1))  # 5% monthly decay
-        final_price_asset1 = current_price_asset1 * (1 + monthly_price_change_asset1 * months)
-        final_price_asset2 = current_price_asset2 * (1 + monthly_price_change_asset2 * months)
-        new_pool_value, _ = calculate_pool_value(initial_investment, initial_price_asset1, initial_price_asset2,
-                                               final_price_asset1, final_price_asset2)
-        current_value = pool_value * (1 + monthly_apy) ** months + (new_pool_value - pool_value)
-    return round(months, 2) if months < 1000 else float('inf')
-
-def simplified_monte_carlo_analysis(initial_investment: float, apy: float, initial_price_asset1: float, initial_price_asset2: float,
-                                   current_price_asset1: float, current_price_asset2: float, expected_price_change_asset1: float,
-                                   expected_price_change_asset2: float, is_new_pool: bool, num_simulations: int = 200) -> dict:
-    apy_range = [max(apy * 0.5, 0), apy * 1.5]
-    price_change_asset1_range = [expected_price_change_asset1 * 0.5, expected_price_change_asset1 * 1.5] if expected_price_change_asset1 >= 0 else [expected_price_change_asset1 * 1.5, expected_price_change_asset1 * 0.5]
-    price_change_asset2_range = [expected_price_change_asset2 * 0.5, expected_price_change_asset2 * 1.5] if expected_price_change_asset2 >= 0 else [expected_price_change_asset2 * 1.5, expected_price_change_asset2 * 0.5]
-    apy_samples = np.random.uniform(apy_range[0], apy_range[1], num_simulations)
-    price_change_asset1_samples = np.random.uniform(price_change_asset1_range[0], price_change_asset1_range[1], num_simulations)
-    price_change_asset2_samples = np.random.uniform(price_change_asset2_range[0], price_change_asset2_range[1], num_simulations)
-    values = []
-    ils = []
-    for i in range(num_simulations):
-        value, il = calculate_future_value(initial_investment, apy_samples[i], 12, initial_price_asset1, initial_price_asset2,
-                                          current_price_asset1, current_price_asset2, price_change_asset1_samples[i],
-                                          price_change_asset2_samples[i], is_new_pool)
-        values.append(value)
-        ils.append(il)
-    worst_value, worst_il = sorted(zip(values, ils))[19]  # 10th percentile
-    best_value, best_il = sorted(zip(values, ils))[179]   # 90th percentile
-    expected_value, expected_il = calculate_future_value(initial_investment, apy, 12, initial_price_asset1, initial_price_asset2,
-                                                        current_price_asset1, current_price_asset2, expected_price_change_asset1,
-                                                        expected_price_change_asset2, is_new_pool)
+        mc_results = simplified_monte_carlo_analysis(
+            investment_amount, apy, initial_price_asset1, initial_price_asset2,
+            current_price_asset1, current_price_asset2, expected_price_change_asset1,
+            expected_price_change_asset2, is_new_pool, adaptive=True, price_range=price_range, amplification=amplification
+        )
+
     return {
-        "worst": {"value": worst_value, "il": worst_il},
-        "expected": {"value": expected_value, "il": expected_il},
-        "best": {"value": best_value, "il": best_il}
+        "il": il, "pool_value": pool_value, "value_if_held": value_if_held, "projection": projection,
+        "future_value": future_value, "net_return": net_return, "break_even_months": break_even_months,
+        "break_even_months_with_price": break_even_months_with_price, "drawdown_initial": drawdown_initial,
+        "drawdown_12_months": drawdown_12_months, "hurdle_rate": hurdle_rate, "hurdle_value_12_months": hurdle_value_12_months,
+        "risk_messages": risk_messages, "scores": scores, "composite_score": composite_score, "mc_results": mc_results
     }
 
+# PDF Report (built only when a download is requested, once per distinct result; reportlab is imported on the first one)
+PDF_REPORT_CACHE_MAX_ENTRIES = 64
+
+@st.cache_resource
+def pdf_report_cache() -> ResultCache:
+    return ResultCache(max_entries=PDF_REPORT_CACHE_MAX_ENTRIES, ttl_seconds=None)
+
+@st.cache_resource
+def pdf_styles():
+    # The stylesheet is only read while building, so one per process serves every session
+    from reportlab.lib.styles import getSampleStyleSheet
+    return getSampleStyleSheet()
+
 def generate_pdf_report(il, net_return, future_value, break_even_months, break_even_months_with_price, 
                         drawdown_initial, drawdown_12_months, current_tvl, platform_trust_score, 
                         hurdle_rate, hurdle_value_12_months, risk_messages):
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    styles = getSampleStyleSheet()
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    styles = pdf_styles()
     story = []
 
     story.append(Paragraph("Liquidity Pool Analysis Report", styles['Title']))
@@ -151,23 +170,53 @@ def generate_pdf_report(il, net_return, future_value, break_even_months, break_e
         story.append(Paragraph("Low Risk: Profitable with manageable IL", styles['BodyText']))
     story.append(Paragraph(f"Platform Trust Score: {platform_trust_score} (1-5)", styles['BodyText']))
 
-    doc.build(story)
+    buffer = BytesIO()
+    SimpleDocTemplate(buffer, pagesize=letter).build(story)
     pdf_data = buffer.getvalue()
     buffer.close()
     return pdf_data
 
-# Parse TVL Input Function
-def parse_tvl_input(tvl_str: str) -> float:
-    try:
-        tvl_str = tvl_str.strip().lower()
-        if tvl_str.endswith('m'):
-            return float(tvl_str[:-1]) * 1_000_000
-        elif tvl_str.endswith('k'):
-            return float(tvl_str[:-1]) * 1_000
-        else:
-            return float(tvl_str)
-    except ValueError:
-        return 1.00  # Default on invalid input
+@st.fragment
+def pdf_export(report: dict) -> None:
+    # A fragment, so Prepare reruns only this block and the results above stay on screen. A report someone has
+    # already built for the same results is offered straight away
+    cache = pdf_report_cache()
+    if canonical_input_hash(report) in cache or st.button("Prepare PDF Report"):
+        with st.spinner("Building PDF..."):
+            pdf_data, _ = cache.get_or_compute(report, generate_pdf_report)
+        st.download_button(
+            label="Export Results as PDF",
+            data=pdf_data,
+            file_name="pool_results.pdf",
+            mime="application/pdf"
+        )
+
+# Simulation Data Export (projection path, every Monte Carlo scenario and the risk scores, as Parquet or Arrow IPC)
+DATA_EXPORT_CACHE_MAX_ENTRIES = 8
+DATA_EXPORT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+DATA_EXPORT_FORMATS = {"Parquet": "parquet", "Arrow IPC": "arrow"}
+
+@st.cache_resource
+def data_export_cache() -> ResultCache:
+    return ResultCache(max_entries=DATA_EXPORT_CACHE_MAX_ENTRIES, ttl_seconds=None, max_bytes=DATA_EXPORT_CACHE_MAX_BYTES)
+
+@st.fragment
+def data_export(export: dict) -> None:
+    # Same pattern as the PDF: the archive is only written on request, and the scenarios are regenerated from the
+    # Monte Carlo manifest there, so the cached results never carry the simulation arrays
+    export_format = st.selectbox("Data Format", list(DATA_EXPORT_FORMATS),
+                                 help="Parquet is compressed and smaller; Arrow IPC is uncompressed and faster to load.")
+    export = {**export, "export_format": DATA_EXPORT_FORMATS[export_format]}
+    cache = data_export_cache()
+    if canonical_input_hash(export) in cache or st.button("Prepare Data Export"):
+        with st.spinner("Writing simulation data..."):
+            archive, _ = cache.get_or_compute(export, pool_results_archive)
+        st.download_button(
+            label=f"Export Simulation Data ({export_format})",
+            data=archive,
+            file_name=f"pool_simulation_{export['export_format']}.zip",
+            mime="application/zip"
+        )
 
 # CSS (Updated to Remove Custom Tooltip)
 st.markdown("""
@@ -356,7 +405,27 @@ with st.sidebar:
     pool_status = st.selectbox("Pool Status", ["Existing Pool", "New Pool"])
     is_new_pool = (pool_status == "New Pool")
     
-    if is_new_pool:
+    pool_composition = st.selectbox("Pool Composition", ["Two Assets (50/50)", "Weighted Multi-Asset", "StableSwap (Curve)"],
+                                    help="Weighted pools hold any number of assets at fixed weights, e.g. 80/20 or 4-token pools. "
+                                         "StableSwap pools trade pegged assets on the Curve invariant")
+    pool_weights = None
+    price_range = None
+    amplification = None
+    
+    if pool_composition == "Weighted Multi-Asset":
+        num_assets = int(st.number_input("Number of Assets", min_value=2, max_value=8, value=3, step=1))
+        pool_weights, initial_prices, current_prices, expected_price_changes = [], [], [], []
+        for asset in range(1, num_assets + 1):
+            pool_weights.append(st.number_input(f"Weight Asset {asset} (%)", min_value=0.01, max_value=100.0, value=round(100 / num_assets, 2), format="%.2f"))
+            if is_new_pool:
+                current_prices.append(st.number_input(f"Current Price Asset {asset} ($)", min_value=0.01, value=1.00, format="%.2f"))
+                initial_prices.append(current_prices[-1])
+            else:
+                initial_prices.append(st.number_input(f"Initial Price Asset {asset} ($)", min_value=0.01, value=1.00, format="%.2f"))
+                current_prices.append(st.number_input(f"Current Price Asset {asset} ($)", min_value=0.01, value=1.00, format="%.2f"))
+        if abs(sum(pool_weights) - 100) > 0.01:
+            st.sidebar.info(f"Weights add up to {sum(pool_weights):.2f}%; they are scaled to 100%.")
+    elif is_new_pool:
         current_price_asset1 = st.number_input("Current Price Asset 1 ($)", min_value=0.01, value=1.00, format="%.2f")
         current_price_asset2 = st.number_input("Current Price Asset 2 ($)", min_value=0.01, value=1.00, format="%.2f")
         initial_price_asset1 = current_price_asset1
@@ -367,11 +436,30 @@ with st.sidebar:
         current_price_asset1 = st.number_input("Current Price Asset 1 ($)", min_value=0.01, value=1.00, format="%.2f")
         current_price_asset2 = st.number_input("Current Price Asset 2 ($)", min_value=0.01, value=1.00, format="%.2f")
     
+    if pool_composition == "StableSwap (Curve)":
+        amplification = st.number_input("Amplification Coefficient (A)", min_value=0.0, value=100.0, step=10.0, format="%.1f",
+                                        help="Higher values keep the pool closer to a constant sum near the peg; 0 is a constant-product pool")
+    elif pool_weights is None:
+        position_type = st.selectbox("Liquidity Range", ["Full Range", "Concentrated Range"],
+                                     help="Concentrated positions provide liquidity only between a lower and upper price of Asset 1 in Asset 2")
+        if position_type == "Concentrated Range":
+            range_lower_pct = st.number_input("Range Lower (% of entry price)", min_value=0.0, value=80.0, format="%.2f")
+            range_upper_pct = st.number_input("Range Upper (% of entry price)", min_value=0.01, value=125.0, format="%.2f")
+            if range_upper_pct > range_lower_pct:
+                entry_price_ratio = initial_price_asset1 / initial_price_asset2
+                price_range = (entry_price_ratio * range_lower_pct / 100, entry_price_ratio * range_upper_pct / 100)
+            else:
+                st.sidebar.warning("Range Upper must be above Range Lower. Using a full-range position.")
+    
     investment_amount = st.number_input("Investment ($)", min_value=0.01, value=1.00, format="%.2f")
     apy = st.number_input("Pool APY (%)", min_value=0.01, value=25.00, format="%.2f")
     fear_and_greed_score = st.number_input("Fear and Greed Score (0-100)", min_value=0, max_value=100, value=50)
-    expected_price_change_asset1 = st.number_input("Expected Price Change Asset 1 (%)", min_value=-100.0, value=1.0, format="%.2f")
-    expected_price_change_asset2 = st.number_input("Expected Price Change Asset 2 (%)", min_value=-100.0, value=1.0, format="%.2f")
+    if pool_weights is None:
+        expected_price_change_asset1 = st.number_input("Expected Price Change Asset 1 (%)", min_value=-100.0, value=1.0, format="%.2f")
+        expected_price_change_asset2 = st.number_input("Expected Price Change Asset 2 (%)", min_value=-100.0, value=1.0, format="%.2f")
+    else:
+        expected_price_changes = [st.number_input(f"Expected Price Change Asset {asset} (%)", min_value=-100.0, value=1.0, format="%.2f")
+                                  for asset in range(1, num_assets + 1)]
     tvl_input = st.text_input("Current TVL ($)", value="1.00", help="Enter as 18m, 250k, or full number (e.g., 18000000)")
     current_tvl = parse_tvl_input(tvl_input)
     if current_tvl < 0.01:
@@ -392,62 +480,31 @@ with st.sidebar:
     )[0]
 
     risk_free_rate = st.number_input("Risk-Free Rate (%)", min_value=0.0, value=10.0, format="%.2f")
+    native_charts = st.checkbox("Interactive Charts", value=False,
+                                help="Draw charts in your browser, with zoom and hover values, instead of as images")
     st.markdown("**Note**: BTC growth is assumed at a 25% CAGR, based on Michael Saylor’s growth forecasts for BTC over the next 15 years.")
 
 if st.sidebar.button("Calculate"):
     with st.spinner("Calculating..."):
-        # Compute Risk Metrics
-        il = calculate_il(initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2, investment_amount)
-        pool_value, _ = calculate_pool_value(investment_amount, initial_price_asset1, initial_price_asset2,
-                                            current_price_asset1, current_price_asset2) if not is_new_pool else (investment_amount, 0.0)
-        value_if_held = (investment_amount / 2 / initial_price_asset1 * current_price_asset1) + (investment_amount / 2 / initial_price_asset2 * current_price_asset2)
-        future_value, _ = calculate_future_value(investment_amount, apy, 12, initial_price_asset1, initial_price_asset2,
-                                                current_price_asset1, current_price_asset2, expected_price_change_asset1,
-                                                expected_price_change_asset2, is_new_pool)
-        net_return = future_value / investment_amount if investment_amount > 0 else 0
-        break_even_months = calculate_break_even_months(apy, il, pool_value, value_if_held)
-        break_even_months_with_price = calculate_break_even_months_with_price_changes(
-            investment_amount, apy, pool_value, initial_price_asset1, initial_price_asset2,
-            current_price_asset1, current_price_asset2, expected_price_change_asset1, expected_price_change_asset2, value_if_held, is_new_pool
-        )
-        drawdown_initial = investment_amount * 0.1
-        drawdown_12_months = future_value * 0.1
-        hurdle_rate = risk_free_rate + 6.0
-        hurdle_value_12_months = investment_amount * (1 + hurdle_rate / 100)
-
-        # Risk Assessment
-        risk_messages = []
-        if net_return < 1.0:
-            risk_messages.append("Loss projected")
-        if il > 5.0:
-            risk_messages.append("High IL")
-        if current_tvl < 250000:
-            risk_messages.append("TVL too low: Pool may be at risk of low liquidity or manipulation")
-        if apy < hurdle_rate:
-            risk_messages.append(f"APY ({apy:.1f}%) below hurdle rate ({hurdle_rate:.1f}%)")
-        if platform_trust_score <= 2:
-            risk_messages.append("Low Platform Trust Score: Protocol may be risky")
-
-        # Compute Composite Risk Score
-        scores = {
-            'IL': 100 if il < 2 else 50 if il < 5 else 0,
-            'Net Return': 100 if net_return > 1.5 else 50 if net_return > 1 else 0,
-            'TVL': 100 if current_tvl >= 1_000_000 else 50 if current_tvl >= 250_000 else 0,
-            'APY vs Hurdle': 100 if apy >= hurdle_rate + 10 else 50 if apy >= hurdle_rate else 0,
-            'Platform Trust': 100 if platform_trust_score >= 4 else 50 if platform_trust_score >= 3 else 0,
-            'Fear and Greed': 100 - abs(50 - fear_and_greed_score) * 2
-        }
-        weights = {
-            'IL': 1.5,
-            'Net Return': 1.2,
-            'TVL': 1.0,
-            'APY vs Hurdle': 1.0,
-            'Platform Trust': 2.5,
-            'Fear and Greed': 2.0
-        }
-        weighted_sum = sum(scores[metric] * weights[metric] for metric in scores)
-        total_weight = sum(weights.values())
-        composite_score = weighted_sum / total_weight if total_weight > 0 else 0
+        if pool_weights is not None:
+            pool_inputs = {"initial_prices": initial_prices, "current_prices": current_prices,
+                           "expected_price_changes": expected_price_changes, "pool_weights": pool_weights}
+        else:
+            pool_inputs = {"initial_prices": [initial_price_asset1, initial_price_asset2],
+                           "current_prices": [current_price_asset1, current_price_asset2],
+                           "expected_price_changes": [expected_price_change_asset1, expected_price_change_asset2],
+                           "pool_weights": None}
+        pool_inputs.update(investment_amount=investment_amount, apy=apy, is_new_pool=is_new_pool, price_range=price_range,
+                           amplification=amplification, current_tvl=current_tvl, platform_trust_score=platform_trust_score,
+                           fear_and_greed_score=fear_and_greed_score, risk_free_rate=risk_free_rate)
+        results, from_cache = pool_result_cache().get_or_compute(pool_inputs, run_pool_pipeline)
+        il, pool_value, value_if_held = results["il"], results["pool_value"], results["value_if_held"]
+        projection, future_value, net_return = results["projection"], results["future_value"], results["net_return"]
+        break_even_months, break_even_months_with_price = results["break_even_months"], results["break_even_months_with_price"]
+        drawdown_initial, drawdown_12_months = results["drawdown_initial"], results["drawdown_12_months"]
+        hurdle_rate, hurdle_value_12_months = results["hurdle_rate"], results["hurdle_value_12_months"]
+        risk_messages, scores, composite_score = results["risk_messages"], results["scores"], results["composite_score"]
+        mc_results = results["mc_results"]
 
         # Risk Summary Section
         with st.expander("Risk Summary", expanded=True):
@@ -522,18 +579,21 @@ if st.sidebar.button("Calculate"):
                 </div>
             """, unsafe_allow_html=True)
 
+            if price_range is not None:
+                months_in_range = int(projection["in_range"][1:].sum())
+                st.markdown(f"""
+                    <div class="metric-tile">
+                        <div class="metric-title">🎯 Range Status<span class="tooltip" title="Concentrated positions only earn fees while the price of Asset 1 in Asset 2 stays inside your range, and sit entirely in one asset outside it. What to do: If the price is out of range or expected to leave it soon, consider re-centering the range.">?</span></div>
+                        <div class="metric-value {'red-text' if not projection['in_range'][0] else 'yellow-text' if months_in_range < 12 else 'green-text'}">{'In Range' if projection['in_range'][0] else 'Out of Range'}</div>
+                        <div class="metric-desc">Range {price_range[0]:,.4f}–{price_range[1]:,.4f}; earning fees in {months_in_range} of the next 12 months.</div>
+                    </div>
+                """, unsafe_allow_html=True)
+
             # Updated Section: How Does This Compare?
             st.markdown("### How Does This Compare?")
             time_periods = [0, 3, 6, 12]
-            future_values = []
-            btc_values = []
-            for months in time_periods:
-                value, _ = calculate_future_value(investment_amount, apy, months, initial_price_asset1, initial_price_asset2,
-                                                 current_price_asset1, current_price_asset2, expected_price_change_asset1,
-                                                 expected_price_change_asset2, is_new_pool)
-                future_values.append(value)
-                btc_value = investment_amount * (1 + 0.25) ** (months / 12)  # 25% CAGR
-                btc_values.append(btc_value)
+            future_values = projection["value"][time_periods].tolist()
+            btc_values = [investment_amount * (1 + 0.25) ** (months / 12) for months in time_periods]  # 25% CAGR
 
             # Calculate returns for comparisons
             pool_return = net_return  # Already calculated as future_value / investment_amount
@@ -608,30 +668,42 @@ if st.sidebar.button("Calculate"):
             st.markdown('</div>', unsafe_allow_html=True)
 
             with st.spinner("Generating chart..."):
-                plt.figure(figsize=(10, 6))
-                sns.set_style("whitegrid")
-                sns.lineplot(x=time_periods, y=future_values, label='Pool Value', color='#4B5EAA', linewidth=2.5, marker='o')
-                sns.lineplot(x=time_periods, y=btc_values, label='BTC Value', color='#FFC107', linewidth=2.5, marker='o')
-                sns.lineplot(x=time_periods, y=stablecoin_values, label=f'Stablecoin Value ({risk_free_rate:.1f}%)', color='#A9A9A9', linewidth=2.5, marker='o')
-                sns.lineplot(x=time_periods, y=hurdle_values, label=f'Hurdle Rate ({hurdle_rate:.1f}%)', color='#32CD32', linewidth=2.5, marker='o')
-                plt.axhline(y=investment_amount, color='#FF4D4D', linestyle='--', label=f'Initial Investment (${investment_amount:,.2f})')
-                plt.fill_between(time_periods, investment_amount, future_values, where=(np.array(future_values) < investment_amount), color='#FF4D4D', alpha=0.1, label='Loss Zone')
-                plt.title('Projected Value Over 12 Months (Pool vs BTC vs Stablecoin)')
-                plt.xlabel('Months')
-                plt.ylabel('Value ($)')
-                plt.legend()
-                st.pyplot(plt)
-                plt.clf()
+                show_chart("projection", native_charts, months=time_periods,
+                           series={"Pool Value": future_values, "BTC Value": btc_values, f"Stablecoin Value ({risk_free_rate:.1f}%)": stablecoin_values,
+                                   f"Hurdle Rate ({hurdle_rate:.1f}%)": hurdle_values},
+                           colors=['#4B5EAA', '#FFC107', '#A9A9A9', '#32CD32'], initial_investment=investment_amount,
+                           title='Projected Value Over 12 Months (Pool vs BTC vs Stablecoin)')
+
+        # Price-Change Sensitivity
+        with st.expander("Price Change Sensitivity - 12 Months", expanded=False):
+            if pool_weights is not None:
+                st.markdown("The sensitivity map covers two-asset pools; weighted pools have one price change per asset.")
+            else:
+                st.markdown(f"12-month pool value and impermanent loss for every pair of expected price changes from "
+                            f"{SENSITIVITY_PRICE_CHANGE_RANGE[0]:.0f}% to {SENSITIVITY_PRICE_CHANGE_RANGE[1]:.0f}% "
+                            f"({SENSITIVITY_GRID_SIZE}×{SENSITIVITY_GRID_SIZE} grid). The dashed line marks where the pool breaks even on your investment; the star is your current expectation.")
+                sensitivity = cached_sensitivity_grid(investment_amount, apy, initial_price_asset1, initial_price_asset2,
+                                                      current_price_asset1, current_price_asset2, is_new_pool, price_range, amplification)
+                st.markdown(f"**Break-even Coverage**: {sensitivity['break_even_share']:.1%} of the grid ends at or above your initial investment.")
+                with st.spinner("Generating chart..."):
+                    for grid_values, title, label, cmap in [
+                        (sensitivity["value"], "12-Month Pool Value by Expected Price Change", "Value ($)", "RdYlGn"),
+                        (sensitivity["il"], "12-Month Impermanent Loss by Expected Price Change", "IL (%)", "Reds")
+                    ]:
+                        show_chart("heatmap", native_charts, x=sensitivity["price_change_asset1"], y=sensitivity["price_change_asset2"], z=grid_values,
+                                   contour=sensitivity["value"], contour_level=investment_amount,
+                                   point=(expected_price_change_asset1, expected_price_change_asset2), cmap=cmap, label=label, title=title,
+                                   xlabel="Expected Price Change Asset 1 (%)", ylabel="Expected Price Change Asset 2 (%)")
 
         # Monte Carlo Scenarios
         with st.expander("Monte Carlo Scenarios - 12 Months", expanded=False):
-            st.markdown("Simulates 200 scenarios over 12 months considering APY and price change volatility.")
+            precision = mc_results["precision"]
+            precision_status = ("converged" if precision["converged"] else "stopped at the scenario budget before converging"
+                                if precision["stop_reason"] == "max_simulations" else "stopped at the time budget before converging")
+            st.markdown(f"Simulates scenarios over 12 months considering APY and price change volatility, adding batches until the "
+                        f"10th and 90th percentiles are within ±{ADAPTIVE_TOLERANCE:.0%} (95% confidence). This run {precision_status} "
+                        f"after {precision['num_simulations']:,} scenarios.")
             st.markdown("- **Expected**: Average | **Best**: 90th percentile | **Worst**: 10th percentile")
-            mc_results = simplified_monte_carlo_analysis(
-                investment_amount, apy, initial_price_asset1, initial_price_asset2,
-                current_price_asset1, current_price_asset2, expected_price_change_asset1,
-                expected_price_change_asset2, is_new_pool
-            )
             df_monte_carlo = pd.DataFrame({
                 "Scenario": ["Worst Case", "Expected Case", "Best Case"],
                 "Value ($)": [mc_results['worst']['value'], mc_results['expected']['value'], mc_results['best']['value']],
@@ -641,19 +713,15 @@ if st.sidebar.button("Calculate"):
                 return ['background: #D32F2F'] * len(row) if row['Scenario'] == 'Worst Case' else ['background: #FFB300'] * len(row) if row['Scenario'] == 'Expected Case' else ['background: #388E3C'] * len(row)
             styled_mc_df = df_monte_carlo.style.apply(highlight_rows, axis=1).set_table_attributes('class="monte-carlo-table"')
             st.table(styled_mc_df)
+            st.markdown(f"**Achieved Precision**: {precision['num_simulations']:,} scenarios | "
+                        f"Worst Case ±${precision['half_widths'][10]:,.2f} ({precision['relative_half_widths'][10]:.2%}) | "
+                        f"Best Case ±${precision['half_widths'][90]:,.2f} ({precision['relative_half_widths'][90]:.2%}) at 95% confidence")
 
             with st.spinner("Generating chart..."):
-                plt.figure(figsize=(10, 6))
-                scenarios = ["Worst", "Expected", "Best"]
-                values = [mc_results["worst"]["value"], mc_results["expected"]["value"], mc_results["best"]["value"]]
-                colors = ["#D32F2F", "#FFB300", "#388E3C"]
-                plt.bar(scenarios, values, color=colors)
-                plt.axhline(y=investment_amount, color='#1E2A44', linestyle='--', label=f'Initial Investment (${investment_amount:,.2f})')
-                plt.title("Monte Carlo Scenarios - 12 Month Pool Value")
-                plt.ylabel("Value ($)")
-                plt.legend()
-                st.pyplot(plt)
-                plt.clf()
+                show_chart("scenarios", native_charts, scenarios=["Worst", "Expected", "Best"],
+                           values=[mc_results["worst"]["value"], mc_results["expected"]["value"], mc_results["best"]["value"]],
+                           colors=["#D32F2F", "#FFB300", "#388E3C"], reference=investment_amount,
+                           reference_label=f'Initial Investment (${investment_amount:,.2f})', title="Monte Carlo Scenarios - 12 Month Pool Value")
 
         # Export Results
         with st.expander("Export Results", expanded=False):
@@ -673,10 +741,6 @@ if st.sidebar.button("Calculate"):
             writer.writerow(["Hurdle Rate Value After 12 Months ($)", f"{hurdle_value_12_months:,.0f}"])
             csv_data = output.getvalue()
 
-            pdf_data = generate_pdf_report(il, net_return, future_value, break_even_months, break_even_months_with_price,
-                                           drawdown_initial, drawdown_12_months, current_tvl, platform_trust_score,
-                                           hurdle_rate, hurdle_value_12_months, risk_messages)
-
             col_csv, col_pdf = st.columns(2)
             with col_csv:
                 st.download_button(
@@ -686,9 +750,18 @@ if st.sidebar.button("Calculate"):
                     mime="text/csv"
                 )
             with col_pdf:
-                st.download_button(
-                    label="Export Results as PDF",
-                    data=pdf_data,
-                    file_name="pool_results.pdf",
-                    mime="application/pdf"
-                )
+                pdf_export({
+                    "il": il, "net_return": net_return, "future_value": future_value, "break_even_months": break_even_months,
+                    "break_even_months_with_price": break_even_months_with_price, "drawdown_initial": drawdown_initial,
+                    "drawdown_12_months": drawdown_12_months, "current_tvl": current_tvl, "platform_trust_score": platform_trust_score,
+                    "hurdle_rate": hurdle_rate, "hurdle_value_12_months": hurdle_value_12_months, "risk_messages": risk_messages
+                })
+            st.markdown("**Simulation Data**: projection path, every Monte Carlo scenario (APY and price draws, value, IL) "
+                        "and the risk sub-scores, zipped with the run manifest.")
+            data_export({"projection": projection, "manifest": mc_results["manifest"], "scores": scores,
+                         "composite_score": composite_score})
+
+        cache_stats = pool_result_cache().stats()
+        st.caption(f"{'Served from the result cache' if from_cache else 'Computed and cached'} | Result cache: "
+                   f"{cache_stats['hits']:,} hits, {cache_stats['misses']:,} misses ({cache_stats['hit_rate']:.0%} hit rate), "
+                   f"{cache_stats['entries']}/{cache_stats['max_entries']} entries, kept for {cache_stats['ttl_seconds'] / 60:.0f} min")
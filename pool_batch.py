@@ -0,0 +1,204 @@
+import argparse
+import multiprocessing
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from arta_engine.monte_carlo import resolve_seed_sequence, spawn_rngs
+from arta_engine.pool import (calculate_il_batch, calculate_pool_value_batch, calculate_future_value_batch,
+                              calculate_break_even_months_batch, calculate_break_even_months_with_price_changes_batch,
+                              calculate_risk_scores_batch, percentile_indices, parse_tvl_input, HURDLE_RATE_PREMIUM)
+
+# Headless Batch Pool Scoring
+# Scores a CSV or Parquet file of pools with the same IL, 12-month value, break-even, Monte Carlo and composite risk
+# pipeline as the Calculate button, in vectorized chunks across a worker pool, streaming each scored chunk to the output.
+# Usage: python pool_batch.py pools.csv scores.csv [--seed 42] [--simulations 200] [--chunk-size 2000] [--workers 4]
+REQUIRED_COLUMNS = [
+    "initial_price_asset1", "initial_price_asset2", "current_price_asset1", "current_price_asset2",
+    "investment", "apy", "expected_price_change_asset1", "expected_price_change_asset2",
+    "tvl", "platform_trust_score", "fear_and_greed"
+]
+OPTIONAL_COLUMNS = {"is_new_pool": False, "risk_free_rate": 10.0}
+BATCH_CHUNK_SIZE = 2_000  # Pools per chunk, bounds the (pools x simulations) Monte Carlo arrays to a few MB each
+BATCH_SIMULATIONS = 200
+BATCH_PERCENTILES = (10, 90)
+
+def _risk_level(composite_score: np.ndarray) -> np.ndarray:
+    return np.where(composite_score >= 70, "Low Risk", np.where(composite_score >= 40, "Moderate Risk", "High Risk"))
+
+def _column(frame: pd.DataFrame, name: str) -> np.ndarray:
+    return frame[name].to_numpy(dtype=float)
+
+def _monte_carlo_percentiles(rng: np.random.Generator, num_simulations: int, percentiles, initial_investment, apy,
+                             initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2,
+                             expected_price_change_asset1, expected_price_change_asset2) -> dict:
+    # Same sampling ranges as simplified_monte_carlo_analysis, drawn as one (pools x simulations) block per input
+    def sample(low, high):
+        return low[:, None] + (high - low)[:, None] * rng.random((len(low), num_simulations))
+
+    apy_samples = sample(np.maximum(apy * 0.5, 0), apy * 1.5)
+    price_change_asset1_samples = sample(np.minimum(expected_price_change_asset1 * 0.5, expected_price_change_asset1 * 1.5),
+                                         np.maximum(expected_price_change_asset1 * 0.5, expected_price_change_asset1 * 1.5))
+    price_change_asset2_samples = sample(np.minimum(expected_price_change_asset2 * 0.5, expected_price_change_asset2 * 1.5),
+                                         np.maximum(expected_price_change_asset2 * 0.5, expected_price_change_asset2 * 1.5))
+    values, ils = calculate_future_value_batch(initial_investment[:, None], apy_samples, 12, initial_price_asset1[:, None],
+                                               initial_price_asset2[:, None], current_price_asset1[:, None], current_price_asset2[:, None],
+                                               price_change_asset1_samples, price_change_asset2_samples)
+    indices = percentile_indices(values, percentiles)
+    return {"value": np.take_along_axis(values, indices, axis=1), "il": np.take_along_axis(ils, indices, axis=1)}
+
+def score_pool_chunk(frame: pd.DataFrame, rng: np.random.Generator, num_simulations: int = BATCH_SIMULATIONS,
+                     percentiles: tuple[float, float] = BATCH_PERCENTILES) -> pd.DataFrame:
+    # Returns the input columns followed by the scored ones, one row per pool
+    for column, default in OPTIONAL_COLUMNS.items():
+        if column not in frame:
+            frame = frame.assign(**{column: default})
+    if frame["tvl"].dtype == object:
+        frame = frame.assign(tvl=frame["tvl"].astype(str).map(parse_tvl_input))
+    is_new_pool = frame["is_new_pool"].to_numpy(dtype=bool)
+    initial_investment, apy = _column(frame, "investment"), _column(frame, "apy")
+    current_price_asset1, current_price_asset2 = _column(frame, "current_price_asset1"), _column(frame, "current_price_asset2")
+    # New pools enter at today's prices, as in the sidebar
+    initial_price_asset1 = np.where(is_new_pool, current_price_asset1, _column(frame, "initial_price_asset1"))
+    initial_price_asset2 = np.where(is_new_pool, current_price_asset2, _column(frame, "initial_price_asset2"))
+    expected_price_change_asset1 = _column(frame, "expected_price_change_asset1")
+    expected_price_change_asset2 = _column(frame, "expected_price_change_asset2")
+
+    il = calculate_il_batch(initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2, initial_investment)
+    pool_value, _ = calculate_pool_value_batch(initial_investment, initial_price_asset1, initial_price_asset2,
+                                               current_price_asset1, current_price_asset2)
+    pool_value = np.where(is_new_pool, initial_investment, pool_value)
+    value_if_held = (initial_investment / 2 / initial_price_asset1 * current_price_asset1) + (initial_investment / 2 / initial_price_asset2 * current_price_asset2)
+    future_value, future_il = calculate_future_value_batch(initial_investment, apy, 12, initial_price_asset1, initial_price_asset2,
+                                                           current_price_asset1, current_price_asset2, expected_price_change_asset1,
+                                                           expected_price_change_asset2)
+    net_return = np.divide(future_value, initial_investment, out=np.zeros_like(future_value), where=initial_investment > 0)
+    break_even_months = calculate_break_even_months_batch(apy, pool_value, value_if_held)
+    break_even_months_with_price = calculate_break_even_months_with_price_changes_batch(
+        initial_investment, apy, pool_value, initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2,
+        expected_price_change_asset1, expected_price_change_asset2, value_if_held)
+    scenarios = _monte_carlo_percentiles(rng, num_simulations, percentiles, initial_investment, apy, initial_price_asset1,
+                                         initial_price_asset2, current_price_asset1, current_price_asset2,
+                                         expected_price_change_asset1, expected_price_change_asset2)
+    hurdle_rate = _column(frame, "risk_free_rate") + HURDLE_RATE_PREMIUM
+    scores, composite_score = calculate_risk_scores_batch(il, net_return, _column(frame, "tvl"), apy, hurdle_rate,
+                                                          _column(frame, "platform_trust_score"), _column(frame, "fear_and_greed"))
+    return frame.assign(
+        il=il,
+        pool_value=pool_value,
+        value_if_held=value_if_held,
+        future_value=future_value,
+        future_il=future_il,
+        net_return=net_return,
+        break_even_months=break_even_months,
+        break_even_months_with_price=break_even_months_with_price,
+        mc_worst_value=scenarios["value"][:, 0],
+        mc_worst_il=scenarios["il"][:, 0],
+        mc_best_value=scenarios["value"][:, 1],
+        mc_best_il=scenarios["il"][:, 1],
+        **{f"score_{metric.lower().replace(' ', '_')}": score for metric, score in scores.items()},
+        composite_score=composite_score,
+        risk_level=_risk_level(composite_score)
+    )
+
+def _score_indexed_chunk(frame: pd.DataFrame, chunk_index: int, seed_sequence: np.random.SeedSequence, num_simulations: int,
+                         percentiles) -> pd.DataFrame:
+    # Chunk k always draws from child stream k, so results do not depend on the number of workers
+    return score_pool_chunk(frame, spawn_rngs(seed_sequence, 1, chunk_index)[0], num_simulations, percentiles)
+
+def read_pool_chunks(path: str, chunk_size: int = BATCH_CHUNK_SIZE):
+    if path.lower().endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq  # Optional dependency, only needed for Parquet files
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+class PoolScoreWriter:
+    # Appends scored chunks to a CSV or Parquet file as they arrive
+    def __init__(self, path: str):
+        self.path = path
+        self.parquet = path.lower().endswith((".parquet", ".pq"))
+        self.writer = None
+        self.rows = 0
+
+    def write(self, frame: pd.DataFrame) -> None:
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.path, table.schema)
+            self.writer.write_table(table.cast(self.writer.schema))
+        else:
+            frame.to_csv(self.path, mode="w" if self.rows == 0 else "a", header=self.rows == 0, index=False)
+        self.rows += len(frame)
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+def _validated(frame: pd.DataFrame) -> pd.DataFrame:
+    missing = [column for column in REQUIRED_COLUMNS if column not in frame]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+    return frame
+
+def _scored_chunks(chunks, seed_sequence: np.random.SeedSequence, num_simulations: int, percentiles,
+                   executor: ProcessPoolExecutor | None, max_pending: int):
+    # Keeps at most max_pending chunks in flight and yields results in input order
+    pending = deque()
+    for chunk_index, frame in enumerate(chunks):
+        args = (_validated(frame), chunk_index, seed_sequence, num_simulations, percentiles)
+        if executor is None:
+            yield _score_indexed_chunk(*args)
+            continue
+        pending.append(executor.submit(_score_indexed_chunk, *args))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def score_pool_file(input_path: str, output_path: str, seed=None, num_simulations: int = BATCH_SIMULATIONS,
+                    chunk_size: int = BATCH_CHUNK_SIZE, workers: int | None = None,
+                    percentiles: tuple[float, float] = BATCH_PERCENTILES) -> dict:
+    seed_sequence = resolve_seed_sequence(seed)
+    workers = workers if workers is not None else multiprocessing.cpu_count()
+    mp_context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) if workers > 1 else None
+    writer = PoolScoreWriter(output_path)
+    started = time.perf_counter()
+    try:
+        for scored in _scored_chunks(read_pool_chunks(input_path, chunk_size), seed_sequence, num_simulations, percentiles, executor, 2 * workers):
+            writer.write(scored)
+    finally:
+        writer.close()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return {"rows": writer.rows, "elapsed_seconds": time.perf_counter() - started,
+            "seed": {"entropy": seed_sequence.entropy, "spawn_key": seed_sequence.spawn_key}}
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Score a CSV or Parquet file of liquidity pools without the Streamlit UI.")
+    parser.add_argument("input", help="CSV or Parquet file with one pool per row")
+    parser.add_argument("output", help="CSV or Parquet file to write (format follows the extension)")
+    parser.add_argument("--seed", type=int, default=None, help="Monte Carlo seed; omit for a fresh one (printed for reruns)")
+    parser.add_argument("--simulations", type=int, default=BATCH_SIMULATIONS, help="Monte Carlo scenarios per pool")
+    parser.add_argument("--chunk-size", type=int, default=BATCH_CHUNK_SIZE, help="Pools scored per vectorized chunk")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores, 1 runs in-process)")
+    args = parser.parse_args(argv)
+    try:
+        summary = score_pool_file(args.input, args.output, args.seed, args.simulations, args.chunk_size, args.workers)
+    except (OSError, ValueError) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    print(f"Scored {summary['rows']:,} pools in {summary['elapsed_seconds']:.1f}s -> {args.output} "
+          f"(seed entropy {summary['seed']['entropy']})", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
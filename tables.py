@@ -0,0 +1,49 @@
+import html
+
+import numpy as np
+import streamlit as st
+
+from arta_engine.cache import ResultCache
+
+# Projection Tables for the Streamlit Pages
+# Rows come from the projected series themselves: each series is a value row in dollars followed by an ROI row in
+# percent, coloured by sign. Formatting and colour are decided per row and applied to the whole (rows x months) grid
+# at once, instead of looking each cell's value back up in the table, so a table costs one pass over its cells
+# whatever the horizon. The HTML is cached by a hash of the data, so identical tables are built once per server.
+TABLE_CACHE_MAX_ENTRIES = 256
+TABLE_CACHE_MAX_BYTES = 8 * 1024 ** 2
+TABLE_CACHE_TTL_SECONDS = None  # A table depends only on its key, so entries never go stale
+ROI_COLORS = np.array(["color: #FF4D4D", "color: #A9A9A9", "color: #32CD32"])  # Negative, flat, positive ROI
+
+table_cache = ResultCache(max_entries=TABLE_CACHE_MAX_ENTRIES, ttl_seconds=TABLE_CACHE_TTL_SECONDS, max_bytes=TABLE_CACHE_MAX_BYTES)
+
+def _projection_table_html(series: dict, months: np.ndarray, initial_investment: float, roi: bool) -> str:
+    values = np.array([path[months] for path in series.values()], dtype=float)  # (series, months)
+    labels, cells, styles = [], [], []
+    for name, row in zip(series, values):
+        labels.append(f"{name} Value ($)")
+        cells.append([f"${value:,.2f}" for value in row])
+        styles.append(np.full(len(months), ""))
+        if roi:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                roi_row = (row / initial_investment - 1) * 100
+            labels.append(f"{name} ROI (%)")
+            cells.append([f"{value:.2f}%" for value in roi_row])
+            styles.append(ROI_COLORS[np.sign(np.nan_to_num(roi_row)).astype(int) + 1])
+    header = "".join(f"<th>Month {month}</th>" for month in months)
+    body = "".join(
+        f"<tr><td>{html.escape(label)}</td>" + "".join(f'<td style="{style}">{cell}</td>' if style else f"<td>{cell}</td>"
+                                                     for cell, style in zip(row_cells, row_styles)) + "</tr>"
+        for label, row_cells, row_styles in zip(labels, cells, styles)
+    )
+    return (f'<div class="proj-table-container"><table class="proj-table"><thead><tr><th>Metric</th>{header}</tr></thead>'
+            f"<tbody>{body}</tbody></table></div>")
+
+def render_projection_table(series: dict, months, initial_investment: float, roi: bool = True) -> str:
+    # series maps a row label ("Asset", "BTC", ...) to its monthly values from month 0; months picks the columns
+    inputs = {"series": {name: np.asarray(path, dtype=float) for name, path in series.items()},
+              "months": np.asarray(months, dtype=int), "initial_investment": initial_investment, "roi": roi}
+    return table_cache.get_or_compute(inputs, _projection_table_html)[0]
+
+def show_projection_table(series: dict, months, initial_investment: float, roi: bool = True) -> None:
+    st.markdown(render_projection_table(series, months, initial_investment, roi), unsafe_allow_html=True)
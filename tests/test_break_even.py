@@ -0,0 +1,76 @@
+import numpy as np
+
+from arta_engine.pool import (calculate_break_even_months, calculate_break_even_months_batch, calculate_break_even_months_with_price_changes,
+                              calculate_pool_value, calculate_range_position, MAX_BREAK_EVEN_MONTHS)
+
+# Break-even Solver Tests
+# Compares the batched break-even solvers with month-by-month loops over the same decaying APY schedule: pools already
+# ahead, pools that never break even, break-evens on the solver's window boundaries, collapsing prices and range
+# positions that earn no fees out of range.
+# Usage: python -m pytest tests/test_break_even.py
+
+def reference_break_even(apy, pool_value, value_if_held, pool_value_change=lambda month: 0.0, fee_weight=lambda month: 1.0) -> float:
+    # Value after `month` months is the fee-compounded pool value plus the price-driven change at that month
+    value = pool_value
+    for month in range(MAX_BREAK_EVEN_MONTHS):
+        if value + pool_value_change(month) >= value_if_held:
+            return month
+        value *= 1 + (apy / 100) / 12 * 0.95 ** month * fee_weight(month + 1)
+    return float('inf')
+
+def reference_plain_break_even(apy, pool_value, value_if_held) -> float:
+    if apy <= 0 or pool_value <= 0 or value_if_held <= pool_value:
+        return 0
+    return reference_break_even(apy, pool_value, value_if_held)
+
+def test_plain():
+    problems = []
+    cases = [(apy, pool_value, value_if_held) for apy in (-5, 0, 0.01, 1, 10, 100, 500)
+             for pool_value in (0, 500, 1000) for value_if_held in (0, 999, 1000, 1001, 1050, 1500, 3000)]
+    # Targets hit exactly on the months where the solver moves to its next window
+    for month in (1, 11, 12, 13, 47, 48, 49, 191, 192, 193):
+        value = 1000.0
+        for elapsed in range(month):
+            value *= 1 + (200 / 100) / 12 * 0.95 ** elapsed
+        cases.append((200, 1000, value))
+    expected = np.array([reference_plain_break_even(*case) for case in cases])
+    batch = calculate_break_even_months_batch(*np.array(cases).T)
+    for case, want, got in zip(cases, expected, batch):
+        if want != got:
+            problems.append(f"batch{case}: {got} != {want}")
+    for case, want in zip(cases, expected):
+        got = calculate_break_even_months(case[0], 0, case[1], case[2])
+        if want != got:
+            problems.append(f"scalar{case}: {got} != {want}")
+    assert not problems, problems
+
+def test_with_price_changes():
+    problems = []
+    positions = [("full range", {}), ("range (0.8, 1.25)", {"price_range": (0.8, 1.25)}), ("stableswap A=100", {"amplification": 100})]
+    for label, position in positions:
+        for apy in (0, 5, 40, 300):
+            for change_asset1, change_asset2 in ((0, 0), (10, -5), (-50, 0), (-200, 0), (30, 30), (300, -90)):
+                initial_investment, pool_value, value_if_held = 1000.0, 990.0, 1010.0
+
+                def drifted(month):
+                    return (max(1.0 * (1 + change_asset1 / 100 / 12 * month), 0), max(1.0 * (1 + change_asset2 / 100 / 12 * month), 0))
+
+                def position_value(month):
+                    if "price_range" in position:
+                        return calculate_range_position(initial_investment, 1.0, 1.0, *drifted(month), *position["price_range"])["pool_value"]
+                    return calculate_pool_value(initial_investment, 1.0, 1.0, *drifted(month), position.get("amplification"))[0]
+
+                def fee_weight(month):
+                    if "price_range" not in position:
+                        return 1.0
+                    price_asset1, price_asset2 = drifted(month)
+                    ratio = price_asset1 / price_asset2 if price_asset2 > 0 else np.inf
+                    return float(position["price_range"][0] <= ratio <= position["price_range"][1])
+
+                want = reference_break_even(apy, pool_value, value_if_held,
+                                            lambda month: position_value(month) - pool_value if month > 0 else 0.0, fee_weight) if apy > 0 else float('inf')
+                got = calculate_break_even_months_with_price_changes(initial_investment, apy, pool_value, 1.0, 1.0, 1.0, 1.0,
+                                                                     change_asset1, change_asset2, value_if_held, **position)
+                if want != got:
+                    problems.append(f"{label}, apy {apy}, changes ({change_asset1}, {change_asset2}): {got} != {want}")
+    assert not problems, problems
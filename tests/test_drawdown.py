@@ -0,0 +1,80 @@
+import numpy as np
+
+from arta_engine.asset import path_drawdowns, drawdown_percentiles, DRAWDOWN_PERCENTILES
+
+# Drawdown Tests
+# Compares the blocked path_drawdowns kernel with a month-by-month walk along each path: paths that only rise, flat
+# paths, paths that never recover, recoveries on the final month, repeated equal troughs and worthless paths, across
+# block sizes that do and do not divide the path count. Also checks drawdown_percentiles, including populations where
+# no path recovers.
+# Usage: python -m pytest tests/test_drawdown.py
+
+BLOCK_SIZES = (1, 3, 7, 16_384)
+
+def reference_drawdown(path) -> tuple[float, int, float]:
+    peak, deepest, trough = path[0], 0.0, 0
+    run, longest = 0, 0
+    for month, value in enumerate(path):
+        peak = max(peak, value)
+        drawdown = (peak - value) / peak if peak > 0 else 0.0
+        run = run + 1 if drawdown > 0 else 0
+        longest = max(longest, run)
+        if drawdown > deepest:
+            deepest, trough = drawdown, month
+    # The first month from the deepest trough on that is back at its running peak
+    recovery = next((month - trough for month in range(trough, len(path))
+                     if max(path[:month + 1]) <= 0 or path[month] >= max(path[:month + 1])), np.nan)
+    return deepest * 100, longest, recovery
+
+def _edge_paths() -> np.ndarray:
+    return np.array([
+        [100, 101, 102, 103, 104, 105],  # Only rises
+        [100, 100, 100, 100, 100, 100],  # Flat
+        [100, 90, 80, 70, 60, 50],       # Never recovers
+        [100, 80, 90, 95, 99, 100],      # Recovers on the final month
+        [100, 50, 100, 50, 100, 90],     # Two equal troughs, ends under water
+        [100, 120, 60, 130, 65, 66],     # Deeper second trough, never recovers
+        [0, 0, 0, 0, 0, 0],              # Worthless
+        [100, 0, 0, 0, 0, 0],            # Wiped out
+        [100, 99.99, 200, 1, 200, 300]   # Recovers to the peak exactly, then rises
+    ], dtype=float)
+
+def test_paths():
+    problems = []
+    rng = np.random.default_rng(23)
+    random_paths = np.hstack([np.full((200, 1), 100.0), 100 * np.cumprod(1 + rng.normal(0.005, 0.08, (200, 36)), axis=1)])
+    for sim_paths in (np.vstack([_edge_paths(), random_paths[:, :6]]), random_paths):
+        want = [reference_drawdown(path) for path in sim_paths]
+        for block_size in BLOCK_SIZES:
+            got = path_drawdowns(sim_paths, block_size)
+            for index, (max_drawdown, time_under_water, recovery) in enumerate(want):
+                got_row = (got["max_drawdown"][index], got["time_under_water"][index], got["recovery_months"][index])
+                if not (np.isclose(got_row[0], max_drawdown, rtol=1e-12, atol=1e-12) and got_row[1] == time_under_water
+                        and (np.isnan(got_row[2]) if np.isnan(recovery) else got_row[2] == recovery)):
+                    problems.append(f"block {block_size}, path {sim_paths[index][:6]}...: {got_row} != {(max_drawdown, time_under_water, recovery)}")
+    assert not problems, problems
+
+def test_percentiles():
+    problems = []
+    rng = np.random.default_rng(7)
+    sim_paths = 100 * np.cumprod(1 + rng.normal(0.0, 0.1, (5000, 25)), axis=1)
+    drawdowns = path_drawdowns(sim_paths)
+    got = drawdown_percentiles(drawdowns)
+    recovered = drawdowns["recovery_months"][~np.isnan(drawdowns["recovery_months"])]
+    for key, values in (("max_drawdown", drawdowns["max_drawdown"]), ("time_under_water", drawdowns["time_under_water"]),
+                        ("recovery_months", recovered)):
+        for percentile in DRAWDOWN_PERCENTILES:
+            if not np.isclose(got[key][percentile], np.percentile(values, percentile)):
+                problems.append(f"{key} p{percentile}: {got[key][percentile]} != {np.percentile(values, percentile)}")
+    if not np.isclose(got["unrecovered_share"], np.isnan(drawdowns["recovery_months"]).mean()):
+        problems.append(f"unrecovered share: {got['unrecovered_share']}")
+    # Every path falls and stays down: no recovery percentiles, everything unrecovered
+    falling = drawdown_percentiles(path_drawdowns(100 * np.cumprod(np.full((50, 12), 0.95), axis=1)))
+    if any(value is not None for value in falling["recovery_months"].values()) or falling["unrecovered_share"] != 1:
+        problems.append(f"no recovery: {falling}")
+    # Every path only rises: no drawdown, every path recovered at once
+    rising = drawdown_percentiles(path_drawdowns(100 * np.cumprod(np.full((50, 12), 1.01), axis=1)))
+    if any(rising[key][percentile] != 0 for key in ("max_drawdown", "time_under_water", "recovery_months")
+           for percentile in DRAWDOWN_PERCENTILES) or rising["unrecovered_share"] != 0:
+        problems.append(f"only rising: {rising}")
+    assert not problems, problems
@@ -0,0 +1,93 @@
+import itertools
+
+import numpy as np
+
+from arta_engine.pool import calculate_range_position_batch, calculate_range_position, calculate_in_range_fraction, calculate_pool_value
+
+# Range Position Tests
+# Compares the vectorized concentrated-liquidity kernel with a branch-by-branch scalar version of the Uniswap v3 amount
+# formulas: prices below, inside and above the range, entries outside the range, bounds hit exactly, full-range
+# positions (which must match the constant-product pool) and invalid ranges.
+# Usage: python -m pytest tests/test_range_position.py
+
+def reference_amounts(price: float, lower: float, upper: float) -> tuple[float, float]:
+    # Token amounts per unit of liquidity at price (asset 1 in asset 2)
+    if price <= lower:
+        return 1 / np.sqrt(lower) - 1 / np.sqrt(upper), 0.0
+    if price >= upper:
+        return 0.0, np.sqrt(upper) - np.sqrt(lower)
+    return 1 / np.sqrt(price) - 1 / np.sqrt(upper), np.sqrt(price) - np.sqrt(lower)
+
+def reference_position(initial_investment, initial_price_asset1, initial_price_asset2, current_price_asset1, current_price_asset2,
+                       lower, upper) -> dict:
+    if min(initial_price_asset1, initial_price_asset2, current_price_asset2) <= 0 or lower < 0 or upper <= lower:
+        return {"pool_value": 0.0, "value_if_held": 0.0, "il_impact": 0.0, "in_range": False}
+    entry_asset1, entry_asset2 = reference_amounts(initial_price_asset1 / initial_price_asset2, lower, upper)
+    liquidity = initial_investment / (entry_asset1 * initial_price_asset1 + entry_asset2 * initial_price_asset2)
+    amount_asset1, amount_asset2 = reference_amounts(current_price_asset1 / current_price_asset2, lower, upper)
+    pool_value = liquidity * (amount_asset1 * current_price_asset1 + amount_asset2 * current_price_asset2)
+    value_if_held = liquidity * (entry_asset1 * current_price_asset1 + entry_asset2 * current_price_asset2)
+    return {
+        "pool_value": pool_value,
+        "value_if_held": value_if_held,
+        "il_impact": (value_if_held - pool_value) / value_if_held * 100 if value_if_held > 0 else 0.0,
+        "in_range": lower <= current_price_asset1 / current_price_asset2 <= upper
+    }
+
+def _compare(label: str, got: dict, want: dict) -> list[str]:
+    problems = []
+    for key, value in want.items():
+        if key == "in_range":
+            if bool(got[key]) != value:
+                problems.append(f"{label} {key}: {got[key]} != {value}")
+        elif not np.isclose(got[key], value, rtol=1e-9, atol=1e-9):
+            problems.append(f"{label} {key}: {got[key]} != {value}")
+    return problems
+
+def test_against_reference():
+    problems = []
+    ranges = [(0.8, 1.25), (0.5, 0.9), (1.1, 4.0), (0.99, 1.01), (1e-6, 1e6)]
+    prices = [0.1, 0.5, 0.8, 0.9, 1.0, 1.1, 1.25, 2.0, 10.0]  # Asset 1 in asset 2, including every range bound used above
+    entries = [(1.0, 1.0), (2.0, 2.5), (0.4, 1.0), (30.0, 10.0)]  # Entries inside and outside the ranges
+    cases = [(1000.0, entry_asset1, entry_asset2, price * 3.0, 3.0, lower, upper)
+             for (lower, upper), price, (entry_asset1, entry_asset2) in itertools.product(ranges, prices, entries)]
+    batch = calculate_range_position_batch(*np.array(cases).T)
+    for index, case in enumerate(cases):
+        want = reference_position(*case)
+        problems += _compare(f"batch{case}", {key: value[index] for key, value in batch.items()}, want)
+        problems += _compare(f"scalar{case}", calculate_range_position(*case), want)
+    assert not problems, problems
+
+def test_full_range():
+    # (0, inf) is a full-range position, the constant-product pool
+    problems = []
+    for current_price_asset1, current_price_asset2 in itertools.product((0.2, 1.0, 1.7, 40.0), (0.5, 1.0, 3.0)):
+        got = calculate_range_position(1000.0, 2.0, 1.0, current_price_asset1, current_price_asset2, 0.0, np.inf)
+        want_value, want_il = calculate_pool_value(1000.0, 2.0, 1.0, current_price_asset1, current_price_asset2)
+        if not (np.isclose(got["pool_value"], want_value) and np.isclose(got["il_impact"], want_il) and got["in_range"]):
+            problems.append(f"full range at ({current_price_asset1}, {current_price_asset2}): {got} != ({want_value}, {want_il})")
+    assert not problems, problems
+
+def test_invalid_inputs():
+    problems = []
+    invalid = [(1000.0, 1.0, 1.0, 1.0, 1.0, 1.2, 0.8), (1000.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0), (1000.0, 0.0, 1.0, 1.0, 1.0, 0.8, 1.2),
+               (1000.0, 1.0, 1.0, 1.0, 0.0, 0.8, 1.2), (1000.0, 1.0, 1.0, 1.0, 1.0, -1.0, 1.2)]
+    for case in invalid:
+        got = calculate_range_position(*case)
+        if got["pool_value"] != 0 or got["value_if_held"] != 0 or got["il_impact"] != 0 or got["in_range"]:
+            problems.append(f"invalid {case}: {got}")
+    # A worthless asset 1 with a zero lower bound leaves the position holding asset 1 only, worth nothing
+    got = calculate_range_position(1000.0, 1.0, 1.0, 0.0, 1.0, 0.0, 2.0)
+    if got["pool_value"] != 0 or not np.isfinite(got["il_impact"]):
+        problems.append(f"zero price with zero lower bound: {got}")
+    assert not problems, problems
+
+def test_in_range_fraction():
+    rng = np.random.default_rng(11)
+    price_asset1 = rng.uniform(0.5, 1.5, (50, 13))
+    price_asset2 = np.where(rng.random((50, 13)) < 0.05, 0.0, 1.0)  # Some zero prices, which count as out of range
+    got = calculate_in_range_fraction(price_asset1, price_asset2, 0.8, 1.25)
+    want = [np.mean([price_asset2[row, step] > 0 and 0.8 <= price_asset1[row, step] / price_asset2[row, step] <= 1.25 for step in range(13)])
+            for row in range(50)]
+    problems = [f"in-range fraction row {row}: {got[row]} != {want[row]}" for row in range(50) if not np.isclose(got[row], want[row])]
+    assert not problems, problems
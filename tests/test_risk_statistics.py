@@ -0,0 +1,102 @@
+import numpy as np
+
+from arta_engine.monte_carlo_stats import RiskStatistics, TDigest
+
+# Risk Statistics Tests
+# Compares the streaming accumulators with direct whole-sample formulas. RiskStatistics must match numpy's mean,
+# population standard deviation, skewness, excess kurtosis and the deviation of the losing returns however the sample
+# is split into blocks (uneven, single-value and empty blocks, in any merge order). TDigest quantiles must land within
+# a small rank error of the sorted sample, in the tails as well as the body, for one digest and for merged ones.
+# Usage: python -m pytest tests/test_risk_statistics.py
+
+DIGEST_PERCENTILES = (0.1, 1, 5, 25, 50, 75, 95, 99, 99.9)
+DIGEST_MAX_RANK_ERROR = 0.001  # At the default compression, as a share of the sample
+
+def reference_statistics(returns: np.ndarray) -> dict:
+    deviations = returns - returns.mean()
+    variance = (deviations ** 2).mean()
+    losses = returns[returns < 0]
+    return {
+        "count": returns.size,
+        "mean": returns.mean(),
+        "std": np.sqrt(variance),
+        "skewness": (deviations ** 3).mean() / variance ** 1.5 if variance > 0 else 0.0,
+        "kurtosis": (deviations ** 4).mean() / variance ** 2 - 3 if variance > 0 else 0.0,
+        "downside_std": losses.std() if losses.size else 0.0
+    }
+
+def _samples(rng: np.random.Generator) -> dict:
+    return {
+        "normal": rng.normal(0.01, 0.05, 20_000),
+        "skewed": rng.lognormal(0.0, 0.8, 20_000) - 1.2,
+        "heavy tails": rng.standard_t(4, 20_000) * 0.03,
+        "far from zero": 1e6 + rng.normal(0.0, 1.0, 20_000),
+        "all gains": rng.uniform(0.01, 0.2, 1_000),
+        "constant": np.full(1_000, 0.02),
+        "single value": np.array([-0.3])
+    }
+
+def _splits(size: int, rng: np.random.Generator) -> dict:
+    return {
+        "one block": [size],
+        "uneven blocks": np.diff(np.concatenate([[0], np.sort(rng.integers(0, size + 1, 9)), [size]])).tolist(),
+        "single values first": [1, 1, 0, 1, size - 3] if size > 3 else [size],
+        "empty blocks": [0, size, 0]
+    }
+
+def test_risk_statistics():
+    problems = []
+    rng = np.random.default_rng(24)
+    for label, returns in _samples(rng).items():
+        want = reference_statistics(returns)
+        for split, sizes in _splits(returns.size, rng).items():
+            blocks = np.split(returns, np.cumsum(sizes)[:-1])
+            # Fold some blocks into one accumulator and merge the rest in reverse order, as parallel workers would
+            folded = RiskStatistics()
+            for block in blocks[:len(blocks) // 2]:
+                folded.update(block)
+            others = [RiskStatistics().update(block) for block in blocks[len(blocks) // 2:]]
+            for other in reversed(others):
+                folded.merge(other)
+            for key, value in want.items():
+                got = getattr(folded, key)
+                if not np.isclose(got, value, rtol=1e-7, atol=1e-10):
+                    problems.append(f"{label}, {split}: {key} {got} != {value}")
+    # Without losses there is no downside, and the Sortino ratio falls back to zero
+    gains = RiskStatistics().update(rng.uniform(0.01, 0.2, 100))
+    if gains.downside_std != 0 or gains.sortino_ratio(0.1) != 0 or gains.sharpe_ratio(0.1) != 0.1 / gains.std:
+        problems.append(f"all gains: downside {gains.downside_std}, sortino {gains.sortino_ratio(0.1)}")
+    empty = RiskStatistics()
+    if (empty.std, empty.skewness, empty.kurtosis, empty.sharpe_ratio(0.1), empty.sortino_ratio(0.1)) != (0, 0, 0, 0, 0):
+        problems.append("empty statistics are not all zero")
+    assert not problems, problems
+
+def _rank_errors(digest: TDigest, values: np.ndarray) -> np.ndarray:
+    # Share of the sample below each estimated quantile, against the share asked for
+    ordered = np.sort(values)
+    estimates = digest.quantile(DIGEST_PERCENTILES)
+    below = (np.searchsorted(ordered, estimates, side="left") + np.searchsorted(ordered, estimates, side="right")) / 2
+    return np.abs(below / values.size - np.array(DIGEST_PERCENTILES) / 100)
+
+def test_digest():
+    problems = []
+    rng = np.random.default_rng(99)
+    samples = {"normal": rng.normal(0.0, 1.0, 200_000), "lognormal": rng.lognormal(0.0, 1.5, 200_000),
+               "heavy tails": rng.standard_t(2, 200_000), "sorted": np.sort(rng.uniform(0.0, 1.0, 200_000))}
+    for label, values in samples.items():
+        single = TDigest().update(values)
+        merged = TDigest()
+        for block in np.array_split(values, 37):
+            merged.merge(TDigest().update(block))
+        for name, digest in (("single", single), ("merged", merged)):
+            errors = _rank_errors(digest, values)
+            if np.any(errors > DIGEST_MAX_RANK_ERROR):
+                worst = int(np.argmax(errors))
+                problems.append(f"{label}, {name}: p{DIGEST_PERCENTILES[worst]} rank error {errors[worst]:.5f}")
+        if single.quantile(0) != values.min() or single.quantile(100) != values.max() or single.count != values.size:
+            problems.append(f"{label}: extremes or count lost")
+    # A digest of one repeated value returns it everywhere, and an empty one returns NaN
+    constant = TDigest().update(np.full(1_000, 3.5))
+    if np.any(constant.quantile(DIGEST_PERCENTILES) != 3.5) or not np.isnan(TDigest().quantile(50)):
+        problems.append("constant or empty digest")
+    assert not problems, problems
@@ -0,0 +1,91 @@
+import itertools
+
+import numpy as np
+
+from arta_engine.pool import stableswap_reserves, calculate_stableswap_position_batch, calculate_pool_value_batch
+
+# StableSwap Solver Tests
+# Compares the batched Newton solver with nested bisection on the two-asset Curve invariant (D = 1), across
+# amplifications from 0 (constant product) to near constant-sum and prices far from the peg, through all three solver
+# paths (one pool, mixed amplifications, broadcast scalar). Also checks A = 0 against the constant-product pool, zero
+# prices, and that IL grows with A towards the constant-sum pool.
+# Usage: python -m pytest tests/test_stableswap.py
+
+AMPLIFICATIONS = (0.0, 0.01, 1.0, 10.0, 100.0, 1000.0, 1e5)
+PRICE_RATIOS = (1e-6, 0.01, 0.5, 0.99, 1.0, 1.01, 2.0, 100.0, 1e6)
+
+def reference_invariant(x: float, y: float, amplification: float) -> float:
+    return 4 * amplification * (x + y) + 1 - 4 * amplification - 1 / (4 * x * y)
+
+def reference_reserve_asset2(x: float, amplification: float) -> float:
+    # The invariant increases with y, so bisect on log y
+    low, high = -80.0, 80.0
+    for _ in range(100):
+        middle = (low + high) / 2
+        low, high = (middle, high) if reference_invariant(x, np.exp(middle), amplification) < 0 else (low, middle)
+    return np.exp((low + high) / 2)
+
+def reference_price(x: float, amplification: float) -> float:
+    # Pool price of asset 1 in asset 2, the ratio of the invariant's partial derivatives
+    y = reference_reserve_asset2(x, amplification)
+    return (4 * amplification + 1 / (4 * x ** 2 * y)) / (4 * amplification + 1 / (4 * x * y ** 2))
+
+def reference_reserves(price_ratio: float, amplification: float) -> tuple[float, float]:
+    # The pool price falls as the reserve of asset 1 grows, so bisect on log x
+    low, high = -40.0, 40.0
+    for _ in range(100):
+        middle = (low + high) / 2
+        low, high = (middle, high) if reference_price(np.exp(middle), amplification) > price_ratio else (low, middle)
+    x = np.exp((low + high) / 2)
+    return x, reference_reserve_asset2(x, amplification)
+
+def _check_reserves(label: str, price_ratio, amplification, reserve_asset1, reserve_asset2) -> list[str]:
+    problems = []
+    for ratio, a, x, y in zip(np.ravel(price_ratio), np.ravel(amplification), np.ravel(reserve_asset1), np.ravel(reserve_asset2)):
+        want_x, want_y = reference_reserves(ratio, a)
+        price_error = abs(np.log(reference_price(x, a) / ratio))
+        if not (np.isclose(x, want_x, rtol=1e-6) and np.isclose(y, want_y, rtol=1e-6) and price_error < 1e-8
+                and abs(reference_invariant(x, y, a)) < 1e-8 * (1 + 4 * a)):
+            problems.append(f"{label} price {ratio}, A {a}: ({x}, {y}) != ({want_x}, {want_y})")
+    return problems
+
+def test_reserves():
+    problems = []
+    for amplification in AMPLIFICATIONS:
+        # One pool, every price at once
+        reserves = stableswap_reserves(np.array(PRICE_RATIOS), amplification)
+        problems += _check_reserves("one pool", PRICE_RATIOS, [amplification] * len(PRICE_RATIOS), *reserves)
+    ratios, amplifications = map(np.array, zip(*itertools.product(PRICE_RATIOS, AMPLIFICATIONS)))
+    problems += _check_reserves("mixed A", ratios, amplifications, *stableswap_reserves(ratios, amplifications))
+    problems += _check_reserves("broadcast", [2.0] * 3, [50.0] * 3, *stableswap_reserves(np.full(3, 2.0), 50.0))
+    assert not problems, problems
+
+def test_constant_product():
+    # A = 0 is the constant-product pool: reserves 0.5 / sqrt(p) and 0.5 * sqrt(p), and the same value and IL
+    problems = []
+    reserve_asset1, reserve_asset2 = stableswap_reserves(np.array(PRICE_RATIOS), 0.0)
+    want = 0.5 / np.sqrt(PRICE_RATIOS), 0.5 * np.sqrt(PRICE_RATIOS)
+    if not (np.allclose(reserve_asset1, want[0], rtol=1e-9) and np.allclose(reserve_asset2, want[1], rtol=1e-9)):
+        problems.append(f"A = 0 reserves: {reserve_asset1}, {reserve_asset2}")
+    current_prices = np.array([0.01, 0.5, 1.0, 1.3, 4.0, 250.0])
+    position = calculate_stableswap_position_batch(1000.0, 2.0, 1.0, current_prices, 1.0, 0.0)
+    pool_value, il_impact = calculate_pool_value_batch(1000.0, 2.0, 1.0, current_prices, 1.0)
+    if not (np.allclose(position["pool_value"], pool_value, rtol=1e-9) and np.allclose(position["il_impact"], il_impact, atol=1e-7)):
+        problems.append(f"A = 0 position: {position['pool_value']} != {pool_value}")
+    assert not problems, problems
+
+def test_positions():
+    problems = []
+    # A flatter pool swaps further into the cheaper asset once the price leaves the peg, so IL grows with A towards the
+    # constant-sum pool, which ends up holding only the cheaper asset
+    for current_price in (0.98, 1.05, 1.5, 5.0):
+        il = calculate_stableswap_position_batch(1000.0, 1.0, 1.0, current_price, 1.0, np.array(AMPLIFICATIONS))["il_impact"]
+        constant_sum_il = (1 - 2 * min(current_price, 1.0) / (1 + current_price)) * 100
+        if np.any(np.diff(il) < -1e-9) or np.any(il < -1e-9) or np.any(il > constant_sum_il + 1e-9):
+            problems.append(f"IL not growing with A towards {constant_sum_il:.4f}% at price {current_price}: {il}")
+    # A worthless asset leaves a worthless pool, and invalid inputs value to zero
+    position = calculate_stableswap_position_batch(1000.0, 1.0, 1.0, np.array([0.0, 1.0, 1.0]), np.array([1.0, 0.0, 1.0]),
+                                                   np.array([100.0, 100.0, -1.0]))
+    if np.any(position["pool_value"] != 0) or not np.all(np.isfinite(position["il_impact"])):
+        problems.append(f"zero prices / negative A: {position}")
+    assert not problems, problems